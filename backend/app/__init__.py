@@ -4,6 +4,8 @@ from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from .extensions import db, migrate
+from .utils import db_engine
+from .utils.db_engine import database_uri, engine_options
 from app.routes.retriever import retriever_bp
 from .routes.layout_routes import layout_bp
 from .routes.book_routes import book_bp
@@ -18,14 +20,17 @@ def create_app():
     CORS(
         app,
         resources={r"/api/*": {"origins": "http://localhost:3000"}},
-        expose_headers=["Content-Disposition"],
+        expose_headers=["Content-Disposition", "ETag", "X-Next-Cursor", "X-Sync-Timestamp", "X-Total-Count"],
         supports_credentials=True
     )
 
     # Konfigurasi utama
+    # SQLite (WAL + busy_timeout) secara default; DATABASE_URL untuk PostgreSQL/MySQL
+    database_url = database_uri(os.path.join(app.instance_path, '..', 'gatra_sinau.db'))
     app.config.from_mapping(
         SECRET_KEY='a-very-secret-key-that-should-be-changed',
-        SQLALCHEMY_DATABASE_URI='sqlite:///' + os.path.join(app.instance_path, '..', 'gatra_sinau.db'),
+        SQLALCHEMY_DATABASE_URI=database_url,
+        SQLALCHEMY_ENGINE_OPTIONS=engine_options(database_url),
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
         JWT_SECRET_KEY='a-very-secret-key-that-should-be-changed',
         JWT_TOKEN_LOCATION=['headers'],
@@ -41,13 +46,24 @@ def create_app():
     os.makedirs(upload_folder, exist_ok=True)
     app.config['UPLOAD_FOLDER'] = upload_folder
 
+    # Folder teks hasil ekstraksi PDF (gzip per dokumen, di luar database)
+    extracted_text_folder = os.path.join(upload_folder, 'extracted_text')
+    os.makedirs(extracted_text_folder, exist_ok=True)
+    app.config['EXTRACTED_TEXT_FOLDER'] = extracted_text_folder
+
     # Inisialisasi database & migrasi
     db.init_app(app)
-    migrate.init_app(app, db)
+    db_engine.init_app(app)
+    # render_as_batch: SQLite tidak mendukung sebagian besar ALTER TABLE secara langsung
+    migrate.init_app(app, db, render_as_batch=True)
 
     # Import semua model sebelum digunakan
     from . import models
 
+    # Versi tabel untuk ETag data referensi (listener after_flush di db.session)
+    from .utils import response_cache
+    response_cache.init_app(app)
+
     # Register semua blueprint
     from .routes import (
         upload_routes, status_routes, generate_routes, auth_routes,
@@ -0,0 +1,336 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse, urldefrag
+from urllib.robotparser import RobotFileParser
+
+import requests
+from bs4 import BeautifulSoup
+
+USER_AGENT = "Mozilla/5.0 (compatible; GatraSinauBot/1.0)"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class HostRateLimiter:
+    """
+    Membatasi laju request per host: request berikutnya ke host yang sama
+    baru boleh dikirim setelah `min_interval` detik. Slot waktu dipesan di
+    dalam lock, tetapi jeda (sleep) dilakukan di luar lock sehingga host lain
+    tidak ikut tertahan.
+    """
+
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, host):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot.get(host, now), now)
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class Crawler:
+    """
+    Crawler dokumen PDF dengan pool fetch konkuren terbatas, rate limit per host,
+    kedalaman yang bisa diatur, himpunan URL yang sudah dikunjungi, dukungan
+    robots.txt, dan unduhan streaming ke disk per chunk (memori tetap datar
+    berapa pun ukuran PDF-nya).
+    """
+
+    def __init__(self, download_dir, max_workers=8, max_depth=1, min_host_interval=1.0,
+                 timeout=10, user_agent=USER_AGENT, respect_robots=True, same_host_only=True,
+                 known_validators=None):
+        self.download_dir = download_dir
+        # Validator per URL dari crawl sebelumnya ({url: {etag, last_modified, ...}}), hanya dibaca
+        self.known_validators = known_validators or {}
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.respect_robots = respect_robots
+        self.same_host_only = same_host_only
+        self.rate_limiter = HostRateLimiter(min_host_interval)
+        self._robots = {}
+        self._robots_lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(download_dir, exist_ok=True)
+
+    # === HTTP ===
+    def _session(self):
+        # requests.Session tidak thread-safe, jadi satu session per worker thread
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = self.user_agent
+            self._local.session = session
+        return session
+
+    def _get(self, url, **kwargs):
+        self.rate_limiter.wait(urlparse(url).netloc)
+        return self._session().get(url, timeout=self.timeout, **kwargs)
+
+    # === ROBOTS ===
+    def _robots_for(self, url):
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._robots_lock:
+            if origin in self._robots:
+                return self._robots[origin]
+
+        parser = RobotFileParser()
+        try:
+            res = self._get(f"{origin}/robots.txt")
+            if res.status_code == 200:
+                parser.parse(res.text.splitlines())
+            else:
+                parser.allow_all = True
+        except requests.RequestException:
+            parser.allow_all = True
+
+        with self._robots_lock:
+            self._robots.setdefault(origin, parser)
+            return self._robots[origin]
+
+    def allowed(self, url):
+        if not self.respect_robots:
+            return True
+        return self._robots_for(url).can_fetch(self.user_agent, url)
+
+    # === FETCH & PARSE ===
+    def _fetch_links(self, url):
+        """Mengambil satu halaman HTML dan mengembalikan semua link absolutnya."""
+        if not self.allowed(url):
+            print(f"Diblokir robots.txt: {url}")
+            return []
+        try:
+            # stream=True: header dicek dulu sehingga body non-HTML (PDF besar, dll.) tidak pernah diunduh
+            with self._get(url, stream=True) as res:
+                res.raise_for_status()
+                if 'html' not in res.headers.get('Content-Type', 'text/html'):
+                    return []
+                soup = BeautifulSoup(res.content, 'html.parser')
+        except requests.RequestException as e:
+            print(f"Error crawling {url}: {e}")
+            return []
+        return [urldefrag(urljoin(url, a['href']))[0] for a in soup.find_all('a', href=True)]
+
+    def _is_pdf(self, url):
+        return urlparse(url).path.lower().endswith('.pdf')
+
+    @staticmethod
+    def _read_part_validators(meta_path):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _discard_part(tmp_path, meta_path):
+        for path in (tmp_path, meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def _range_start(content_range):
+        # "bytes 1000-1999/5000" -> 1000
+        try:
+            unit, spec = content_range.split(' ', 1)
+            return int(spec.split('-', 1)[0]) if unit == 'bytes' else None
+        except (AttributeError, ValueError):
+            return None
+
+    @staticmethod
+    def _range_total(content_range):
+        # "bytes */5000" atau "bytes 0-999/5000" -> 5000
+        try:
+            unit, spec = content_range.split(' ', 1)
+            return int(spec.rsplit('/', 1)[1]) if unit == 'bytes' else None
+        except (AttributeError, IndexError, ValueError):
+            return None
+
+    @staticmethod
+    def _hash_file(path, sha256):
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                sha256.update(chunk)
+
+    def download(self, url, save_path, validators=None):
+        """
+        Mengunduh file secara streaming ke `save_path` lewat file .part sementara.
+
+        - Jika `validators` (hasil unduhan sebelumnya) tersedia dan file sudah ada,
+          file diminta dengan GET kondisional (If-None-Match / If-Modified-Since);
+          304 dicatat sebagai no-op.
+        - Validator respons yang memulai file .part disimpan di sidecar .part.json.
+          Unduhan yang terputus dilanjutkan dengan Range + If-Range berdasarkan
+          validator tersebut; 206 hanya ditambahkan jika Content-Range dimulai tepat
+          di ukuran .part, selain itu .part dibuang dan diunduh ulang dari awal.
+        - 416 atas permintaan Range berarti .part sudah memuat seluruh file (proses
+          berhenti sebelum os.replace) jika Content-Range `*/<ukuran>` sama dengan
+          ukuran .part; .part itu langsung diselesaikan. Selain itu .part dibuang.
+
+        Mengembalikan dict validator baru ditambah `status`:
+        'not_modified', 'unchanged', 'downloaded' atau 'resumed'.
+        """
+        validators = validators or {}
+        tmp_path = save_path + '.part'
+        meta_path = tmp_path + '.json'
+        headers = {}
+
+        if os.path.exists(save_path):
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        resume_from = os.path.getsize(tmp_path) if os.path.exists(tmp_path) else 0
+        part_validators = self._read_part_validators(meta_path) if resume_from else {}
+        etag = part_validators.get('etag')
+        # If-Range hanya menerima ETag kuat; ETag lemah (W/) diganti Last-Modified
+        if_range = etag if etag and not etag.startswith('W/') else part_validators.get('last_modified')
+        if resume_from and if_range:
+            headers['Range'] = f"bytes={resume_from}-"
+            headers['If-Range'] = if_range
+
+        with self._get(url, stream=True, headers=headers) as res:
+            if res.status_code == 304:
+                return {**validators, 'status': 'not_modified'}
+
+            sha256 = hashlib.sha256()
+            if res.status_code == 416 and 'Range' in headers:
+                if self._range_total(res.headers.get('Content-Range')) != resume_from:
+                    self._discard_part(tmp_path, meta_path)
+                    res.close()
+                    return self.download(url, save_path, validators)
+                status, mode = 'resumed', None
+                self._hash_file(tmp_path, sha256)
+                response_validators = part_validators
+            else:
+                res.raise_for_status()
+                if res.status_code == 206:
+                    if 'Range' not in headers:
+                        raise requests.RequestException(f"206 tanpa permintaan Range dari {url}")
+                    if self._range_start(res.headers.get('Content-Range')) != resume_from:
+                        # Potongan tidak menyambung dengan .part; mulai ulang tanpa Range
+                        self._discard_part(tmp_path, meta_path)
+                        res.close()
+                        return self.download(url, save_path, validators)
+                    status, mode = 'resumed', 'ab'
+                    self._hash_file(tmp_path, sha256)
+                    response_validators = part_validators
+                else:
+                    status, mode = 'downloaded', 'wb'
+                    response_validators = {
+                        'etag': res.headers.get('ETag'),
+                        'last_modified': res.headers.get('Last-Modified')
+                    }
+                    # Catat validator sebelum body ditulis agar unduhan yang terputus bisa dilanjutkan
+                    with open(meta_path, 'w', encoding='utf-8') as f:
+                        json.dump(response_validators, f)
+
+            if mode:
+                with open(tmp_path, mode) as f:
+                    for chunk in res.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if chunk:
+                            f.write(chunk)
+                            sha256.update(chunk)
+
+            new_validators = {
+                'etag': response_validators.get('etag'),
+                'last_modified': response_validators.get('last_modified'),
+                'content_length': os.path.getsize(tmp_path),
+                'sha256': sha256.hexdigest()
+            }
+
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        if new_validators['sha256'] == validators.get('sha256') and os.path.exists(save_path):
+            os.remove(tmp_path)
+            status = 'unchanged'
+        else:
+            os.replace(tmp_path, save_path)
+        return {**new_validators, 'status': status}
+
+    def path_for(self, url):
+        """
+        Nama file (basename URL) dan path lokal unduhan. Path diberi prefix hash URL
+        sehingga dua URL dengan basename sama (mis. /a/buku.pdf dan /b/buku.pdf)
+        tidak saling menimpa saat diunduh bersamaan.
+        """
+        file_name = urlparse(url).path.split('/')[-1] or 'document.pdf'
+        url_hash = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+        return file_name, os.path.join(self.download_dir, f"{url_hash}_{file_name}")
+
+    def _download_pdf(self, url):
+        file_name, save_path = self.path_for(url)
+        if not self.allowed(url):
+            print(f"Diblokir robots.txt: {url}")
+            return None
+        try:
+            result = self.download(url, save_path, self.known_validators.get(url))
+        except (requests.RequestException, OSError) as e:
+            print(f"Gagal mengunduh {url}: {e}")
+            return None
+        status = result.pop('status')
+        if status in ('downloaded', 'resumed'):
+            print(f"Downloaded: {file_name} ({status})")
+        return {
+            "url": url,
+            "file_name": file_name,
+            "local_path": save_path,
+            "download_status": status,
+            "validators": result
+        }
+
+    # === CRAWL ===
+    def crawl(self, start_urls):
+        """
+        Menelusuri `start_urls` secara BFS sampai `max_depth` (0 = hanya halaman awal)
+        dan mengunduh semua PDF yang ditemukan.
+        Mengembalikan list dict {url, file_name, local_path, download_status, validators, start_url}.
+        """
+        visited = set()
+        pdf_sources = {}
+        allowed_hosts = {urlparse(u).netloc for u in start_urls}
+        frontier = [(url, url) for url in start_urls]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for depth in range(self.max_depth + 1):
+                pending = {}
+                for url, start_url in frontier:
+                    if url not in visited:
+                        pending.setdefault(url, start_url)
+                frontier = list(pending.items())
+                if not frontier:
+                    break
+                visited.update(u for u, _ in frontier)
+
+                next_frontier = []
+                pages = executor.map(self._fetch_links, [u for u, _ in frontier])
+                for (_, start_url), links in zip(frontier, pages):
+                    for link in links:
+                        if not link.startswith(('http://', 'https://')):
+                            continue
+                        if self._is_pdf(link):
+                            pdf_sources.setdefault(link, start_url)
+                        elif depth < self.max_depth and link not in visited:
+                            if self.same_host_only and urlparse(link).netloc not in allowed_hosts:
+                                continue
+                            next_frontier.append((link, start_url))
+                frontier = next_frontier
+
+            results = []
+            pdf_urls = list(pdf_sources)
+            for url, result in zip(pdf_urls, executor.map(self._download_pdf, pdf_urls)):
+                if result:
+                    results.append({**result, "start_url": pdf_sources[url]})
+        return results
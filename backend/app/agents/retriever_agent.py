@@ -1,26 +1,30 @@
 import os
-import json
 import uuid
 import requests
+from flask import current_app
 import fitz  # PyMuPDF
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from chromadb import PersistentClient
 from dotenv import load_dotenv
 from googleapiclient.discovery import build
-from app.utils.chroma_client import get_collection
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models import FoundDocument
+from app.services.embedding_jobs import start_embedding_job
+from app.services.rag_service import model as embedding_model
+from app.services.vector_store import DEFAULT_COLLECTION, get_collection
+from app.services.search_batcher import search_batcher
+from .crawler import Crawler
 
 load_dotenv()
 
 # === PATH SETUP ===
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 RAW_DIR = os.path.join(BASE_DIR, '..', 'data', 'raw')
+# Log JSON lama; hanya dibaca oleh perintah `flask import-found-documents`
 LOG_FILE = os.path.join(BASE_DIR, '..', 'data', 'logs', 'found_documents.json')
-CHROMA_DIR = os.path.join(BASE_DIR, '..', 'data', 'chroma')
+VALIDATORS_FILE = os.path.join(BASE_DIR, '..', 'data', 'logs', 'url_validators.json')
 
 os.makedirs(RAW_DIR, exist_ok=True)
-os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
-os.makedirs(CHROMA_DIR, exist_ok=True)
 
 # === CRAWLING ===
 SITES = {
@@ -29,57 +33,57 @@ SITES = {
     "datadikdasmen.com": "https://www.datadikdasmen.com"
 }
 
-def crawl_documents():
-    found_documents = []
-    headers = {
-        "User-Agent": "Mozilla/5.0"
-    }
-
-    for site_name, base_url in SITES.items():
-        try:
-            print(f"Crawling {base_url}...")
-            res = requests.get(base_url, headers=headers, timeout=10)
-            soup = BeautifulSoup(res.content, 'html.parser')
-            links = soup.find_all('a', href=True)
+# Pengaturan crawler; bisa diubah lewat environment tanpa mengubah kode
+CRAWL_MAX_WORKERS = int(os.getenv("CRAWL_MAX_WORKERS", 8))
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", 1))
+CRAWL_HOST_INTERVAL = float(os.getenv("CRAWL_HOST_INTERVAL", 1.0))
 
-            for link in links:
-                href = link['href']
-                if href.endswith('.pdf'):
-                    full_url = urljoin(base_url, href)
-                    file_name = full_url.split("/")[-1]
-                    file_id = str(uuid.uuid4())
-                    save_path = os.path.join(RAW_DIR, file_name)
-
-                    if not os.path.exists(save_path):
-                        r = requests.get(full_url, headers=headers, timeout=10)
-                        with open(save_path, 'wb') as f:
-                            f.write(r.content)
-                        print(f"Downloaded: {file_name}")
-
-                    found_documents.append({
-                        "id": file_id,
-                        "source": site_name,
-                        "url": full_url,
-                        "file_name": file_name,
-                        "local_path": save_path,
-                        "status": "ready"
-                    })
-
-        except Exception as e:
-            print(f"Error crawling {base_url}: {e}")
+def _load_known_validators():
+    rows = db.session.query(
+        FoundDocument.url, FoundDocument.etag, FoundDocument.last_modified,
+        FoundDocument.content_length, FoundDocument.sha256
+    ).all()
+    return {
+        row.url: {
+            'etag': row.etag,
+            'last_modified': row.last_modified,
+            'content_length': row.content_length,
+            'sha256': row.sha256
+        }
+        for row in rows
+    }
 
-    with open(LOG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(found_documents, f, indent=2, ensure_ascii=False)
+def crawl_documents(max_depth=CRAWL_MAX_DEPTH, max_workers=CRAWL_MAX_WORKERS):
+    crawler = Crawler(
+        download_dir=RAW_DIR,
+        max_workers=max_workers,
+        max_depth=max_depth,
+        min_host_interval=CRAWL_HOST_INTERVAL,
+        known_validators=_load_known_validators()
+    )
+    print(f"Crawling {len(SITES)} sites (depth={max_depth}, workers={max_workers})...")
+    site_by_url = {base_url: site_name for site_name, base_url in SITES.items()}
+    crawled = crawler.crawl(list(SITES.values()))
 
-    return found_documents
+    # Upsert ke katalog dalam satu transaksi; ID dokumen tetap stabil per URL
+    urls = [doc["url"] for doc in crawled]
+    existing = {d.url: d for d in FoundDocument.query.filter(FoundDocument.url.in_(urls))} if urls else {}
+    found_documents = []
+    for doc in crawled:
+        entry = existing.get(doc["url"])
+        if entry is None:
+            entry = FoundDocument(url=doc["url"], status="ready")
+            db.session.add(entry)
+        entry.source = site_by_url[doc["start_url"]]
+        entry.file_name = doc["file_name"]
+        entry.local_path = doc["local_path"]
+        entry.set_validators(doc["validators"])
+        found_documents.append(entry)
+    db.session.commit()
+
+    return [doc.to_dict() for doc in found_documents]
 
 # === PENGAMBILAN HASIL CRAWL ===
-def get_discovered_documents():
-    if os.path.exists(LOG_FILE):
-        with open(LOG_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
-
 # === EKSTRAKSI TEKS ===
 def extract_text_from_pdf(path):
     doc = fitz.open(path)
@@ -87,39 +91,19 @@ def extract_text_from_pdf(path):
 
 # === EMBED KE CHROMADB ===
 def embed_documents_by_ids(id_list):
-    if not os.path.exists(LOG_FILE):
-        return []
-
-    with open(LOG_FILE, 'r', encoding='utf-8') as f:
-        all_docs = json.load(f)
-
-    selected = [doc for doc in all_docs if doc['id'] in id_list]
+    """
+    Menjadwalkan embedding dokumen katalog sebagai satu job batch di background.
+    Mengembalikan dict berisi job_id dan ID dokumen yang dijadwalkan.
+    """
+    doc_ids = [doc_id for (doc_id,) in db.session.query(FoundDocument.id).filter(FoundDocument.id.in_(id_list))]
+    if not doc_ids:
+        return {"job_id": None, "documents": []}
 
-    client = PersistentClient(path=CHROMA_DIR)
-    
-    # --- PERBAIKAN DI SINI ---
-    # Ganti nama koleksi dari "kurikulum" menjadi "gatra_sinau_docs"
-    collection = client.get_or_create_collection("gatra_sinau_docs")
-    # --- AKHIR PERBAIKAN ---
-
-    results = []
-    for doc in selected:
-        try:
-            text = extract_text_from_pdf(doc['local_path'])
-            metadata = {
-                "source": doc["source"],
-                "file_name": doc["file_name"]
-            }
-            collection.add(
-                documents=[text],
-                metadatas=[metadata],
-                ids=[doc["id"]]
-            )
-            results.append({**doc, "status": "embedded"})
-        except Exception as e:
-            results.append({**doc, "status": f"error: {str(e)}"})
+    FoundDocument.query.filter(FoundDocument.id.in_(doc_ids)).update({"status": "queued"}, synchronize_session=False)
+    db.session.commit()
 
-    return results
+    job_id = start_embedding_job(current_app.app_context(), doc_ids, get_collection(), embedding_model)
+    return {"job_id": job_id, "documents": doc_ids}
 
 # === GOOGLE SEARCH API (CSE) ===
 def search_pdf_links(query, num_results=10):
@@ -157,53 +141,51 @@ def search_pdf_links(query, num_results=10):
     return results
 
 def add_document_from_url(url):
-    headers = {"User-Agent": "Mozilla/5.0"}
-    file_name = url.split("/")[-1]
-    file_id = str(uuid.uuid4())
-    save_path = os.path.join(RAW_DIR, file_name)
-
     try:
-        r = requests.get(url, headers=headers, timeout=15)
-        if r.status_code != 200:
-            return {"error": f"Failed to download PDF. Status {r.status_code}"}, 400
-
-        with open(save_path, 'wb') as f:
-            f.write(r.content)
-
-        doc_entry = {
-            "id": file_id,
-            "source": "manual",
-            "url": url,
-            "file_name": file_name,
-            "local_path": save_path,
-            "status": "ready"
-        }
-
-        docs = get_discovered_documents()
-        docs.append(doc_entry)
-        with open(LOG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(docs, f, indent=2, ensure_ascii=False)
+        doc_entry = FoundDocument.query.filter_by(url=url).first()
+        crawler = Crawler(download_dir=RAW_DIR, timeout=15, respect_robots=False)
+        file_name, save_path = crawler.path_for(url)
+        if doc_entry is not None:
+            # Dokumen lama tetap memakai path yang sudah tercatat agar GET kondisional berlaku
+            save_path = doc_entry.local_path
+        try:
+            result = crawler.download(url, save_path, doc_entry.validators() if doc_entry else None)
+        except requests.HTTPError as e:
+            return {"error": f"Failed to download PDF. Status {e.response.status_code}"}, 400
+        download_status = result.pop('status')
+
+        if doc_entry is None:
+            doc_entry = FoundDocument(
+                source="manual",
+                url=url,
+                file_name=file_name,
+                local_path=save_path,
+                status="ready"
+            )
+            db.session.add(doc_entry)
+        doc_entry.set_validators(result)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Permintaan lain sudah menambahkan URL yang sama lebih dulu
+            db.session.rollback()
+            doc_entry = FoundDocument.query.filter_by(url=url).first()
 
-        return doc_entry
+        return {**doc_entry.to_dict(), "download_status": download_status}
     except Exception as e:
+        db.session.rollback()
         return {"error": str(e)}, 500
     
-def query_documents_by_text(query_text, top_k=5):
-    client = PersistentClient(path=CHROMA_DIR)
-    collection = client.get_or_create_collection("kurikulum")
-
-    results = collection.query(
-        query_texts=[query_text],
-        n_results=top_k
-    )
+def query_documents_by_text(query_text, top_k=5, collection_name=DEFAULT_COLLECTION):
+    results = search_batcher.search(query_text, top_k, collection_name)
 
     docs = []
-    for i in range(len(results["ids"][0])):
+    for i in range(len(results["ids"])):
         docs.append({
-            "id": results["ids"][0][i],
-            "content": results["documents"][0][i],
-            "metadata": results["metadatas"][0][i],
-            "score": results["distances"][0][i]
+            "id": results["ids"][i],
+            "content": results["documents"][i],
+            "metadata": results["metadatas"][i],
+            "score": results["distances"][i]
         })
 
     return docs
@@ -1,9 +1,10 @@
 import click
 from flask.cli import with_appcontext
 from .extensions import db
-from .models import User, School, Layout, Book, PDFReference
+from .models import User, School, Layout, Book, PDFReference, FoundDocument
 from flask_bcrypt import Bcrypt
 import os
+import json
 import threading
 from flask import current_app
 from .services.rag_service import add_to_collection
@@ -120,11 +121,232 @@ def reindex_all_command():
 
     click.echo("\n✅ Re-indexing process for books has been initiated.")
 
+@click.command('import-found-documents')
+@with_appcontext
+def import_found_documents_command():
+    """
+    Memindahkan isi log lama data/logs/found_documents.json (dan url_validators.json
+    jika ada) ke tabel katalog found_document. Aman dijalankan berulang kali.
+    """
+    from .agents.retriever_agent import LOG_FILE, VALIDATORS_FILE
+
+    if not os.path.exists(LOG_FILE):
+        click.echo('Log found_documents.json tidak ditemukan, tidak ada yang perlu diimpor.')
+        return
+
+    with open(LOG_FILE, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    validators = {}
+    if os.path.exists(VALIDATORS_FILE):
+        with open(VALIDATORS_FILE, 'r', encoding='utf-8') as f:
+            validators = json.load(f)
+
+    existing_urls = {url for (url,) in db.session.query(FoundDocument.url)}
+    imported = 0
+    for entry in entries:
+        if entry['url'] in existing_urls:
+            continue
+        doc = FoundDocument(
+            id=entry['id'],
+            source=entry['source'],
+            url=entry['url'],
+            file_name=entry['file_name'],
+            local_path=entry['local_path'],
+            status=entry.get('status', 'ready')
+        )
+        doc.set_validators(validators.get(entry['url'], {}))
+        db.session.add(doc)
+        existing_urls.add(entry['url'])
+        imported += 1
+    db.session.commit()
+    click.echo(f"✅ Imported {imported} of {len(entries)} documents into the catalog.")
+
+@click.command('merge-vector-stores')
+@with_appcontext
+def merge_vector_stores_command():
+    """
+    Menggabungkan koleksi ChromaDB lama (data/chroma) ke vector store tunggal
+    beserta embedding-nya. Store duckdb+parquet ./chroma dari chroma_client lama
+    tidak bisa dibaca oleh ChromaDB versi sekarang; isinya perlu di-embed ulang.
+    """
+    import chromadb
+    from .services.vector_store import LEGACY_STORES, get_collection, copy_collection, VECTOR_STORE_PATH
+
+    target = get_collection()
+    for path, collection_names in LEGACY_STORES:
+        if not os.path.exists(path) or os.path.abspath(path) == os.path.abspath(VECTOR_STORE_PATH):
+            continue
+        legacy_client = chromadb.PersistentClient(path=path)
+        existing = {c.name if hasattr(c, 'name') else c for c in legacy_client.list_collections()}
+        for name in collection_names:
+            if name not in existing:
+                continue
+            copied = copy_collection(legacy_client.get_collection(name), target)
+            click.echo(f"  -> Copied {copied} items from {path} [{name}].")
+    click.echo(f"✅ Vector stores merged into {VECTOR_STORE_PATH} [{target.name}].")
+
+@click.command('vector-quantization-report')
+@click.option('--collection', 'collection_name', default=None, help='Koleksi sumber vektor (default: koleksi utama).')
+@click.option('--sample', default=5000, show_default=True, help='Jumlah vektor korpus yang diuji.')
+@click.option('--queries', 'query_count', default=200, show_default=True, help='Jumlah query fixture.')
+@click.option('-k', default=10, show_default=True)
+@with_appcontext
+def vector_quantization_report_command(collection_name, sample, query_count, k):
+    """
+    Membandingkan memori per vektor dan recall@k untuk quantization none/fp16/int8.
+    Korpus diambil dari koleksi yang ada; bila kosong dipakai fixture sintetis 384-dim
+    (seed tetap). Query fixture = vektor korpus acak dengan sedikit noise.
+    """
+    import numpy as np
+    from .services.faiss_index import quantization_report
+    from .services.vector_store import DEFAULT_COLLECTION, get_collection
+
+    rng = np.random.default_rng(42)
+    batch = get_collection(collection_name or DEFAULT_COLLECTION).get(include=["embeddings"], limit=sample)
+    vectors = np.asarray(batch["embeddings"], dtype='float32')
+    if not len(vectors):
+        click.echo("Koleksi kosong, memakai fixture sintetis.")
+        centers = rng.normal(size=(50, 384))
+        vectors = centers[rng.integers(0, 50, sample)] + rng.normal(scale=0.3, size=(sample, 384))
+        vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype('float32')
+
+    picks = rng.integers(0, len(vectors), query_count)
+    queries = vectors[picks] + rng.normal(scale=0.01, size=(query_count, vectors.shape[1])).astype('float32')
+
+    click.echo(f"Korpus: {len(vectors)} vektor x {vectors.shape[1]} dim, {query_count} query, k={k}")
+    for row in quantization_report(vectors, queries, k=k):
+        click.echo(f"  {row['quantization']:<5} {row['bytes_per_vector']:>5} byte/vektor  recall@{k}={row['recall_at_k']:.4f}")
+
+@click.command('benchmark-retrieval')
+@click.option('--fixture', 'fixture_path', default=None, help='File JSON korpus + query berlabel (default: data/benchmarks/retrieval_fixture.json).')
+@click.option('-k', default=5, show_default=True)
+@click.option('--repeat', default=3, show_default=True, help='Berapa kali setiap query dijalankan.')
+@click.option('--output', default=None, help='Simpan laporan JSON ke file ini (mis. sebagai baseline).')
+@click.option('--baseline', default=None, help='Bandingkan dengan laporan JSON sebelumnya.')
+@with_appcontext
+def benchmark_retrieval_command(fixture_path, k, repeat, output, baseline):
+    """Mengukur latensi p50/p95, throughput, recall@k dan MRR search_index & query_documents_by_text."""
+    from .services.retrieval_benchmark import DEFAULT_FIXTURE, run_retrieval_benchmark, compare_to_baseline
+
+    report = run_retrieval_benchmark(fixture_path or DEFAULT_FIXTURE, k=k, repeat=repeat)
+    click.echo(f"Fixture {report['fixture']}: {report['corpus_size']} chunk, k={k}")
+    for name, metrics in report['results'].items():
+        click.echo(f"  {name}: " + ", ".join(f"{metric}={value}" for metric, value in metrics.items()))
+
+    if baseline:
+        with open(baseline, encoding='utf-8') as f:
+            diff = compare_to_baseline(report, json.load(f))
+        click.echo(f"Dibandingkan dengan {baseline}:")
+        for name, metrics in diff.items():
+            click.echo(f"  {name}: " + ", ".join(f"{metric} {old} -> {new} ({delta:+})" for metric, (old, new, delta) in metrics.items()))
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        click.echo(f"✅ Laporan disimpan ke {output}")
+
+@click.command('benchmark-db-concurrency')
+@click.option('--writers', default=4, show_default=True)
+@click.option('--readers', default=8, show_default=True)
+@click.option('--seconds', default=10.0, show_default=True)
+@click.option('--database', default=None,
+              help='URL database yang diuji. Default: file SQLite sementara, bukan database aplikasi.')
+@with_appcontext
+def benchmark_db_concurrency_command(writers, readers, seconds, database):
+    """Menguji penulis & pembaca simultan (tabel scratch sementara) pada database terpisah."""
+    import shutil
+    import tempfile
+    from sqlalchemy import create_engine
+    from .utils.db_engine import configure_engine, engine_options, run_concurrency_benchmark
+
+    tmp_dir = None
+    if not database:
+        tmp_dir = tempfile.mkdtemp(prefix='db_benchmark_')
+        database = 'sqlite:///' + os.path.join(tmp_dir, 'benchmark.db')
+    engine = create_engine(database, **engine_options(database))
+    configure_engine(engine)
+    try:
+        click.echo(f"Database: {engine.url.render_as_string(hide_password=True)}")
+        click.echo(f"{writers} penulis + {readers} pembaca selama {seconds} detik...")
+        report = run_concurrency_benchmark(engine, writers=writers, readers=readers, seconds=seconds)
+    finally:
+        engine.dispose()
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    for kind, row in report.items():
+        click.echo(f"  {kind:<5} ops={row['ops']} ({row['ops_per_sec']}/s) p50={row['p50_ms']}ms p95={row['p95_ms']}ms errors={row['errors']}")
+
+@click.command('check-query-plans')
+@with_appcontext
+def check_query_plans_command():
+    """
+    Memastikan hot query (docs, kelas, layout, CP, ...) memakai index, bukan full table scan.
+    Index dibuat lewat migrasi (`flask db upgrade`); perintah ini hanya memeriksa.
+    """
+    from .utils.query_plans import check_query_plans
+
+    failed = 0
+    for name, uses_index, plan in check_query_plans():
+        click.echo(f"{'✅' if uses_index else '❌'} {name}: {' | '.join(plan)}")
+        failed += 0 if uses_index else 1
+    if failed:
+        raise click.ClickException(f"{failed} query masih melakukan full table scan.")
+
+@click.command('benchmark-text-parsing')
+@click.option('--sizes', default='100,500,2000', show_default=True, help='Jumlah entri ToC per ukuran fixture.')
+@click.option('--repeat', default=5, show_default=True)
+def benchmark_text_parsing_command(sizes, repeat):
+    """Micro-benchmark parser ToC dan CP; waktu per baris harus tetap saat input membesar (linear)."""
+    from .utils.structured_text import run_parsing_benchmark
+
+    report = run_parsing_benchmark(tuple(int(size) for size in sizes.split(',')), repeat)
+    failed = 0
+    for kind, rows in report.items():
+        for row in rows:
+            click.echo(f"  {kind:<3} {row['entries']:>6} entri / {row['lines']:>6} baris: "
+                       f"{row['best_ms']} ms ({row['per_line_us']} µs/baris)")
+        # Toleransi 3x untuk noise cache/GC; algoritma kuadratik tumbuh sebanding jumlah entri
+        growth = rows[-1]['per_line_us'] / max(rows[0]['per_line_us'], 1e-9)
+        linear = growth < 3
+        failed += 0 if linear else 1
+        click.echo(f"{'✅' if linear else '❌'} {kind}: biaya per baris x{growth:.2f} dari ukuran terkecil ke terbesar")
+    if failed:
+        raise click.ClickException("Waktu parsing tidak linear terhadap ukuran input.")
+
+@click.command('benchmark-cp-ingestion')
+@click.option('--subjects', default=12, show_default=True, help='Jumlah mapel di fixture.')
+@click.option('--elements', default=8, show_default=True, help='Jumlah elemen per fase.')
+@click.option('--scale', default=10, show_default=True, help='Pengganda isi fixture (simulasi kompilasi besar).')
+@click.option('--repeat', default=3, show_default=True)
+def benchmark_cp_ingestion_command(subjects, elements, scale, repeat):
+    """Mengukur throughput parser CP streaming pada fixture multi-mapel (.txt dan .docx)."""
+    import tempfile
+    from .services.cp_ingestion import build_cp_fixture, run_cp_ingestion_benchmark
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for fmt in ('txt', 'docx'):
+            path, expected = build_cp_fixture(tmp_dir, subjects, elements, scale, fmt)
+            report = run_cp_ingestion_benchmark(path, repeat)
+            ok = report['cp_rows'] == expected
+            click.echo(f"{'✅' if ok else '❌'} {report['file']} ({report['size_kb']} KB): "
+                       f"{report['source_lines']} baris -> {report['cp_rows']}/{expected} CP "
+                       f"dalam {report['best_seconds']}s ({report['lines_per_sec']} baris/s, {report['rows_per_sec']} CP/s)")
+            if not ok:
+                raise click.ClickException(f"Parser {fmt} kehilangan baris CP.")
+
 def init_app(app):
     bcrypt.init_app(app)
     app.cli.add_command(create_developer_command)
     app.cli.add_command(create_school_command)
-    app.cli.add_command(reindex_all_command)    
+    app.cli.add_command(reindex_all_command)
+    app.cli.add_command(benchmark_cp_ingestion_command)
+    app.cli.add_command(benchmark_text_parsing_command)
+    app.cli.add_command(check_query_plans_command)
+    app.cli.add_command(benchmark_db_concurrency_command)
+    app.cli.add_command(benchmark_retrieval_command)
+    app.cli.add_command(vector_quantization_report_command)
+    app.cli.add_command(merge_vector_stores_command)
+    app.cli.add_command(import_found_documents_command)
     app.cli.add_command(seed_command)
     
 @click.group('seed')
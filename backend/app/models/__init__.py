@@ -7,6 +7,8 @@ from .class_model import Class
 from .subject import Subject
 from .generated_document import GeneratedDocument
 from .pdf_reference import PDFReference
+from .found_document import FoundDocument
+from .table_version import TableVersion
 from .aimodels import (
     Layout, Book, MediaAsset, Prota, Promes, Atp, ModulAjar, Soal,
     Elemen, CP
@@ -20,6 +22,8 @@ __all__ = [
     'Subject', 
     'GeneratedDocument',
     'PDFReference',
+    'FoundDocument',
+    'TableVersion',
     'Layout',
     'Book',
     'MediaAsset',
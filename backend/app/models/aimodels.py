@@ -1,8 +1,9 @@
 # backend/app/models/aimodels.py
 
+import datetime
 from app.extensions import db
 from sqlalchemy import Enum, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred, validates
 from sqlalchemy.dialects.mysql import JSON
 from sqlalchemy.sql import func
 
@@ -12,15 +13,22 @@ from sqlalchemy.sql import func
 
 class Layout(db.Model):
     __tablename__ = 'layouts'
+    __table_args__ = (
+        # "Layout saya" (layout_routes) dan pencarian template Prota (generate_routes)
+        db.Index('ix_layouts_uploaded_by_created_at', 'uploaded_by', 'created_at'),
+        db.Index('ix_layouts_jenjang_mapel_tipe', 'jenjang', 'mapel', 'tipe_dokumen'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     jenjang = db.Column(db.String(50), nullable=False)
     mapel = db.Column(db.String(100), nullable=False)
     tipe_dokumen = db.Column(db.String(50), nullable=False)
-    layout_json = db.Column(JSON, nullable=False)
+    # Kolom JSON besar di-defer: hanya dimuat saat diakses (atau lewat undefer) agar query daftar ringan
+    layout_json = deferred(db.Column(JSON, nullable=False))
     file_path = db.Column(db.String(255), nullable=True)
     uploaded_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     status = db.Column(db.String(20), default='aktif')
-    created_at = db.Column(db.TIMESTAMP, server_default=func.now())
+    # Nilai dari Python (presisi mikrodetik, format sama dengan cursor paginasi); server_default untuk insert mentah
+    created_at = db.Column(db.TIMESTAMP, default=datetime.datetime.utcnow, server_default=func.now())
     uploader = db.relationship('User', back_populates='layouts')
 
 class Book(db.Model):
@@ -32,7 +40,8 @@ class Book(db.Model):
     penulis = db.Column(db.String(255))
     tahun_terbit = db.Column(db.Integer)
     file_path = db.Column(db.String(255), nullable=False)
-    topic_json = db.Column(JSON, nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True, index=True) # SHA-256 isi file PDF
+    topic_json = deferred(db.Column(JSON, nullable=True))
     uploaded_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     created_at = db.Column(db.TIMESTAMP, server_default=func.now())
     media_assets = db.relationship('MediaAsset', backref='book', lazy=True, cascade="all, delete-orphan")
@@ -41,7 +50,7 @@ class Book(db.Model):
 class MediaAsset(db.Model):
     __tablename__ = 'media_assets'
     id = db.Column(db.Integer, primary_key=True)
-    book_id = db.Column(db.Integer, db.ForeignKey('books.id'), nullable=False)
+    book_id = db.Column(db.Integer, db.ForeignKey('books.id'), nullable=False, index=True)
     tipe_media = db.Column(db.String(20), nullable=False)
     caption = db.Column(Text)
     halaman = db.Column(db.Integer)
@@ -58,6 +67,10 @@ class MediaAsset(db.Model):
 class Elemen(db.Model):
     """Tabel master untuk elemen-elemen per mata pelajaran."""
     __tablename__ = 'elemen'
+    __table_args__ = (
+        # Prefix subject_id juga melayani join CP -> Elemen per mapel
+        db.Index('ix_elemen_subject_id_nama_elemen', 'subject_id', 'nama_elemen'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     subject_id = db.Column(db.Integer, ForeignKey('subjects.id'), nullable=False)
     nama_elemen = db.Column(db.String(255), nullable=False)
@@ -73,6 +86,9 @@ class Elemen(db.Model):
 class CP(db.Model):
     """Model CP baru yang terstruktur dan relasional."""
     __tablename__ = 'cp'
+    __table_args__ = (
+        db.Index('ix_cp_elemen_id_fase', 'elemen_id', 'fase'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     elemen_id = db.Column(db.Integer, ForeignKey('elemen.id'), nullable=False)
     fase = db.Column(Enum('A', 'B', 'C', 'D', 'E', 'F', name='fase_cp_enum'), nullable=False)
@@ -94,22 +110,46 @@ class CP(db.Model):
 
 class Prota(db.Model):
     __tablename__ = 'prota'
+    __table_args__ = (
+        # Daftar dokumen per user, terbaru dulu (/api/docs)
+        db.Index('ix_prota_user_id_created_at', 'user_id', 'created_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     mapel = db.Column(db.String(100), nullable=False) # CATATAN: bisa direlasi ke Subject di masa depan
     jenjang = db.Column(db.String(50), nullable=False)
     tahun_ajaran = db.Column(db.String(20), nullable=False)
-    items_json = db.Column(JSON)
+    # Salinan document_structure.Judul dari items_json, agar daftar dokumen tidak perlu memuat JSON
+    title = db.Column(db.String(255), nullable=True)
+    items_json = deferred(db.Column(JSON))
     status_validasi = db.Column(db.String(20), default='draft')
-    created_at = db.Column(db.TIMESTAMP, server_default=func.now())
+    # Sama dengan Layout.created_at
+    created_at = db.Column(db.TIMESTAMP, default=datetime.datetime.utcnow, server_default=func.now())
     updated_at = db.Column(db.TIMESTAMP, server_default=func.now(), onupdate=func.now())
     promes = db.relationship('Promes', backref='prota', lazy=True, cascade="all, delete-orphan")
     user = db.relationship('User', back_populates='prota')
 
+    @staticmethod
+    def title_from_items(items_json):
+        if isinstance(items_json, dict) and isinstance(items_json.get('document_structure'), dict):
+            title = items_json['document_structure'].get('Judul')
+            if title:
+                return str(title)[:255]
+        return None
+
+    @validates('items_json')
+    def _sync_title(self, key, items_json):
+        # Setiap kali items_json disimpan (generate maupun edit), judul ikut diperbarui
+        self.title = self.title_from_items(items_json)
+        return items_json
+
+    def display_title(self):
+        return self.title or f"Prota: {self.mapel} Kelas {self.jenjang}"
+
 class Promes(db.Model):
     __tablename__ = 'promes'
     id = db.Column(db.Integer, primary_key=True)
-    prota_id = db.Column(db.Integer, db.ForeignKey('prota.id'), nullable=False)
+    prota_id = db.Column(db.Integer, db.ForeignKey('prota.id'), nullable=False, index=True)
     semester = db.Column(db.Integer, nullable=False)
     minggu_ke = db.Column(db.Integer, nullable=False)
     topik = db.Column(db.Text)
@@ -125,7 +165,7 @@ class Atp(db.Model):
     
     # --- PERBAIKAN UTAMA ---
     # Menghubungkan ATP ke CP dengan Foreign Key, bukan string
-    cp_id = db.Column(db.Integer, db.ForeignKey('cp.id'), nullable=False)
+    cp_id = db.Column(db.Integer, db.ForeignKey('cp.id'), nullable=False, index=True)
     
     tujuan_pembelajaran = db.Column(db.Text, nullable=False)
     indikator_pencapaian = db.Column(db.Text)
@@ -141,7 +181,7 @@ class ModulAjar(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     atp_id = db.Column(db.Integer, db.ForeignKey('atp.id'), nullable=False)
     judul_modul = db.Column(db.String(255), nullable=False)
-    komponen_modul = db.Column(JSON)
+    komponen_modul = deferred(db.Column(JSON))
     status_validasi = db.Column(db.String(20), default='draft')
     created_at = db.Column(db.TIMESTAMP, server_default=func.now())
     updated_at = db.Column(db.TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -1,6 +1,7 @@
 # backend/app/models/class_model.py
 
 from app.extensions import db
+from sqlalchemy.orm import joinedload
 
 class Class(db.Model):
     __tablename__ = 'classes'  # Mengganti nama tabel menjadi 'classes' (plural)
@@ -10,15 +11,20 @@ class Class(db.Model):
     parallel_class = db.Column(db.String(10), nullable=False) # e.g., 'A', 'B'
     
     # Foreign Keys
-    school_id = db.Column(db.Integer, db.ForeignKey('school.id'), nullable=False)
+    school_id = db.Column(db.Integer, db.ForeignKey('school.id'), nullable=False, index=True)
     subject_id = db.Column(db.Integer, db.ForeignKey('subjects.id'), nullable=False)
-    teacher_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    teacher_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     
     # Relationships
     school = db.relationship('School', back_populates='classes')
     subject = db.relationship('Subject')
     teacher = db.relationship('User')
 
+    @classmethod
+    def query_with_details(cls):
+        """Query kelas dengan sekolah, mapel & guru ikut di-join, sehingga to_dict() tidak memicu N+1."""
+        return cls.query.options(joinedload(cls.school), joinedload(cls.subject), joinedload(cls.teacher))
+
     # Serializer untuk mengubah objek menjadi dictionary (untuk JSON response)
     def to_dict(self):
         return {
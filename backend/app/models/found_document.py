@@ -0,0 +1,50 @@
+from app.extensions import db
+import datetime
+import uuid
+
+class FoundDocument(db.Model):
+    """Katalog dokumen PDF yang ditemukan crawler atau ditambahkan manual lewat URL."""
+    __tablename__ = 'found_document'
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    source = db.Column(db.String(255), nullable=False)
+    url = db.Column(db.String(1024), nullable=False, unique=True, index=True)
+    file_name = db.Column(db.String(255), nullable=False)
+    local_path = db.Column(db.String(512), nullable=False)
+    status = db.Column(db.String(50), nullable=False, default='ready', index=True)
+
+    # Validator HTTP dari unduhan terakhir, dipakai untuk GET kondisional saat re-crawl
+    etag = db.Column(db.String(255), nullable=True)
+    last_modified = db.Column(db.String(64), nullable=True)
+    content_length = db.Column(db.BigInteger, nullable=True)
+    sha256 = db.Column(db.String(64), nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    def validators(self):
+        return {
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'content_length': self.content_length,
+            'sha256': self.sha256
+        }
+
+    def set_validators(self, validators):
+        self.etag = validators.get('etag')
+        self.last_modified = validators.get('last_modified')
+        self.content_length = validators.get('content_length')
+        self.sha256 = validators.get('sha256')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'source': self.source,
+            'url': self.url,
+            'file_name': self.file_name,
+            'local_path': self.local_path,
+            'status': self.status
+        }
+
+    def __repr__(self):
+        return f'<FoundDocument {self.file_name}>'
@@ -1,21 +1,34 @@
 from app.extensions import db
-from sqlalchemy import Enum, Text
+from sqlalchemy import Enum
 import datetime
 
 class PDFReference(db.Model):
     __tablename__ = 'pdf_reference'
+    __table_args__ = (
+        db.Index('ix_pdf_reference_status_uploaded_at', 'processing_status', 'uploaded_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
     file_path = db.Column(db.String(512), nullable=False, unique=True)
+    # SHA-256 dari isi file, dipakai untuk melewati OCR ulang pada file yang identik
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
     uploaded_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    # User pengunggah; menentukan siapa yang boleh membaca teks hasil ekstraksi
+    uploaded_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     processing_status = db.Column(
         Enum('pending', 'extracting', 'indexing', 'done', 'failed', name='processing_status_enum'),
         default='pending',
         nullable=False
     )
-    extracted_text = db.Column(db.Text, nullable=True)
+    # Teks hasil ekstraksi disimpan terkompresi di file terpisah (lihat services/text_store.py)
+    # agar query daftar status tidak ikut memuat blob teks berukuran besar.
+    extracted_text_path = db.Column(db.String(512), nullable=True)
     processing_progress = db.Column(db.Integer, default=0)
+    # Diperbarui setiap kali status/progress berubah, dipakai oleh polling ?since=
+    updated_at = db.Column(
+        db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True
+    )
 
     def __repr__(self):
         return f'<PDFReference {self.filename}>'
\ No newline at end of file
@@ -0,0 +1,14 @@
+from app.extensions import db
+
+class TableVersion(db.Model):
+    """
+    Penghitung versi per tabel, dinaikkan setiap kali baris tabel tersebut ditulis
+    lewat ORM (lihat utils/response_cache.py). Dipakai sebagai dasar ETag respons.
+    """
+    __tablename__ = 'table_versions'
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<TableVersion {self.name}={self.version}>'
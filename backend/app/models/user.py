@@ -22,6 +22,9 @@ class User(db.Model):
         nullable=False
     )
     
+    # Dinaikkan untuk mencabut semua JWT lama user ini (lihat utils.decorators)
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
     # Relasi ke Sekolah
     school_id = db.Column(db.Integer, db.ForeignKey('school.id'), nullable=True)
     school = db.relationship('School', back_populates='staff', foreign_keys=[school_id])
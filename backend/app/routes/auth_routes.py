@@ -1,9 +1,7 @@
-from flask import request, jsonify, Blueprint, current_app
+from flask import request, jsonify, Blueprint
 from ..models import User
 from ..extensions import db, bcrypt
-from ..utils.decorators import token_required
-import jwt
-import datetime
+from ..utils.decorators import token_required, create_token
 
 auth_bp = Blueprint('auth_bp', __name__)
 
@@ -21,11 +19,8 @@ def login():
         return jsonify({"error": "User not found."}), 404
 
     if bcrypt.check_password_hash(user.password_hash, data['password']):
-        # Create the JWT token
-        token = jwt.encode({
-            'user_id': user.id,
-            'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=24)
-        }, current_app.config['SECRET_KEY'], algorithm="HS256")
+        # Create the JWT token (role, school_id & versi token ikut sebagai klaim)
+        token = create_token(user)
 
         return jsonify({"token": token}), 200
     else:
@@ -5,9 +5,12 @@ import threading
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
 from app.extensions import db
+from sqlalchemy.orm import undefer
 from app.models import Book, Subject # Tambahkan Subject
 from app.utils.decorators import token_required
-from app.services.book_processing_service import extract_book_content_and_media
+from app.services.book_processing_service import extract_book_content_and_media, copy_processed_content
+from app.services.progress_events import publish_progress
+from app.utils.file_hash import compute_sha256
 
 book_bp = Blueprint('book_bp', __name__)
 
@@ -37,6 +40,31 @@ def upload_book(current_user):
     judul_buku = f"Buku Ajar {subject.name} Kelas {kelas} Jenjang {jenjang}"
     
     if allowed_file(file.filename):
+        content_hash = compute_sha256(file.stream)
+
+        # Buku dengan isi identik yang sudah selesai diproses: pakai ulang hasilnya
+        processed_book = Book.query.options(undefer(Book.topic_json)).filter(
+            Book.content_hash == content_hash,
+            Book.topic_json.isnot(None)
+        ).first()
+        if processed_book:
+            new_book = Book(
+                judul_buku=judul_buku,
+                jenjang=jenjang,
+                mapel=subject.name,
+                file_path=processed_book.file_path,
+                content_hash=content_hash,
+                uploaded_by=current_user.id
+            )
+            copy_processed_content(processed_book, new_book)
+            db.session.add(new_book)
+            db.session.commit()
+            return jsonify({
+                "msg": "Buku yang sama sudah pernah diproses, hasil sebelumnya digunakan kembali",
+                "book_id": new_book.id,
+                "duplicate_of": processed_book.id
+            }), 201
+
         filename = secure_filename(f"{subject.name.replace(' ', '_')}_Kls_{kelas}_{file.filename}")
         upload_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], 'books')
         os.makedirs(upload_folder, exist_ok=True)
@@ -49,6 +77,7 @@ def upload_book(current_user):
             jenjang=jenjang,
             mapel=subject.name, # Simpan nama mapel
             file_path=file_path,
+            content_hash=content_hash,
             uploaded_by=current_user.id
         )
         db.session.add(new_book)
@@ -56,8 +85,8 @@ def upload_book(current_user):
 
         app_context = current_app.app_context()
         thread = threading.Thread(target=extract_book_content_and_media, args=(app_context, new_book.id))
+        publish_progress('book', new_book.id, 'pending', 0, owner_id=current_user.id)
         thread.start()
-        
 
         return jsonify({"msg": "Buku berhasil diunggah dan sedang diproses", "book_id": new_book.id}), 201
 
@@ -3,13 +3,17 @@
 from flask import Blueprint, jsonify, request
 from app.extensions import db
 from app.models import School, Subject, User, Class
+from app.models.user import teacher_schools_table
 from app.utils.decorators import token_required
+from app.utils.pagination import paginated_response
+from app.utils.response_cache import etag_cached
 
 # Nama blueprint Anda adalah 'class_bp', kita akan tetap menggunakannya
 class_bp = Blueprint('class_bp', __name__)
 
 @class_bp.route('/api/classes/form-data', methods=['GET'])
 @token_required
+@etag_cached(['school', 'subjects', 'user'], vary=lambda user: (user.role, user.school_id))
 def get_form_data(current_user):
     """
     Mengirimkan data untuk form.
@@ -63,6 +67,7 @@ def get_form_data(current_user):
 
 @class_bp.route('/api/schools/<int:school_id>/details-for-class', methods=['GET'])
 @token_required
+@etag_cached(['school', 'subjects', 'user', 'classes'], vary=lambda user, school_id: user.role)
 def get_school_details(current_user, school_id):
     """Mengambil detail (guru, tingkat kelas) dari sekolah tertentu."""
     if current_user.role != 'Developer':
@@ -79,7 +84,7 @@ def get_school_details(current_user, school_id):
     elif school.level == 'SMA/MA': grade_levels = list(range(10, 13))
     
     # Ambil juga daftar kelas yang sudah ada di sekolah ini
-    existing_classes = Class.query.filter_by(school_id=school_id).all()
+    existing_classes = Class.query_with_details().filter_by(school_id=school_id).all()
 
     return jsonify({
         'teachers': teacher_list,
@@ -90,21 +95,30 @@ def get_school_details(current_user, school_id):
 @class_bp.route('/api/classes', methods=['GET'])
 @token_required
 def get_classes(current_user):
+    classes = Class.query_with_details()
     if current_user.role == 'Developer':
-        classes = Class.query.all()
+        pass
 
     elif current_user.role == 'School Admin' and current_user.school_id:
-        classes = Class.query.filter_by(school_id=current_user.school_id).all()
+        classes = classes.filter_by(school_id=current_user.school_id)
 
     elif current_user.role == 'Teacher':
-        teacher_schools = current_user.schools_taught
-        school_ids = [s.id for s in teacher_schools]
-        classes = Class.query.filter(Class.school_id.in_(school_ids)).all()
+        # Subquery id sekolah langsung dari tabel perantara, tanpa memuat User & School
+        school_ids = db.session.query(teacher_schools_table.c.school_id).filter(
+            teacher_schools_table.c.user_id == current_user.id
+        )
+        classes = classes.filter(Class.school_id.in_(school_ids))
 
     else:
-        classes = []
-
-    return jsonify([c.to_dict() for c in classes]), 200
+        return jsonify([]), 200
+
+    return paginated_response(
+        classes, Class.to_dict, Class.id,
+        sortable={'id': Class.id, 'grade_level': Class.grade_level, 'parallel_class': Class.parallel_class},
+        default_sort='id',
+        filterable={'school_id': Class.school_id, 'subject_id': Class.subject_id,
+                    'teacher_id': Class.teacher_id, 'grade_level': Class.grade_level}
+    )
 
 
 
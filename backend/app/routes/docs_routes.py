@@ -1,6 +1,9 @@
 from flask import Blueprint, jsonify, request, current_app
+from sqlalchemy.orm import load_only, undefer
 from app.extensions import db
 from app.utils.decorators import token_required
+from app.utils.pagination import paginated_response
+from app.utils.response_cache import etag_cached
 from app.models import Prota, User # Nantinya bisa ditambah Promes, ModulAjar, dll.
 
 docs_bp = Blueprint('docs_bp', __name__)
@@ -13,39 +16,40 @@ def get_user_documents(current_user: User):
     Mengambil daftar semua dokumen (Prota, Promes, dll) yang dimiliki oleh pengguna.
     Hasilnya disatukan dalam satu list untuk ditampilkan di frontend.
     """
-    documents = []
-    
-    # 1. Ambil semua Prota
-    protas = Prota.query.filter_by(user_id=current_user.id).order_by(Prota.created_at.desc()).all()
-    for prota in protas:
-        # Membuat judul yang lebih informatif dari data JSON jika memungkinkan
-        title = f"Prota: {prota.mapel} Kelas {prota.jenjang}"
-        if prota.items_json and 'document_structure' in prota.items_json:
-            title = prota.items_json['document_structure'].get('Judul', title)
-        
-        documents.append({
+    # 1. Ambil Prota milik user (per halaman); hanya kolom ringkasan, items_json tidak dimuat
+    protas = Prota.query.options(load_only(
+        Prota.id, Prota.title, Prota.mapel, Prota.jenjang, Prota.created_at
+    )).filter_by(user_id=current_user.id)
+
+    def serialize(prota):
+        return {
             'id': prota.id,
             'doc_model': 'prota', # Menandakan model asal data
-            'title': title,
+            'title': prota.display_title(),
             'subject': prota.mapel,
             'grade_level': prota.jenjang,
             'document_type': 'Program Tahunan (Prota)',
             'created_at': prota.created_at.isoformat()
-        })
-        
+        }
+
     # Nanti bisa ditambahkan untuk Promes, ModulAjar, dll. di sini
-    # proms = Promes.query.filter_by(...)
-    # for prom in proms:
-    #   documents.append(...)
-            
-    return jsonify(documents)
+    # (paginasi gabungan beberapa model perlu cursor per model)
+    return paginated_response(
+        protas, serialize, Prota.id,
+        sortable={'created_at': Prota.created_at, 'mapel': Prota.mapel},
+        default_sort='-created_at',
+        filterable={'mapel': Prota.mapel, 'jenjang': Prota.jenjang, 'tahun_ajaran': Prota.tahun_ajaran},
+        searchable=[Prota.mapel]
+    )
 
 # ✅ (R)EAD - Rute untuk mendapatkan detail satu dokumen Prota
 @docs_bp.route('/api/docs/prota/<int:prota_id>', methods=['GET'])
 @token_required
+# items_json bisa besar dan hanya dibaca pemiliknya: cukup 304, tidak disimpan di memori
+@etag_cached(['prota'], vary=lambda user, prota_id: user.id, memoize=False)
 def get_prota_detail(current_user: User, prota_id: int):
     """Mengambil detail konten dari satu dokumen Prota."""
-    prota = Prota.query.get_or_404(prota_id)
+    prota = Prota.query.options(undefer(Prota.items_json)).filter_by(id=prota_id).first_or_404()
     
     if prota.user_id != current_user.id:
         return jsonify({"msg": "Akses ditolak"}), 403
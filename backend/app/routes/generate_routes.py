@@ -2,6 +2,7 @@
 
 from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from app.extensions import db
+from sqlalchemy.orm import undefer
 from app.utils.decorators import token_required
 from app.models import Class, Book, Layout, Prota, User, Subject, Elemen, CP
 import json
@@ -66,7 +67,7 @@ def get_prota_layout(class_obj):
     else:
         raise ValueError("Grade level tidak valid.")
 
-    layout = Layout.query.filter_by(
+    layout = Layout.query.options(undefer(Layout.layout_json)).filter_by(
         jenjang=jenjang,
         mapel=subject_name,
         tipe_dokumen='Prota'
@@ -91,7 +92,7 @@ def get_book_topic_json(class_obj):
     else:
         raise ValueError("Grade level tidak valid.")
         
-    book = Book.query.filter_by(
+    book = Book.query.options(undefer(Book.topic_json)).filter_by(
         jenjang=jenjang,
         mapel=subject_name,
     ).order_by(Book.created_at.desc()).first()
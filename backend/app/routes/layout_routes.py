@@ -5,6 +5,8 @@ import re
 import json
 from flask import Blueprint, request, jsonify, current_app
 from app.utils.decorators import token_required 
+from app.utils.pagination import paginated_response
+from sqlalchemy.orm import load_only, undefer
 from werkzeug.utils import secure_filename
 from app.extensions import db
 from app.models import Layout
@@ -171,28 +173,35 @@ def upload_layout(current_user):
 @token_required
 def get_all_layouts(current_user):
     """Mengambil daftar semua layout yang diunggah oleh pengguna."""
-    layouts = Layout.query.filter_by(uploaded_by=current_user.id).order_by(Layout.created_at.desc()).all()
-    
+    # layout_json (bisa besar) tidak dibutuhkan untuk daftar, jadi tidak ikut dimuat
+    layouts = Layout.query.options(load_only(
+        Layout.id, Layout.jenjang, Layout.mapel, Layout.tipe_dokumen, Layout.file_path, Layout.created_at
+    )).filter_by(uploaded_by=current_user.id)
+
     # Membuat daftar hasil untuk ditampilkan
-    result = []
-    for layout in layouts:
-        result.append({
+    def serialize(layout):
+        return {
             'id': layout.id,
             'jenjang': layout.jenjang,
             'mapel': layout.mapel,
             'tipe_dokumen': layout.tipe_dokumen,
             'file_name': os.path.basename(layout.file_path),
             'created_at': layout.created_at.isoformat()
-        })
-        
-    return jsonify(result), 200
+        }
+
+    return paginated_response(
+        layouts, serialize, Layout.id,
+        sortable={'created_at': Layout.created_at, 'mapel': Layout.mapel, 'jenjang': Layout.jenjang},
+        default_sort='-created_at',
+        filterable={'jenjang': Layout.jenjang, 'mapel': Layout.mapel, 'tipe_dokumen': Layout.tipe_dokumen}
+    )
 
 # (READ) - Mengambil satu layout spesifik berdasarkan ID
 @layout_bp.route('/<int:layout_id>', methods=['GET'])
 @token_required
 def get_layout_by_id(current_user, layout_id):
     """Mengambil detail satu layout spesifik."""
-    layout = Layout.query.get_or_404(layout_id)
+    layout = Layout.query.options(undefer(Layout.layout_json)).filter_by(id=layout_id).first_or_404()
     
     # Memastikan pengguna hanya bisa mengakses layout miliknya
     if layout.uploaded_by != current_user.id:
@@ -1,19 +1,31 @@
 # backend/app/retriever.py
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, current_app
 from app.extensions import db
 import os
-import re
+import uuid
+from werkzeug.utils import secure_filename
 
 # Import model yang kita butuhkan untuk menyimpan CP
 from app.models.subject import Subject
 from app.models.aimodels import Elemen, CP
+from app.models import FoundDocument
+from app.utils.pagination import paginated_response
+from app.utils.decorators import token_required
+
+from app.services.embedding_jobs import get_embedding_job
+from app.services.cp_import import resolve_subjects, import_cp_rows
+from app.services.cp_ingestion import (
+    SUPPORTED_EXTENSIONS,
+    iter_cp_rows_from_file,
+    start_cp_ingestion_job,
+    get_cp_ingestion_job
+)
 
 # Import fungsi-fungsi yang sudah ada
 from app.agents.retriever_agent import (
     add_document_from_url,
     crawl_documents,
-    get_discovered_documents,
     embed_documents_by_ids,
     search_pdf_links,
     query_documents_by_text
@@ -34,8 +46,15 @@ def trigger_crawler():
 
 @retriever_bp.route('/api/found-documents', methods=['GET'])
 def list_found_documents():
-    documents = get_discovered_documents()
-    return jsonify(documents), 200
+    return paginated_response(
+        FoundDocument.query, FoundDocument.to_dict, FoundDocument.id,
+        sortable={'created_at': FoundDocument.created_at, 'file_name': FoundDocument.file_name},
+        default_sort='-created_at',
+        filterable={'status': FoundDocument.status, 'source': FoundDocument.source},
+        searchable=[FoundDocument.file_name, FoundDocument.url],
+        default_limit=50,
+        max_limit=200
+    )
 
 
 @retriever_bp.route('/api/embed-documents', methods=['POST'])
@@ -45,8 +64,17 @@ def embed_documents():
     if not selected_ids:
         return jsonify({"error": "No IDs provided"}), 400
 
-    results = embed_documents_by_ids(selected_ids)
-    return jsonify(results), 200
+    job = embed_documents_by_ids(selected_ids)
+    if not job["job_id"]:
+        return jsonify({"error": "No matching documents found"}), 404
+    return jsonify(job), 202
+
+@retriever_bp.route('/api/embed-jobs/<job_id>', methods=['GET'])
+def get_embed_job(job_id):
+    job = get_embedding_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
 
 @retriever_bp.route('/api/search-documents')
 def search_documents():
@@ -86,125 +114,109 @@ def query_documents():
 
 def parse_cp_from_file(file_path):
     """
-    Membaca file teks CP dan mengubahnya menjadi struktur data Python.
-    Fungsi ini dirancang untuk fleksibel terhadap format penulisan elemen.
+    Membaca file CP (.txt, .pdf atau .docx) dan mengubahnya menjadi struktur data Python.
+    File batch boleh berisi beberapa mapel lewat header "Mata Pelajaran: <nama>".
+    Parsing berjalan baris demi baris, lihat services/cp_ingestion.py.
     """
-    structured_data = []
-    current_fase = None
-    reading_mode = None # Mode bisa 'umum' atau 'elemen'
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Deteksi Fase Baru
-            fase_match = re.search(r'FASE\s+([A-F])', line, re.IGNORECASE)
-            if fase_match:
-                current_fase = fase_match.group(1).upper()
-                reading_mode = None # Reset mode saat ganti fase
-                continue
-
-            if not current_fase:
-                continue
-
-            # Deteksi mode baca
-            if 'capaian umum' in line.lower():
-                reading_mode = 'umum'
-                capaian_umum_text = line.split(':', 1)[1].strip() if ':' in line else ''
-                if capaian_umum_text:
-                    structured_data.append({
-                        'fase': current_fase,
-                        'elemen_name': 'Capaian Umum',
-                        'isi': capaian_umum_text
-                    })
-                continue
-            
-            if 'capaian per elemen' in line.lower() or 'elemen:' in line.lower():
-                reading_mode = 'elemen'
-                continue
-
-            # Proses baris berdasarkan mode baca
-            if reading_mode == 'umum':
-                structured_data.append({
-                    'fase': current_fase,
-                    'elemen_name': 'Capaian Umum',
-                    'isi': line
-                })
-                reading_mode = None
-
-            elif reading_mode == 'elemen':
-                elemen_match = re.match(r'^[•-]\s*([^:]+):\s*(.*)', line)
-                if elemen_match:
-                    nama_elemen = elemen_match.group(1).strip()
-                    isi_elemen = elemen_match.group(2).strip()
-                    structured_data.append({
-                        'fase': current_fase,
-                        'elemen_name': nama_elemen,
-                        'isi': isi_elemen
-                    })
-
-    return structured_data
+    return list(iter_cp_rows_from_file(file_path))
 
+def _save_cp_uploads(files):
+    """Menyimpan file CP ke UPLOAD_FOLDER/cp_documents; mengembalikan list (path, nama asli)."""
+    upload_folder = os.path.join(current_app.config['UPLOAD_FOLDER'], 'cp_documents')
+    os.makedirs(upload_folder, exist_ok=True)
+    saved = []
+    for file in files:
+        file_path = os.path.join(upload_folder, f"{uuid.uuid4().hex}_{secure_filename(file.filename)}")
+        file.save(file_path)
+        saved.append((file_path, file.filename))
+    return saved
+
+def _cp_upload_request():
+    """Validasi bersama untuk upload CP sinkron maupun job; mengembalikan (files, subject, error)."""
+    files = [f for f in request.files.getlist('file') if f and f.filename]
+    if not files:
+        return None, None, (jsonify({"error": "Tidak ada file yang diunggah"}), 400)
+    unsupported = [f.filename for f in files if os.path.splitext(f.filename)[1].lower() not in SUPPORTED_EXTENSIONS]
+    if unsupported:
+        return None, None, (jsonify({"error": f"Format file tidak didukung (hanya .txt, .pdf, .docx): {', '.join(unsupported)}"}), 400)
+
+    # Subject default (opsional jika setiap file punya header mapel)
+    subject = None
+    subject_id = request.form.get('subject_id')
+    if subject_id:
+        subject = Subject.query.get(subject_id)
+        if not subject:
+            return None, None, (jsonify({"error": f"Subject dengan ID {subject_id} tidak ditemukan"}), 404)
+    return files, subject, None
 
 @retriever_bp.route('/api/cp/upload-and-parse', methods=['POST'])
-def upload_cp_and_parse():
+@token_required
+def upload_cp_and_parse(current_user):
+    """
+    Mengunggah satu atau beberapa file CP (field 'file' boleh diulang). subject_id menjadi
+    mapel default; file batch dapat memuat beberapa mapel lewat header "Mata Pelajaran:".
+    Semua baris di-upsert massal dalam satu transaksi (lihat services/cp_import.py).
+    Untuk kompilasi CP resmi yang besar gunakan /api/cp/ingest-jobs (background).
+    """
     # 1. Validasi
-    if 'file' not in request.files:
-        return jsonify({"error": "Tidak ada file yang diunggah"}), 400
-    
-    file = request.files['file']
-    subject_id = request.form.get('subject_id')
+    files, subject, error = _cp_upload_request()
+    if error:
+        return error
 
-    if not subject_id:
-        return jsonify({"error": "Subject ID wajib diisi"}), 400
+    # 2. Simpan file lalu parsing baris demi baris
+    parsed_data = []
+    for file_path, source in _save_cp_uploads(files):
+        for row in iter_cp_rows_from_file(file_path):
+            row['source'] = source
+            parsed_data.append(row)
 
-    # 2. Cek Subject (Sekarang hanya perlu cek ID)
-    subject = Subject.query.get(subject_id)
-    if not subject:
-        return jsonify({"error": f"Subject dengan ID {subject_id} tidak ditemukan"}), 404
-
-    # 3. Simpan File Temporer
-    upload_folder = 'uploads/cp_documents'
-    os.makedirs(upload_folder, exist_ok=True)
-    file_path = os.path.join(upload_folder, file.filename)
-    file.save(file_path)
+    if not parsed_data:
+        return jsonify({"error": "Tidak ada data yang bisa diparsing dari file."}), 400
 
     try:
-        # 4. Parsing dan Simpan ke DB (logika ini tidak berubah)
-        parsed_data = parse_cp_from_file(file_path)
-        if not parsed_data:
-            return jsonify({"error": "Tidak ada data yang bisa diparsing dari file."}), 400
-
-        for data in parsed_data:
-            # ... (logika for loop untuk membuat Elemen dan CP tetap sama persis)
-            elemen_name = data.get('elemen_name', 'Capaian Umum')
-            elemen = Elemen.query.filter_by(subject_id=subject.id, nama_elemen=elemen_name).first()
-            if not elemen:
-                elemen = Elemen(subject_id=subject.id, nama_elemen=elemen_name)
-                db.session.add(elemen)
-                db.session.flush()
-
-            existing_cp = CP.query.filter_by(elemen_id=elemen.id, fase=data['fase']).first()
-            if existing_cp:
-                existing_cp.isi_cp = data['isi']
-            else:
-                new_cp = CP(
-                    elemen_id=elemen.id,
-                    fase=data['fase'],
-                    isi_cp=data['isi'],
-                    sumber_dokumen=file.filename
-                )
-                db.session.add(new_cp)
-        
-        db.session.commit()
-        
-        return jsonify({
-            "message": f"File CP untuk '{subject.name}' berhasil diunggah dan diproses!",
-            "data_ditemukan": len(parsed_data)
-        }), 201
+        resolved = resolve_subjects(parsed_data, default_subject=subject)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
+    try:
+        # 3. Upsert massal ke DB
+        summary = import_cp_rows(resolved, current_user.id)
     except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": "Terjadi kesalahan saat memproses file ke database", "details": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": "Terjadi kesalahan saat memproses file ke database", "details": str(e)}), 500
+
+    subject_names = ", ".join(f"'{item['subject_name']}'" for item in summary)
+    return jsonify({
+        "message": f"File CP untuk {subject_names} berhasil diunggah dan diproses!",
+        "data_ditemukan": len(parsed_data),
+        "summary": {
+            "created": sum(item['created'] for item in summary),
+            "updated": sum(item['updated'] for item in summary),
+            "unchanged": sum(item['unchanged'] for item in summary),
+            "elemen_created": sum(item['elemen_created'] for item in summary),
+            "subjects": summary,
+        }
+    }), 201
+
+
+@retriever_bp.route('/api/cp/ingest-jobs', methods=['POST'])
+@token_required
+def start_cp_ingest_job(current_user):
+    """Sama seperti upload-and-parse, tetapi parsing + upsert berjalan di background."""
+    files, subject, error = _cp_upload_request()
+    if error:
+        return error
+
+    saved = _save_cp_uploads(files)
+    job_id = start_cp_ingestion_job(current_app.app_context(), saved, subject.id if subject else None,
+                                    uploaded_by_id=current_user.id)
+    return jsonify({"job_id": job_id}), 202
+
+@retriever_bp.route('/api/cp/ingest-jobs/<job_id>', methods=['GET'])
+@token_required
+def get_cp_ingest_job(current_user, job_id):
+    job = get_cp_ingestion_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if current_user.role != 'Developer' and job['uploaded_by'] != current_user.id:
+        return jsonify({"error": "Permission denied."}), 403
+    return jsonify(job), 200
@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 from app.extensions import db
 from app.models import School
 from app.utils.decorators import token_required
+from app.utils.pagination import paginated_response
 
 school_bp = Blueprint('school_bp', __name__)
 
@@ -10,14 +11,19 @@ school_bp = Blueprint('school_bp', __name__)
 def get_schools(current_user):
     """Get a list of schools based on user role."""
     if current_user.role == 'Developer':
-        schools = School.query.all()
+        schools = School.query
     elif current_user.role == 'School Admin':
-        schools = School.query.filter_by(id=current_user.school_id).all()
+        schools = School.query.filter_by(id=current_user.school_id)
     else:
         return jsonify({"error": "Access denied"}), 403
 
-    school_list = [{"id": s.id, "name": s.name, "address": s.address} for s in schools]
-    return jsonify(school_list)
+    return paginated_response(
+        schools, lambda s: {"id": s.id, "name": s.name, "address": s.address}, School.id,
+        sortable={'id': School.id, 'name': School.name},
+        default_sort='id',
+        filterable={'level': School.level},
+        searchable=[School.name, School.address]
+    )
 
 @school_bp.route('/api/schools', methods=['POST'])
 @token_required
@@ -1,12 +1,94 @@
-from flask import Blueprint, jsonify
+import datetime
+import hashlib
+import json
+import queue
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from sqlalchemy import func, or_, and_
+from app.extensions import db
 from app.models import PDFReference
+from app.services.progress_events import broker
+from app.utils.decorators import stream_token_required
+from app.utils.pagination import parse_limit
 
 status_bp = Blueprint('status_bp', __name__)
 
+DEFAULT_STATUS_LIMIT = 50
+MAX_STATUS_LIMIT = 200
+ACTIVE_STATUSES = ('pending', 'extracting', 'indexing')
+SSE_KEEPALIVE_SECONDS = 15
+# Worker mengisi updated_at saat flush, tetapi commit-nya bisa menyusul setelah query
+# polling berjalan. `since` berikutnya dimundurkan sebesar jendela ini agar baris
+# seperti itu tetap terkirim (baris yang terkirim dua kali cukup ditimpa oleh klien).
+STATUS_SYNC_WINDOW = datetime.timedelta(seconds=10)
+
+def _encode_cursor(ref):
+    return f"{ref.uploaded_at.isoformat()}_{ref.id}"
+
+def _decode_cursor(cursor):
+    uploaded_at, ref_id = cursor.rsplit('_', 1)
+    return datetime.datetime.fromisoformat(uploaded_at), int(ref_id)
+
+def _status_etag():
+    """
+    ETag murah untuk seluruh tabel: cukup dua agregat yang dilayani indeks
+    (updated_at terbaru dan id terbesar), ditambah query string permintaan.
+    """
+    last_updated, last_id = db.session.query(
+        func.max(PDFReference.updated_at), func.max(PDFReference.id)
+    ).one()
+    raw = f"{last_updated}|{last_id}|{request.query_string.decode()}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
 @status_bp.route('/api/uploads/status', methods=['GET'])
 def get_uploads_status():
+    """
+    Daftar status unggahan PDF.
+    Query params:
+    - since: ISO timestamp, hanya baris yang status/progress-nya berubah setelahnya
+    - active: '1' untuk hanya job yang masih berjalan
+    - limit (default DEFAULT_STATUS_LIMIT), cursor: paginasi keyset (cursor berikutnya
+      ada di header X-Next-Cursor)
+    Header respons X-Sync-Timestamp dipakai klien sebagai nilai `since` berikutnya;
+    nilainya sudah dikurangi STATUS_SYNC_WINDOW.
+    """
     try:
-        references = PDFReference.query.order_by(PDFReference.uploaded_at.desc()).all()
+        etag = _status_etag()
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+        sync_timestamp = datetime.datetime.utcnow() - STATUS_SYNC_WINDOW
+        limit = parse_limit(request.args, DEFAULT_STATUS_LIMIT, MAX_STATUS_LIMIT)
+
+        # Hanya ambil kolom yang dibutuhkan, bukan seluruh baris PDFReference
+        query = db.session.query(
+            PDFReference.id,
+            PDFReference.filename,
+            PDFReference.processing_status,
+            PDFReference.uploaded_at,
+            PDFReference.processing_progress
+        )
+
+        since = request.args.get('since')
+        if since:
+            query = query.filter(PDFReference.updated_at > datetime.datetime.fromisoformat(since))
+        if request.args.get('active') == '1':
+            query = query.filter(PDFReference.processing_status.in_(ACTIVE_STATUSES))
+
+        cursor = request.args.get('cursor')
+        if cursor:
+            cursor_uploaded_at, cursor_id = _decode_cursor(cursor)
+            query = query.filter(or_(
+                PDFReference.uploaded_at < cursor_uploaded_at,
+                and_(PDFReference.uploaded_at == cursor_uploaded_at, PDFReference.id < cursor_id)
+            ))
+
+        query = query.order_by(PDFReference.uploaded_at.desc(), PDFReference.id.desc())
+        references = query.limit(limit + 1).all()
+        has_more = len(references) > limit
+        references = references[:limit]
+
         status_list = [
             {
                 "id": ref.id,
@@ -17,6 +99,67 @@ def get_uploads_status():
             }
             for ref in references
         ]
-        return jsonify(status_list), 200
+        response = jsonify(status_list)
+        response.set_etag(etag)
+        response.headers['X-Sync-Timestamp'] = sync_timestamp.isoformat()
+        if has_more:
+            response.headers['X-Next-Cursor'] = _encode_cursor(references[-1])
+        return response, 200
+    except ValueError:
+        return jsonify({"error": "Invalid since, cursor or limit parameter"}), 400
     except Exception as e:
-        return jsonify({"error": "Could not retrieve upload statuses", "details": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": "Could not retrieve upload statuses", "details": str(e)}), 500
+
+def _format_sse(event):
+    return f"id: {event['id']}\nevent: progress\ndata: {json.dumps(event)}\n\n"
+
+@status_bp.route('/api/uploads/events', methods=['GET'])
+@stream_token_required
+def stream_ingestion_events(current_user):
+    """
+    Server-Sent Events untuk progres ingestion (OCR PDF dan pemrosesan buku).
+    Browser otomatis mengirim header Last-Event-ID saat reconnect; event yang
+    terlewat dikirim ulang dari riwayat broker sebelum event baru.
+    Developer menerima semua event; user lain hanya event job miliknya (owner_id).
+    Token boleh dikirim lewat `?token=` karena EventSource tidak bisa mengirim header.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({"error": "Invalid Last-Event-ID"}), 400
+
+    # Diambil sebelum session dilepas; generator tidak boleh memuat User lagi
+    user_id, see_all = current_user.id, current_user.role == 'Developer'
+
+    def visible(event):
+        return see_all or event.get('owner_id') == user_id
+
+    # Koneksi SSE bisa terbuka berjam-jam; kembalikan koneksi DB (dipakai cek token)
+    # ke pool sekarang, generator di bawah tidak menyentuh database
+    db.session.remove()
+
+    subscriber, backlog = broker.subscribe(last_event_id)
+
+    def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            for event in backlog:
+                if visible(event):
+                    yield _format_sse(event)
+            while True:
+                try:
+                    event = subscriber.get(timeout=SSE_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    # Komentar SSE agar koneksi tidak diputus proxy saat tidak ada job
+                    yield ": keepalive\n\n"
+                    continue
+                if visible(event):
+                    yield _format_sse(event)
+        finally:
+            broker.unsubscribe(subscriber)
+
+    response = Response(stream_with_context(event_stream()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
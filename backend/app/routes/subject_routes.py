@@ -2,15 +2,23 @@ from flask import Blueprint, request, jsonify
 from app.extensions import db
 from app.models import Subject
 from app.utils.decorators import token_required
+from app.utils.pagination import paginated_response
+from app.utils.response_cache import etag_cached
 
 subject_bp = Blueprint('subject_bp', __name__)
 
 @subject_bp.route('/api/subjects', methods=['GET'])
 @token_required
+@etag_cached(['subjects'])
 def get_subjects(current_user):
     """Get all subjects (built-in + custom)."""
-    subjects = Subject.query.order_by(Subject.name).all()
-    return jsonify([s.to_dict() for s in subjects])
+    return paginated_response(
+        Subject.query, Subject.to_dict, Subject.id,
+        sortable={'id': Subject.id, 'name': Subject.name},
+        default_sort='name',
+        filterable={'is_custom': Subject.is_custom},
+        searchable=[Subject.name]
+    )
 
 @subject_bp.route('/api/subjects', methods=['POST'])
 @token_required
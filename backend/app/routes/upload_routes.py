@@ -1,10 +1,14 @@
 import os
 import threading
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from werkzeug.utils import secure_filename
 from app.extensions import db
 from app.models import PDFReference
 from app.services.ocr_service import ocr_process_pdf_with_context
+from app.services.progress_events import publish_progress
+from app.services.text_store import delete_extracted_text, iter_extracted_text
+from app.utils.decorators import token_required
+from app.utils.file_hash import compute_sha256
 
 upload_bp = Blueprint('upload_bp', __name__)
 
@@ -12,13 +16,15 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ['pdf']
 
 @upload_bp.route('/api/upload/pdf', methods=['POST'])
-def upload_pdf_file():
+@token_required
+def upload_pdf_file(current_user):
     uploaded_files = request.files.getlist('files')
     
     if not uploaded_files or all(f.filename == '' for f in uploaded_files):
         return jsonify({"error": "No selected files"}), 400
 
     queued_files = []
+    skipped_files = []
     errors = {}
 
     for file in uploaded_files:
@@ -26,6 +32,16 @@ def upload_pdf_file():
             filename = secure_filename(file.filename)
             upload_folder = current_app.config['UPLOAD_FOLDER']
             file_path = os.path.join(upload_folder, filename)
+
+            # Hitung hash isi file sebelum disimpan; file identik yang sudah
+            # selesai diproses tidak perlu di-OCR dan di-index ulang
+            content_hash = compute_sha256(file.stream)
+            duplicate = PDFReference.query.filter_by(
+                content_hash=content_hash, processing_status='done'
+            ).first()
+            if duplicate:
+                skipped_files.append({"filename": filename, "duplicate_of": duplicate.id})
+                continue
             
             # Save the file, overwriting if it exists
             file.save(file_path)
@@ -36,17 +52,21 @@ def upload_pdf_file():
             if pdf_ref:
                 # If it exists, just reset its status
                 pdf_ref.processing_status = 'pending'
-                pdf_ref.extracted_text = None # Clear old text
+                delete_extracted_text(pdf_ref.extracted_text_path) # Clear old text
+                pdf_ref.extracted_text_path = None
             else:
                 # If it doesn't exist, create a new record
                 pdf_ref = PDFReference(filename=filename, file_path=file_path, processing_status='pending')
                 db.session.add(pdf_ref)
+            pdf_ref.content_hash = content_hash
+            pdf_ref.uploaded_by = current_user.id
             
             db.session.commit()
 
             # Start OCR in a background thread
             app_context = current_app.app_context()
             thread = threading.Thread(target=ocr_process_pdf_with_context, args=(app_context, file_path, pdf_ref.id))
+            publish_progress('pdf', pdf_ref.id, 'pending', 0, owner_id=current_user.id)
             thread.start()
             
             queued_files.append(filename)
@@ -56,5 +76,24 @@ def upload_pdf_file():
     return jsonify({
         "message": f"Queued {len(queued_files)} file(s) for processing.",
         "queued_files": queued_files,
+        "skipped_files": skipped_files,
         "errors": errors
-    }), 202
\ No newline at end of file
+    }), 202
+
+@upload_bp.route('/api/uploads/<int:ref_id>/text', methods=['GET'])
+@token_required
+def get_extracted_text(current_user, ref_id):
+    """
+    Mengalirkan (stream) teks hasil ekstraksi sebuah PDF tanpa memuatnya sekaligus.
+    Hanya untuk pengunggah dokumen dan Developer.
+    """
+    row = db.session.query(PDFReference.extracted_text_path, PDFReference.uploaded_by).filter_by(id=ref_id).first()
+    if row is None:
+        return jsonify({"error": "Extracted text not available"}), 404
+    text_path, uploaded_by = row
+    if current_user.role != 'Developer' and uploaded_by != current_user.id:
+        return jsonify({"error": "Permission denied."}), 403
+    if not text_path or not os.path.exists(text_path):
+        return jsonify({"error": "Extracted text not available"}), 404
+
+    return Response(stream_with_context(iter_extracted_text(text_path)), mimetype='text/plain; charset=utf-8')
@@ -1,30 +1,33 @@
 from flask import Blueprint, jsonify, request 
+from sqlalchemy.orm import joinedload, selectinload
 from app.extensions import db, bcrypt
 from app.models import User, School
-from app.utils.decorators import token_required
+from app.utils.decorators import token_required, create_token, revoke_user_tokens, forget_user
+from app.utils.pagination import paginated_response
 
 user_mgmt_bp = Blueprint('user_mgmt_bp', __name__)
 
 @user_mgmt_bp.route('/api/users', methods=['GET'])
 @token_required
 def get_users(current_user):
+    # Sekolah (admin) & sekolah tempat mengajar (guru) dimuat sekaligus, bukan per user
+    users_query = User.query.options(joinedload(User.school), selectinload(User.schools_taught))
+
     if current_user.role == 'Developer':
-        users = User.query.all()
+        pass
 
     elif current_user.role == 'School Admin':
-        users = User.query.filter(
+        users_query = users_query.filter(
             (User.role == 'Teacher') | (User.id == current_user.id)
-        ).all()
+        )
 
     else:
         return jsonify({"error": "You do not have permission to access this resource."}), 403
 
-    user_list = []
-    for u in users:
+    def serialize(u):
         school_names = [s.name for s in u.schools_taught] if u.role == 'Teacher' else [u.school.name] if u.school else []
         school_ids = [s.id for s in u.schools_taught] if u.role == 'Teacher' else []
-
-        user_list.append({
+        return {
             "id": u.id,
             "username": u.username,
             "email": u.email,
@@ -32,9 +35,15 @@ def get_users(current_user):
             "school_id": u.school_id,
             "school_ids": school_ids,
             "school_names": school_names
-        })
-
-    return jsonify(user_list)
+        }
+
+    return paginated_response(
+        users_query, serialize, User.id,
+        sortable={'id': User.id, 'username': User.username, 'email': User.email, 'role': User.role},
+        default_sort='id',
+        filterable={'role': User.role, 'school_id': User.school_id},
+        searchable=[User.username, User.email]
+    )
 
 @user_mgmt_bp.route('/api/users', methods=['POST'])
 @token_required
@@ -101,14 +110,25 @@ def update_user(current_user, user_id):
 
     user_to_update.email = data.get('email', user_to_update.email)
     user_to_update.username = data.get('username', user_to_update.username)
+    revoke = False
     if data.get('password'):
         user_to_update.password_hash = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+        revoke = True
 
-    if current_user.role == 'Developer' and 'role' in data:
-        user_to_update.role = data.get('role', user_to_update.role)
+    if current_user.role == 'Developer' and 'role' in data and data['role'] != user_to_update.role:
+        user_to_update.role = data['role']
+        revoke = True
 
+    # Token lama membawa klaim yang sudah basi (role) atau password lama -> cabut
+    if revoke:
+        revoke_user_tokens(user_to_update)
     db.session.commit()
-    return jsonify({"message": "User updated successfully."})
+
+    response = {"message": "User updated successfully."}
+    if revoke and current_user.id == user_to_update.id:
+        # User yang mengubah dirinya sendiri tetap login dengan token baru
+        response["token"] = create_token(user_to_update)
+    return jsonify(response)
 
 @user_mgmt_bp.route('/api/users/<int:user_id>', methods=['DELETE'])
 @token_required
@@ -127,6 +147,7 @@ def delete_user(current_user, user_id):
 
     db.session.delete(user_to_delete)
     db.session.commit()
+    forget_user(user_id)
     return jsonify({"message": "User deleted successfully."})
 
 @user_mgmt_bp.route('/api/users/<int:user_id>/assign-schools', methods=['PUT'])
@@ -147,7 +168,9 @@ def assign_schools_to_user(current_user, user_id):
     if user.role == 'School Admin':
         if len(school_ids) != 1:
             return jsonify({"error": "School Admin must belong to exactly one school."}), 400
-        user.school_id = school_ids[0]
+        if user.school_id != school_ids[0]:
+            user.school_id = school_ids[0]
+            revoke_user_tokens(user)
 
     elif user.role == 'Teacher':
         schools = School.query.filter(School.id.in_(school_ids)).all()
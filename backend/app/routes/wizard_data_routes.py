@@ -1,6 +1,7 @@
 # backend/app/routes/wizard_data_routes.py
 
 from flask import Blueprint, jsonify
+from sqlalchemy.orm import joinedload
 from app.models import Class
 from app.utils.decorators import token_required
 
@@ -18,9 +19,9 @@ def get_my_classes(current_user):
     try:
         classes_to_process = []
         if current_user.role == 'Developer':
-            classes_to_process = Class.query.all()
+            classes_to_process = Class.query.options(joinedload(Class.subject)).all()
         elif current_user.role == 'Teacher':
-            classes_to_process = Class.query.filter_by(teacher_id=current_user.id).all()
+            classes_to_process = Class.query.options(joinedload(Class.subject)).filter_by(teacher_id=current_user.id).all()
         
         results = []
         for cls in classes_to_process:
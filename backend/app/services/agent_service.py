@@ -2,7 +2,8 @@ import os
 import json
 import re
 from .ai_service import generate_content_with_context, generate_summary_with_together_ai
-from .rag_service import search_index
+from .rag_service import search_index, model as embedding_model
+from .context_builder import ContextBuilder, OUTLINE_CONTEXT_TOKENS, WRITER_CONTEXT_TOKENS, estimate_tokens, truncate_to_tokens
 from app.utils.search_tool import search_internet
 
 def parse_json_from_string(text):
@@ -62,7 +63,7 @@ def run_research_agent(topik, kelas, mapel, jenis_dokumen):
     research_summary = generate_summary_with_together_ai(summarization_prompt)
     return research_summary
 
-def run_curriculum_specialist_agent(kelas, mapel, jenis_dokumen, topik, full_context):
+def run_curriculum_specialist_agent(kelas, mapel, jenis_dokumen, topik, context_chunks):
     """
     Tugas: Menganalisis input & konteks, lalu membuat kerangka (outline) dokumen.
     """
@@ -78,7 +79,7 @@ def run_curriculum_specialist_agent(kelas, mapel, jenis_dokumen, topik, full_con
 
     prompt = f"""
     Anda adalah seorang ahli dalam desain Kurikulum Merdeka di Indonesia.
-    Berdasarkan konteks yang diberikan: '{full_context}'.
+    Gunakan konteks yang diberikan di atas sebagai acuan.
     
     Buatkan kerangka (outline) untuk sebuah '{jenis_dokumen}' mata pelajaran '{mapel}' untuk siswa kelas '{kelas}' dengan topik '{topik}'.
     
@@ -86,7 +87,8 @@ def run_curriculum_specialist_agent(kelas, mapel, jenis_dokumen, topik, full_con
     {json_structure}
     """
     
-    outline_str = generate_content_with_context(prompt, [full_context])
+    # Konteks hanya dikirim sekali, lewat context_chunks (tidak disisipkan lagi ke prompt)
+    outline_str = generate_content_with_context(prompt, context_chunks)
     outline_json = parse_json_from_string(outline_str)
     
     if not outline_json:
@@ -95,13 +97,13 @@ def run_curriculum_specialist_agent(kelas, mapel, jenis_dokumen, topik, full_con
         
     return outline_json
 
-def run_content_writer_agent(tujuan, topik, kelas, mapel, context):
+def run_content_writer_agent(tujuan, topik, kelas, mapel, context_chunks):
     """
     Tugas: Menulis materi inti berdasarkan satu tujuan pembelajaran.
     """
     print(f"✍️  Agen Penulis Konten: Menulis materi untuk '{tujuan}'...")
-    prompt = f"Jelaskan secara detail, mendalam, dan mudah dipahami untuk siswa kelas {kelas} materi tentang '{tujuan}' dalam konteks {topik} pada mata pelajaran {mapel}. Gunakan konteks berikut sebagai acuan utama: '{context}'. Berikan contoh yang relevan dan praktis."
-    return generate_content_with_context(prompt, [context])
+    prompt = f"Jelaskan secara detail, mendalam, dan mudah dipahami untuk siswa kelas {kelas} materi tentang '{tujuan}' dalam konteks {topik} pada mata pelajaran {mapel}. Gunakan konteks di atas sebagai acuan utama. Berikan contoh yang relevan dan praktis."
+    return generate_content_with_context(prompt, context_chunks)
 
 def run_pedagogy_designer_agent(aktivitas_outline, topik, kelas, mapel):
     """
@@ -138,7 +140,8 @@ def run_qa_specialist_agent(full_draft, jenis_dokumen, kelas, mapel):
 def generate_document_with_agents(kelas, mapel, jenis, topik):
     print(f"🚀 Memulai alur kerja agen untuk: {jenis} - {mapel} Kelas {kelas}")
     print("🧠 Mencari konteks di database internal (ChromaDB)...")
-    rag_context_chunks = search_index(f"Capaian Pembelajaran dan ATP untuk {mapel} kelas {kelas} mengenai {topik}")
+    rag_query = f"Capaian Pembelajaran dan ATP untuk {mapel} kelas {kelas} mengenai {topik}"
+    rag_context_chunks = search_index(rag_query)
     
     internet_context = ""
     if not rag_context_chunks:
@@ -147,10 +150,18 @@ def generate_document_with_agents(kelas, mapel, jenis, topik):
     else:
         print("✅ Konteks internal ditemukan.")
 
-    rag_context = "\n".join(rag_context_chunks)
-    full_context = f"Konteks Internal (RAG):\n{rag_context}\n\nKonteks Internet:\n{internet_context}"
+    # Dedup + MMR + anggaran token per agen, alih-alih mengirim ke-25 chunk ke setiap panggilan
+    context_builder = ContextBuilder(rag_context_chunks, embedding_model.encode)
+    print(f"🧹 Konteks: {len(rag_context_chunks)} chunk -> {len(context_builder.chunks)} unik")
 
-    outline = run_curriculum_specialist_agent(kelas, mapel, jenis, topik, full_context)
+    def context_for(query, token_budget):
+        if not context_builder.chunks:
+            return [f"Konteks Internet:\n{truncate_to_tokens(internet_context, token_budget)}"] if internet_context else []
+        return context_builder.select(query, token_budget)
+
+    outline_context = context_for(rag_query, OUTLINE_CONTEXT_TOKENS)
+    print(f"🧮 Konteks outline: ~{sum(estimate_tokens(c) for c in outline_context)} token")
+    outline = run_curriculum_specialist_agent(kelas, mapel, jenis, topik, outline_context)
     if not outline:
         return "Gagal membuat kerangka dokumen. Layanan AI mungkin tidak dapat memproses permintaan. Coba lagi dengan topik yang lebih spesifik."
 
@@ -158,7 +169,10 @@ def generate_document_with_agents(kelas, mapel, jenis, topik):
     draft_dokumen += f"**Topik:** {topik}\n\n"
 
     if jenis == "Modul Ajar":
-        materi_pembelajaran = [run_content_writer_agent(t, topik, kelas, mapel, full_context) for t in outline.get("tujuan_pembelajaran", [])]
+        materi_pembelajaran = [
+            run_content_writer_agent(t, topik, kelas, mapel, context_for(f"{t} {topik} {mapel}", WRITER_CONTEXT_TOKENS))
+            for t in outline.get("tujuan_pembelajaran", [])
+        ]
         aktivitas_inti = [run_pedagogy_designer_agent(a, topik, kelas, mapel) for a in outline.get("alur_kegiatan", {}).get("inti", [])]
         
         draft_dokumen += "**A. TUJUAN PEMBELAJARAN**\n"
@@ -3,46 +3,31 @@
 from app.extensions import db
 from app.models import Book, MediaAsset
 import pdfplumber
-import re
 import os
 from flask import current_app
+from app.utils.structured_text import parse_toc_lines
+from .progress_events import publish_progress
+
+def _iter_toc_lines(pdf_path, max_pages=10):
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages[:max_pages]:
+            text = page.extract_text()
+            if text:
+                yield from text.split('\n')
 
 def _extract_toc_smart(pdf_path):
     """
     Fungsi cerdas untuk mengekstrak Daftar Isi (Table of Contents) dari PDF.
+    Subbab dikelompokkan ke dalam `subsections` bab (BAB ...) di atasnya.
     """
-    chapters = []
-    chapter_pattern = re.compile(r'^(BAB\s+[IVXLC\d]+)', re.IGNORECASE)
-    toc_entry_pattern = re.compile(r'(.+?)\s*\.{5,}\s*(\d+)')
-
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages[:10]):
-                text = page.extract_text()
-                if not text:
-                    continue
-
-                lines = text.split('\n')
-                for line in lines:
-                    match = toc_entry_pattern.search(line)
-                    if match:
-                        title = match.group(1).strip()
-                        page_num = int(match.group(2))
-                        
-                        if len(title) > 4 and not any(c['title'] == title for c in chapters):
-                            is_main_chapter = chapter_pattern.match(title)
-                            if is_main_chapter:
-                                chapters.append({"title": title, "page": page_num, "subsections": []})
-                            else:
-                                chapters.append({"title": title, "page": page_num, "subsections": []})
-        
-        return {"chapters": chapters}
+        return parse_toc_lines(_iter_toc_lines(pdf_path))
     except Exception as e:
         print(f"Error saat mengekstrak ToC dari {os.path.basename(pdf_path)}: {e}")
         return {"chapters": []}
 
 # --- FUNGSI BARU UNTUK EKSTRAKSI GAMBAR ---
-def _extract_and_save_images(pdf_path, book_id):
+def _extract_and_save_images(pdf_path, book_id, owner_id=None):
     """
     Mengekstrak semua gambar dari PDF, menyimpannya sebagai file,
     dan membuat record di tabel MediaAsset.
@@ -54,7 +39,13 @@ def _extract_and_save_images(pdf_path, book_id):
     
     try:
         with pdfplumber.open(pdf_path) as pdf:
+            total_pages = len(pdf.pages)
+            last_progress = None
             for i, page in enumerate(pdf.pages):
+                progress = int(((i + 1) / total_pages) * 100)
+                if progress != last_progress:
+                    publish_progress('book', book_id, 'images', progress, owner_id=owner_id)
+                    last_progress = progress
                 for img_index, img_obj in enumerate(page.images):
                     try:
                         # Mengambil data gambar mentah (bytes)
@@ -85,6 +76,24 @@ def _extract_and_save_images(pdf_path, book_id):
         print(f"Error saat memproses gambar dari PDF {os.path.basename(pdf_path)}: {e}")
         return 0
 
+def copy_processed_content(source_book, target_book):
+    """
+    Menyalin hasil pemrosesan (ToC dan media) dari buku yang isinya identik,
+    sehingga unggahan ulang buku yang sama tidak perlu diproses dari awal.
+    File gambar tidak diduplikasi; record MediaAsset baru menunjuk ke file yang sama.
+    """
+    target_book.topic_json = source_book.topic_json
+    for asset in source_book.media_assets:
+        target_book.media_assets.append(MediaAsset(
+            tipe_media=asset.tipe_media,
+            caption=asset.caption,
+            halaman=asset.halaman,
+            topik_terkait=asset.topik_terkait,
+            file_path=asset.file_path,
+            resolusi=asset.resolusi
+        ))
+    return len(source_book.media_assets)
+
 # --- FUNGSI UTAMA YANG DIPERBARUI ---
 def extract_book_content_and_media(app_context, book_id):
     """
@@ -97,9 +106,11 @@ def extract_book_content_and_media(app_context, book_id):
         if not book:
             print(f"Buku ID {book_id} tidak ditemukan.")
             return
+        owner_id = book.uploaded_by
 
         try:
             # 1. Ekstrak Daftar Isi (ToC)
+            publish_progress('book', book_id, 'extracting', 0, owner_id=owner_id)
             print(f"Mengekstrak daftar isi dari {book.file_path}...")
             topic_json_data = _extract_toc_smart(book.file_path)
             if topic_json_data and topic_json_data["chapters"]:
@@ -111,12 +122,14 @@ def extract_book_content_and_media(app_context, book_id):
             
             # ---- MEMANGGIL FUNGSI EKSTRAKSI GAMBAR ----
             print("Memulai ekstraksi gambar...")
-            num_images = _extract_and_save_images(book.file_path, book.id)
+            num_images = _extract_and_save_images(book.file_path, book.id, owner_id)
             print(f"Berhasil mengekstrak dan menyimpan {num_images} gambar.")
 
             db.session.commit()
+            publish_progress('book', book_id, 'done', 100, owner_id=owner_id)
             print(f"Pemrosesan LENGKAP untuk buku ID: {book_id} selesai.")
 
         except Exception as e:
             db.session.rollback()
+            publish_progress('book', book_id, 'failed', message=str(e), owner_id=owner_id)
             print(f"Terjadi error saat memproses buku ID {book_id}: {e}")
\ No newline at end of file
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import re
+import numpy as np
+
+# Perkiraan kasar token untuk teks Bahasa Indonesia (tanpa tokenizer Gemini): ~4 karakter per token
+CHARS_PER_TOKEN = 4
+NEAR_DUPLICATE_SIMILARITY = float(os.getenv("CONTEXT_NEAR_DUPLICATE_SIMILARITY", "0.95"))
+MMR_LAMBDA = float(os.getenv("CONTEXT_MMR_LAMBDA", "0.7"))
+
+# Anggaran token konteks per agen
+OUTLINE_CONTEXT_TOKENS = int(os.getenv("OUTLINE_CONTEXT_TOKENS", "3000"))
+WRITER_CONTEXT_TOKENS = int(os.getenv("WRITER_CONTEXT_TOKENS", "1200"))
+
+def estimate_tokens(text):
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+def _normalize(text):
+    # Nomor halaman dan spasi diabaikan agar header/footer yang berulang per halaman dianggap sama
+    text = re.sub(r'\d+', '', text.lower())
+    return re.sub(r'\s+', ' ', text).strip()
+
+def truncate_to_tokens(text, token_budget):
+    return text[:token_budget * CHARS_PER_TOKEN]
+
+class ContextBuilder:
+    """
+    Menyiapkan konteks RAG untuk prompt agen:
+    1. buang duplikat persis (hash teks ternormalisasi) dan hampir-duplikat (cosine embedding),
+    2. pilih chunk dengan Maximal Marginal Relevance terhadap query tiap agen,
+    3. kemas chunk terpilih sampai anggaran token agen tersebut habis.
+
+    Embedding chunk dihitung sekali lalu dipakai ulang oleh semua agen dalam satu generate.
+    """
+
+    def __init__(self, chunks, embed_fn):
+        self.embed_fn = embed_fn
+        seen = set()
+        unique = []
+        for chunk in chunks:
+            chunk = chunk.strip()
+            key = hashlib.sha1(_normalize(chunk).encode('utf-8')).hexdigest()
+            if chunk and key not in seen:
+                seen.add(key)
+                unique.append(chunk)
+
+        self.chunks = []
+        self.embeddings = np.zeros((0, 0), dtype='float32')
+        if unique:
+            embeddings = self._embed(unique)
+            keep = []
+            for i in range(len(unique)):
+                # Urutan hasil search sudah menurut relevansi, jadi yang pertama muncul dipertahankan
+                if not keep or (embeddings[keep] @ embeddings[i]).max() < NEAR_DUPLICATE_SIMILARITY:
+                    keep.append(i)
+            self.chunks = [unique[i] for i in keep]
+            self.embeddings = embeddings[keep]
+
+    def _embed(self, texts):
+        vectors = np.asarray(self.embed_fn(texts), dtype='float32')
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def select(self, query, token_budget, mmr_lambda=MMR_LAMBDA):
+        """
+        Chunk terpilih (urutan MMR) yang muat dalam `token_budget`. Chunk teratas selalu
+        diikutkan; jika ia sendiri melebihi anggaran, ia dipotong agar pas.
+        """
+        if not self.chunks:
+            return []
+        relevance = self.embeddings @ self._embed([query])[0]
+        similarity = self.embeddings @ self.embeddings.T
+
+        selected = []
+        remaining = list(range(len(self.chunks)))
+        used_tokens = 0
+        while remaining:
+            if selected:
+                redundancy = similarity[np.ix_(remaining, selected)].max(axis=1)
+            else:
+                redundancy = np.zeros(len(remaining))
+            scores = mmr_lambda * relevance[remaining] - (1 - mmr_lambda) * redundancy
+            best = remaining.pop(int(np.argmax(scores)))
+            cost = estimate_tokens(self.chunks[best])
+            if used_tokens + cost > token_budget:
+                if selected:
+                    continue
+                # Konteks kosong lebih buruk daripada chunk paling relevan yang terpotong
+                return [truncate_to_tokens(self.chunks[best], token_budget)]
+            selected.append(best)
+            used_tokens += cost
+        return [self.chunks[i] for i in selected]
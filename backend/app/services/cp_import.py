@@ -0,0 +1,118 @@
+# backend/app/services/cp_import.py
+
+from sqlalchemy import insert, update
+from app.extensions import db
+from app.models import Subject
+from app.models.aimodels import Elemen, CP
+
+DEFAULT_ELEMEN = 'Capaian Umum'
+
+def _subject_summary(subject):
+    return {
+        'subject_id': subject.id,
+        'subject_name': subject.name,
+        'elemen_created': 0,
+        'created': 0,
+        'updated': 0,
+        'unchanged': 0,
+    }
+
+def resolve_subjects(rows, default_subject=None):
+    """
+    Menentukan Subject untuk setiap baris hasil parsing. Baris dengan 'subject_name'
+    (dari header "Mata Pelajaran:" di file) dicocokkan berdasarkan nama dalam satu query;
+    baris tanpa nama memakai `default_subject`. Melempar ValueError jika ada yang tidak cocok.
+    """
+    names = {row['subject_name'] for row in rows if row.get('subject_name')}
+    by_name = {}
+    if names:
+        lowered = {name.lower() for name in names}
+        by_name = {s.name.lower(): s for s in Subject.query.filter(db.func.lower(Subject.name).in_(lowered))}
+        missing = sorted(name for name in names if name.lower() not in by_name)
+        if missing:
+            raise ValueError(f"Mata pelajaran tidak ditemukan: {', '.join(missing)}")
+
+    resolved = []
+    for row in rows:
+        subject = by_name[row['subject_name'].lower()] if row.get('subject_name') else default_subject
+        if subject is None:
+            raise ValueError("Subject ID wajib diisi untuk file tanpa header 'Mata Pelajaran:'.")
+        resolved.append((subject, row))
+    return resolved
+
+def import_cp_rows(resolved_rows, uploaded_by_id=None):
+    """
+    Upsert massal CP dari list (subject, {'fase', 'elemen_name', 'isi', 'source'}).
+
+    Elemen dan CP yang sudah ada untuk semua subject dimuat dalam dua query, selisihnya
+    dihitung di memori, lalu insert/update dijalankan sebagai operasi bulk dalam satu
+    transaksi. Jika elemen+fase muncul lebih dari sekali, baris terakhir yang dipakai.
+    Mengembalikan ringkasan per subject: elemen_created, created, updated, unchanged.
+    Transaksi di-commit oleh fungsi ini; saat gagal di-rollback dan exception diteruskan.
+    """
+    subjects = {subject.id: subject for subject, _ in resolved_rows}
+    summary = {subject_id: _subject_summary(subject) for subject_id, subject in subjects.items()}
+
+    # Baris terakhir menang untuk kombinasi (subject, elemen, fase) yang sama
+    wanted = {}
+    for subject, row in resolved_rows:
+        elemen_name = (row.get('elemen_name') or DEFAULT_ELEMEN).strip()
+        wanted[(subject.id, elemen_name, row['fase'])] = row
+
+    try:
+        # 1. Elemen yang sudah ada (query #1)
+        elements = {
+            (e.subject_id, e.nama_elemen): e
+            for e in Elemen.query.filter(Elemen.subject_id.in_(subjects))
+        }
+        new_elements = []
+        for subject_id, elemen_name, _ in wanted:
+            if (subject_id, elemen_name) not in elements:
+                elemen = Elemen(subject_id=subject_id, nama_elemen=elemen_name)
+                elements[(subject_id, elemen_name)] = elemen
+                new_elements.append(elemen)
+                summary[subject_id]['elemen_created'] += 1
+        if new_elements:
+            # Satu flush untuk semua elemen baru (insert batch) agar id-nya tersedia
+            db.session.add_all(new_elements)
+            db.session.flush()
+
+        # 2. CP yang sudah ada untuk elemen-elemen tersebut (query #2)
+        existing = {
+            (elemen_id, fase): (cp_id, isi_cp)
+            for cp_id, elemen_id, fase, isi_cp in db.session.query(CP.id, CP.elemen_id, CP.fase, CP.isi_cp)
+            .join(Elemen, CP.elemen_id == Elemen.id)
+            .filter(Elemen.subject_id.in_(subjects))
+        }
+
+        # 3. Hitung selisih di memori
+        inserts, updates = [], []
+        for (subject_id, elemen_name, fase), row in wanted.items():
+            elemen_id = elements[(subject_id, elemen_name)].id
+            current = existing.get((elemen_id, fase))
+            if current is None:
+                inserts.append({
+                    'elemen_id': elemen_id,
+                    'fase': fase,
+                    'isi_cp': row['isi'],
+                    'sumber_dokumen': row.get('source'),
+                    'uploaded_by_id': uploaded_by_id,
+                })
+                summary[subject_id]['created'] += 1
+            elif current[1] != row['isi']:
+                updates.append({'id': current[0], 'isi_cp': row['isi']})
+                summary[subject_id]['updated'] += 1
+            else:
+                summary[subject_id]['unchanged'] += 1
+
+        # 4. Bulk insert/update (executemany) lalu commit sekali
+        if inserts:
+            db.session.execute(insert(CP), inserts)
+        if updates:
+            db.session.execute(update(CP), updates)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return list(summary.values())
@@ -0,0 +1,184 @@
+# backend/app/services/cp_ingestion.py
+
+import os
+import threading
+import time
+import traceback
+import uuid
+import docx
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from app.models import Subject
+from app.utils.structured_text import CpLineParser, iter_cp_rows, cp_fixture_lines
+from .cp_import import resolve_subjects, import_cp_rows
+from .embedding_jobs import iter_pdf_pages
+from .progress_events import publish_progress
+
+SUPPORTED_EXTENSIONS = {'.txt', '.pdf', '.docx'}
+
+# Registri job di memori proses: {job_id: {"status": ..., "files": {...}, "summary": ...}}
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+# ============================================================
+# SUMBER BARIS (TXT / PDF / DOCX), DIBACA BERTAHAP
+# ============================================================
+
+def iter_text_lines(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            yield line
+
+def iter_pdf_lines(path):
+    """Text layer PDF per halaman; hanya satu halaman yang ada di memori pada satu waktu."""
+    for _, page_text in iter_pdf_pages(path):
+        yield from page_text.splitlines()
+
+def iter_docx_lines(path):
+    """
+    Paragraf dan baris tabel DOCX sesuai urutan di dokumen (parse_docx_raw di
+    layout_routes memisahkan paragraf dan tabel sehingga urutan FASE/elemen hilang).
+    Baris tabel dua kolom (Elemen | Capaian) diubah menjadi "- Elemen: isi" agar
+    dikenali state machine seperti daftar berpoin.
+    """
+    document = docx.Document(path)
+    for block in document.element.body.iterchildren():
+        if block.tag.endswith('}p'):
+            yield Paragraph(block, document).text
+        elif block.tag.endswith('}tbl'):
+            for row in Table(block, document).rows:
+                cells = []
+                for cell in row.cells:
+                    text = cell.text.strip()
+                    # Sel yang di-merge muncul berulang; cukup ambil sekali
+                    if text and (not cells or cells[-1] != text):
+                        cells.append(text)
+                if len(cells) >= 2:
+                    yield f"- {cells[0]}: {' '.join(cells[1:])}"
+                elif cells:
+                    yield cells[0]
+
+def iter_source_lines(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pdf':
+        return iter_pdf_lines(path)
+    if extension == '.docx':
+        return iter_docx_lines(path)
+    return iter_text_lines(path)
+
+def iter_cp_rows_from_file(path):
+    return iter_cp_rows(iter_source_lines(path))
+
+# ============================================================
+# JOB BACKGROUND
+# ============================================================
+
+def _set_job(job_id, **fields):
+    with _jobs_lock:
+        _jobs[job_id].update(fields)
+
+def _run_cp_ingestion_job(app_context, job_id, files, default_subject_id, uploaded_by_id):
+    with app_context:
+        try:
+            default_subject = Subject.query.get(default_subject_id) if default_subject_id else None
+            rows = []
+            for index, (file_path, source) in enumerate(files):
+                count = 0
+                for row in iter_cp_rows_from_file(file_path):
+                    row['source'] = source
+                    rows.append(row)
+                    count += 1
+                with _jobs_lock:
+                    _jobs[job_id]['files'][source] = count
+                publish_progress('cp_ingestion', job_id, 'parsing', int(90 * (index + 1) / len(files)),
+                                 f"{source}: {count} baris CP", owner_id=uploaded_by_id)
+
+            if not rows:
+                raise ValueError("Tidak ada data yang bisa diparsing dari file.")
+            publish_progress('cp_ingestion', job_id, 'importing', 90, owner_id=uploaded_by_id)
+            summary = import_cp_rows(resolve_subjects(rows, default_subject), uploaded_by_id)
+            _set_job(job_id, status='done', rows=len(rows), summary=summary)
+            publish_progress('cp_ingestion', job_id, 'done', 100, owner_id=uploaded_by_id)
+        except Exception as e:
+            traceback.print_exc()
+            _set_job(job_id, status='failed', error=str(e))
+            publish_progress('cp_ingestion', job_id, 'failed', 100, str(e), owner_id=uploaded_by_id)
+
+def start_cp_ingestion_job(app_context, files, default_subject_id=None, uploaded_by_id=None):
+    """
+    Mem-parsing dan meng-upsert file CP (list (path, nama sumber)) di background thread.
+    Mengembalikan job_id; status bisa dilihat lewat get_cp_ingestion_job() atau
+    feed SSE /api/uploads/events (job_type 'cp_ingestion').
+    """
+    job_id = str(uuid.uuid4())
+    with _jobs_lock:
+        _jobs[job_id] = {
+            'status': 'running',
+            'uploaded_by': uploaded_by_id,
+            'files': {source: None for _, source in files},
+            'rows': None,
+            'summary': None,
+            'error': None,
+        }
+    thread = threading.Thread(
+        target=_run_cp_ingestion_job,
+        args=(app_context, job_id, files, default_subject_id, uploaded_by_id),
+        daemon=True
+    )
+    thread.start()
+    return job_id
+
+def get_cp_ingestion_job(job_id):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        return {'id': job_id, **job, 'files': dict(job['files'])}
+
+# ============================================================
+# BENCHMARK
+# ============================================================
+
+def build_cp_fixture(directory, subjects=12, elements=8, repeat=1, fmt='txt'):
+    """
+    Menulis fixture CP multi-mapel (fase A-F, Capaian Umum + `elements` elemen per fase)
+    sebagai .txt atau .docx. `repeat` menggandakan isi untuk mensimulasikan kompilasi besar.
+    Mengembalikan (path, jumlah baris CP yang diharapkan).
+    """
+    lines = cp_fixture_lines(subjects, elements, repeat)
+    expected = repeat * subjects * 6 * (elements + 1)
+
+    path = os.path.join(directory, f"cp_benchmark.{fmt}")
+    if fmt == 'docx':
+        document = docx.Document()
+        for line in lines:
+            document.add_paragraph(line)
+        document.save(path)
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+    return path, expected
+
+def run_cp_ingestion_benchmark(path, repeat=3):
+    """Mengukur throughput parsing (baris sumber/detik dan baris CP/detik) untuk satu file."""
+    timings = []
+    source_lines = rows = 0
+    for _ in range(repeat):
+        source_lines = rows = 0
+        started = time.perf_counter()
+        parser = CpLineParser()
+        for line in iter_source_lines(path):
+            source_lines += 1
+            if parser.feed(line):
+                rows += 1
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        'file': os.path.basename(path),
+        'size_kb': round(os.path.getsize(path) / 1024, 1),
+        'source_lines': source_lines,
+        'cp_rows': rows,
+        'best_seconds': round(best, 4),
+        'lines_per_sec': round(source_lines / best) if best else None,
+        'rows_per_sec': round(rows / best) if best else None,
+    }
@@ -0,0 +1,187 @@
+import threading
+import traceback
+import uuid
+import fitz  # PyMuPDF
+from app.extensions import db
+from app.models import FoundDocument
+from .progress_events import publish_progress
+from .vector_store import persist_collection
+
+CHUNK_SIZE = 1000      # karakter per chunk
+CHUNK_OVERLAP = 100
+EMBED_BATCH_SIZE = 256  # chunk per panggilan model.encode + upsert
+
+# Registri job di memori proses: {job_id: {"status": ..., "documents": {doc_id: status}}}
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+def iter_pdf_pages(path):
+    """Membaca teks PDF halaman per halaman tanpa menggabungkan seluruh dokumen."""
+    with fitz.open(path) as doc:
+        for page_number, page in enumerate(doc, start=1):
+            yield page_number, page.get_text()
+
+def chunk_text(text, chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
+    """Memecah teks menjadi potongan berukuran tetap dengan sedikit tumpang tindih."""
+    text = text.strip()
+    step = chunk_size - overlap
+    for start in range(0, len(text), step):
+        chunk = text[start:start + chunk_size].strip()
+        if chunk:
+            yield chunk
+
+def _set_document_status(job_id, doc, status):
+    doc.status = status
+    db.session.commit()
+    with _jobs_lock:
+        _jobs[job_id]['documents'][doc.id] = status
+    publish_progress('embedding', doc.id, status)
+
+class _BatchWriter:
+    """
+    Menampung chunk dari banyak dokumen lalu meng-embed dan meng-upsert per batch,
+    sehingga dokumen kecil ikut digabung ke batch yang sama. Dokumen baru
+    dianggap selesai (on_flushed) setelah chunk terakhirnya benar-benar tersimpan.
+    """
+
+    def __init__(self, collection, model, on_flushed, batch_size=EMBED_BATCH_SIZE):
+        self.collection = collection
+        self.model = model
+        self.on_flushed = on_flushed
+        self.batch_size = batch_size
+        self.ids, self.documents, self.metadatas = [], [], []
+        self.completed = []
+
+    def add(self, chunk_id, text, metadata):
+        self.ids.append(chunk_id)
+        self.documents.append(text)
+        self.metadatas.append(metadata)
+        if len(self.ids) >= self.batch_size:
+            self.flush()
+
+    def complete(self, doc):
+        self.completed.append(doc)
+
+    def discard(self, doc_id):
+        keep = [i for i, m in enumerate(self.metadatas) if m["found_document_id"] != doc_id]
+        self.ids = [self.ids[i] for i in keep]
+        self.documents = [self.documents[i] for i in keep]
+        self.metadatas = [self.metadatas[i] for i in keep]
+
+    def flush(self):
+        if self.ids:
+            embeddings = self.model.encode(self.documents, batch_size=64).tolist()
+            self.collection.upsert(
+                ids=self.ids,
+                embeddings=embeddings,
+                documents=self.documents,
+                metadatas=self.metadatas
+            )
+            self.ids, self.documents, self.metadatas = [], [], []
+        completed, self.completed = self.completed, []
+        for doc in completed:
+            self.on_flushed(doc)
+
+    def close(self):
+        """Flush terakhir job, lalu simpan indeks sekali (bukan per batch)."""
+        try:
+            self.flush()
+        finally:
+            persist_collection(self.collection)
+
+def _mark_failed(job_id, doc_id, doc, collection):
+    """
+    Menandai dokumen gagal dan membersihkan vektor sebagiannya. Kegagalan di sini
+    (mis. koneksi Chroma/DB putus) hanya dicatat agar dokumen berikutnya tetap diproses.
+    """
+    try:
+        db.session.rollback()
+        _set_document_status(job_id, doc, 'failed')
+    except Exception:
+        traceback.print_exc()
+        db.session.rollback()
+        with _jobs_lock:
+            _jobs[job_id]['documents'][doc_id] = 'failed'
+    try:
+        collection.delete(where={"found_document_id": doc_id})
+    except Exception:
+        traceback.print_exc()
+
+def _run_embedding_job(app_context, job_id, doc_ids, collection, model):
+    with app_context:
+        job_status = 'failed'
+        try:
+            writer = _BatchWriter(collection, model, lambda doc: _set_document_status(job_id, doc, 'embedded'))
+            documents = FoundDocument.query.filter(FoundDocument.id.in_(doc_ids)).all()
+            for doc in documents:
+                # id disimpan di luar ORM: setelah rollback, akses atribut memicu query ulang
+                doc_id = doc.id
+                try:
+                    _set_document_status(job_id, doc, 'embedding')
+                    # Hapus vektor lama dokumen ini (termasuk format lama satu-vektor-per-file)
+                    collection.delete(ids=[doc_id])
+                    collection.delete(where={"found_document_id": doc_id})
+
+                    chunk_index = 0
+                    for page_number, page_text in iter_pdf_pages(doc.local_path):
+                        for chunk in chunk_text(page_text):
+                            writer.add(f"{doc_id}_{chunk_index}", chunk, {
+                                "found_document_id": doc_id,
+                                "source": doc.source,
+                                "file_name": doc.file_name,
+                                "page": page_number
+                            })
+                            chunk_index += 1
+                    writer.complete(doc)
+                except Exception:
+                    traceback.print_exc()
+                    writer.discard(doc_id)
+                    _mark_failed(job_id, doc_id, doc, collection)
+
+            try:
+                writer.close()
+                job_status = 'done'
+            except Exception:
+                traceback.print_exc()
+                failed = [(doc.id, doc) for doc in writer.completed]
+                for doc_id, doc in failed:
+                    _mark_failed(job_id, doc_id, doc, collection)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            # Job tidak pernah tertinggal 'running', apa pun yang gagal di atas
+            with _jobs_lock:
+                job = _jobs[job_id]
+                job['status'] = job_status
+                if job_status == 'failed':
+                    for doc_id, status in job['documents'].items():
+                        if status in ('queued', 'embedding'):
+                            job['documents'][doc_id] = 'failed'
+            publish_progress('embedding_job', job_id, job_status, 100)
+
+def start_embedding_job(app_context, doc_ids, collection, model):
+    """
+    Menjalankan embedding untuk banyak dokumen sebagai satu job di background thread.
+    Mengembalikan job_id; status per dokumen bisa dilihat lewat get_embedding_job()
+    atau feed SSE /api/uploads/events.
+    """
+    job_id = str(uuid.uuid4())
+    with _jobs_lock:
+        _jobs[job_id] = {
+            'status': 'running',
+            'documents': {doc_id: 'queued' for doc_id in doc_ids}
+        }
+    thread = threading.Thread(
+        target=_run_embedding_job,
+        args=(app_context, job_id, doc_ids, collection, model),
+        daemon=True
+    )
+    thread.start()
+    return job_id
+
+def get_embedding_job(job_id):
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return None
+        return {'id': job_id, 'status': job['status'], 'documents': dict(job['documents'])}
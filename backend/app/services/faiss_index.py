@@ -0,0 +1,328 @@
+import json
+import os
+import sqlite3
+import threading
+import faiss
+import numpy as np
+
+# Format penyimpanan vektor di indeks HNSW. Byte per vektor 384-dim:
+# none = 1536 (float32), fp16 = 768, int8 = 384 (scalar quantizer 8-bit)
+QUANTIZATION_TYPES = {
+    "none": None,
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+class FaissCollection:
+    """
+    Indeks vektor lokal in-process berbasis FAISS HNSW, dengan antarmuka yang
+    meniru subset Collection ChromaDB (add, upsert, query, get, delete, count)
+    sehingga pemanggil di rag_service dan job embedding tidak perlu diubah.
+
+    Penyimpanan per koleksi:
+    - <name>.faiss   : indeks HNSW, dibaca dengan memory-map (IO_FLAG_MMAP)
+    - <name>.sqlite3 : teks dokumen, metadata, dan pemetaan ID string -> ID integer FAISS
+    - <name>.f32     : salinan float32 penuh (hanya untuk koleksi terkuantisasi), dibaca
+                       lewat np.memmap sehingga tidak ikut menetap di RAM
+
+    upsert hanya mengubah indeks di memori dan menandainya dirty; file .faiss ditulis
+    ulang sekali lewat persist()/close() (mis. di akhir job embedding), bukan per batch.
+    Baris items sudah di-commit lebih dulu, jadi jika proses mati sebelum persist,
+    saat dibuka berikutnya baris hidup yang vektornya tidak ada di file .faiss
+    ditandai terhapus (lihat _reconcile) dan dokumennya perlu di-embed ulang.
+
+    HNSW FAISS tidak mendukung penghapusan vektor, jadi delete/upsert menandai baris
+    lama sebagai terhapus (tombstone) dan hasil query menyaring baris tersebut.
+
+    Dengan quantization 'fp16' atau 'int8', pencarian graf memakai vektor terkuantisasi,
+    lalu kandidat teratas diurutkan ulang (rescoring) dengan jarak float32 yang tepat.
+    """
+
+    OVERFETCH = 4
+    RESCORE_FACTOR = 3
+
+    def __init__(self, name, path, embedding_function, M=32, ef_construction=200, ef_search=64,
+                 quantization="none"):
+        if quantization not in QUANTIZATION_TYPES:
+            raise ValueError(f"Quantization tidak dikenal: {quantization}")
+        self.name = name
+        self.embedding_function = embedding_function
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        os.makedirs(path, exist_ok=True)
+        self.index_path = os.path.join(path, f"{name}.faiss")
+        self.vectors_path = os.path.join(path, f"{name}.f32")
+        self._lock = threading.RLock()
+
+        self._db = sqlite3.connect(os.path.join(path, f"{name}.sqlite3"), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                int_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT NOT NULL,
+                document TEXT,
+                metadata TEXT,
+                deleted INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS ix_items_live_id ON items (id) WHERE deleted = 0;
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+
+        # Format kuantisasi melekat pada file indeks; konfigurasi baru hanya berlaku untuk koleksi baru
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'quantization'").fetchone()
+        if row and row[0] != quantization:
+            print(f"Koleksi '{name}' sudah tersimpan dengan quantization '{row[0]}', "
+                  f"konfigurasi '{quantization}' diabaikan.")
+            quantization = row[0]
+        elif not row:
+            self._db.execute("INSERT INTO meta (key, value) VALUES ('quantization', ?)", (quantization,))
+            self._db.commit()
+        self.quantization = quantization
+
+        self._index = None
+        self._mmapped = False
+        self._dirty = False
+        if os.path.exists(self.index_path):
+            self._index = faiss.read_index(self.index_path, faiss.IO_FLAG_MMAP)
+            self._mmapped = True
+            self._apply_search_params()
+        self._reconcile()
+
+    # === INDEX ===
+    def _reconcile(self):
+        """Menandai terhapus baris hidup yang vektornya tidak pernah tersimpan di file .faiss."""
+        live = np.fromiter((row[0] for row in self._db.execute("SELECT int_id FROM items WHERE deleted = 0")),
+                           dtype='int64')
+        if self._index is None:
+            missing = live
+        else:
+            missing = live[~np.isin(live, faiss.vector_to_array(self._index.id_map))]
+        if len(missing):
+            print(f"Koleksi '{self.name}': {len(missing)} baris tanpa vektor di indeks "
+                  f"(proses berhenti sebelum persist), ditandai terhapus.")
+            self._db.executemany("UPDATE items SET deleted = 1 WHERE int_id = ?", [(int(i),) for i in missing])
+            self._db.commit()
+
+    def _apply_search_params(self):
+        hnsw_index = faiss.downcast_index(self._index.index)
+        hnsw_index.hnsw.efSearch = self.ef_search
+
+    @property
+    def quantized(self):
+        return QUANTIZATION_TYPES[self.quantization] is not None
+
+    def _writable_index(self, vectors):
+        if self._index is None:
+            dim = vectors.shape[1]
+            qtype = QUANTIZATION_TYPES[self.quantization]
+            if qtype is None:
+                hnsw = faiss.IndexHNSWFlat(dim, self.M)
+            else:
+                # Rentang quantizer dilatih dari batch pertama; nilai di luar rentang
+                # terpotong, dan rescoring float32 menutupi kehilangan presisinya
+                hnsw = faiss.IndexHNSWSQ(dim, qtype, self.M)
+                hnsw.train(vectors)
+            hnsw.hnsw.efConstruction = self.ef_construction
+            self._index = faiss.IndexIDMap2(hnsw)
+            self._apply_search_params()
+        elif self._mmapped:
+            # Indeks hasil memory-map hanya-baca; muat penuh sebelum menambah vektor
+            self._index = faiss.read_index(self.index_path)
+            self._mmapped = False
+            self._apply_search_params()
+        return self._index
+
+    def _persist(self):
+        tmp_path = self.index_path + '.tmp'
+        faiss.write_index(self._index, tmp_path)
+        os.replace(tmp_path, self.index_path)
+
+    def persist(self):
+        """Menulis indeks ke disk jika ada vektor baru sejak persist terakhir."""
+        with self._lock:
+            if self._dirty and self._index is not None:
+                self._persist()
+                self._dirty = False
+
+    def close(self):
+        self.persist()
+        self._db.close()
+
+    def _write_full_vectors(self, int_ids, vectors):
+        row_bytes = vectors.shape[1] * 4
+        mode = 'r+b' if os.path.exists(self.vectors_path) else 'w+b'
+        with open(self.vectors_path, mode) as f:
+            for int_id, vector in zip(int_ids, vectors):
+                f.seek((int_id - 1) * row_bytes)
+                f.write(vector.tobytes())
+
+    def _read_full_vectors(self, int_ids):
+        full = np.memmap(self.vectors_path, dtype='float32', mode='r').reshape(-1, self._index.d)
+        return np.asarray(full[np.asarray(int_ids, dtype='int64') - 1])
+
+    def memory_per_vector(self):
+        """Perkiraan byte per vektor di indeks (tanpa link graf HNSW)."""
+        if self._index is None:
+            return None
+        return faiss.downcast_index(faiss.downcast_index(self._index.index).storage).code_size
+
+    def _embed(self, texts):
+        return np.asarray(self.embedding_function(texts), dtype='float32')
+
+    # === WRITE ===
+    def add(self, ids, documents=None, metadatas=None, embeddings=None):
+        self.upsert(ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
+
+    def upsert(self, ids, documents=None, metadatas=None, embeddings=None):
+        if not ids:
+            return
+        vectors = self._embed(documents) if embeddings is None else np.asarray(embeddings, dtype='float32')
+        documents = documents or [None] * len(ids)
+        metadatas = metadatas or [None] * len(ids)
+
+        with self._lock:
+            index = self._writable_index(vectors)
+            self._mark_deleted(ids)
+            int_ids = []
+            for doc_id, document, metadata in zip(ids, documents, metadatas):
+                cursor = self._db.execute(
+                    "INSERT INTO items (id, document, metadata) VALUES (?, ?, ?)",
+                    (doc_id, document, json.dumps(metadata) if metadata else None)
+                )
+                int_ids.append(cursor.lastrowid)
+            if self.quantized:
+                self._write_full_vectors(int_ids, vectors)
+            index.add_with_ids(vectors, np.asarray(int_ids, dtype='int64'))
+            self._dirty = True
+            self._db.commit()
+
+    def _mark_deleted(self, ids):
+        self._db.executemany("UPDATE items SET deleted = 1 WHERE id = ? AND deleted = 0", [(i,) for i in ids])
+
+    def delete(self, ids=None, where=None):
+        with self._lock:
+            if ids:
+                self._mark_deleted(ids)
+            if where:
+                clause, params = self._where_clause(where)
+                self._db.execute(f"UPDATE items SET deleted = 1 WHERE deleted = 0 AND {clause}", params)
+            self._db.commit()
+
+    # === READ ===
+    @staticmethod
+    def _where_clause(where):
+        """Hanya mendukung filter kesetaraan sederhana {"key": value, ...}."""
+        clauses, params = [], []
+        for key, value in where.items():
+            clauses.append("json_extract(metadata, ?) = ?")
+            params.extend([f"$.{key}", value])
+        return " AND ".join(clauses), params
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM items WHERE deleted = 0").fetchone()[0]
+
+    def get(self, ids=None, where=None, include=("documents", "metadatas"), limit=None, offset=None):
+        sql = "SELECT int_id, id, document, metadata FROM items WHERE deleted = 0"
+        params = []
+        if ids:
+            sql += f" AND id IN ({','.join('?' * len(ids))})"
+            params.extend(ids)
+        if where:
+            clause, where_params = self._where_clause(where)
+            sql += f" AND {clause}"
+            params.extend(where_params)
+        sql += " ORDER BY int_id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset or 0])
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+            result = {"ids": [row[1] for row in rows]}
+            if "documents" in include:
+                result["documents"] = [row[2] for row in rows]
+            if "metadatas" in include:
+                result["metadatas"] = [json.loads(row[3]) if row[3] else None for row in rows]
+            if "embeddings" in include:
+                if self.quantized and rows:
+                    result["embeddings"] = self._read_full_vectors([row[0] for row in rows]).tolist()
+                else:
+                    result["embeddings"] = [self._index.reconstruct(row[0]).tolist() for row in rows]
+        return result
+
+    def query(self, query_texts=None, query_embeddings=None, n_results=10, where=None):
+        vectors = self._embed(query_texts) if query_embeddings is None else np.asarray(query_embeddings, dtype='float32')
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                for _ in range(len(vectors)):
+                    for key in result:
+                        result[key].append([])
+                return result
+
+            # Ambil kandidat lebih banyak untuk menutupi baris tombstone dan filter `where`
+            fetch = n_results * self.OVERFETCH * (self.RESCORE_FACTOR if self.quantized else 1)
+            k = min(self._index.ntotal, fetch)
+            distances, labels = self._index.search(vectors, k)
+            for vector, row_distances, row_labels in zip(vectors, distances, labels):
+                candidates = [int(label) for label in row_labels if label != -1]
+                rows = self._rows_by_int_id(candidates, where)
+                live = [(int(label), float(dist)) for label, dist in zip(row_labels, row_distances) if label in rows]
+                if self.quantized and live:
+                    exact = self._read_full_vectors([label for label, _ in live])
+                    exact_distances = ((exact - vector) ** 2).sum(axis=1)
+                    live = sorted(zip([label for label, _ in live], exact_distances.tolist()), key=lambda hit: hit[1])
+                hits = [(rows[label], dist) for label, dist in live[:n_results]]
+                result["ids"].append([hit[0][0] for hit in hits])
+                result["documents"].append([hit[0][1] for hit in hits])
+                result["metadatas"].append([json.loads(hit[0][2]) if hit[0][2] else None for hit in hits])
+                result["distances"].append([hit[1] for hit in hits])
+        return result
+
+    def _rows_by_int_id(self, int_ids, where=None):
+        if not int_ids:
+            return {}
+        sql = f"SELECT int_id, id, document, metadata FROM items WHERE deleted = 0 AND int_id IN ({','.join('?' * len(int_ids))})"
+        params = list(int_ids)
+        if where:
+            clause, where_params = self._where_clause(where)
+            sql += f" AND {clause}"
+            params.extend(where_params)
+        return {row[0]: row[1:] for row in self._db.execute(sql, params)}
+
+
+def quantization_report(vectors, queries, k=10, M=32, ef_construction=200, ef_search=64, path=None):
+    """
+    Membangun koleksi sementara untuk tiap mode quantization dari `vectors` yang sama,
+    lalu mengukur recall@k terhadap pencarian exact (brute force float32) untuk `queries`.
+    Mengembalikan list dict {quantization, bytes_per_vector, recall_at_k}.
+    """
+    import tempfile
+
+    vectors = np.asarray(vectors, dtype='float32')
+    queries = np.asarray(queries, dtype='float32')
+    k = min(k, len(vectors))
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+    ids = [str(i) for i in range(len(vectors))]
+
+    report = []
+    with tempfile.TemporaryDirectory(dir=path) as tmp_dir:
+        for quantization in QUANTIZATION_TYPES:
+            collection = FaissCollection(
+                f"report_{quantization}", tmp_dir, embedding_function=None,
+                M=M, ef_construction=ef_construction, ef_search=ef_search, quantization=quantization
+            )
+            collection.upsert(ids=ids, embeddings=vectors)
+            found = collection.query(query_embeddings=queries, n_results=k)["ids"]
+            hits = sum(len({str(i) for i in expected} & set(got)) for expected, got in zip(truth, found))
+            report.append({
+                "quantization": quantization,
+                "bytes_per_vector": collection.memory_per_vector(),
+                "recall_at_k": hits / float(len(queries) * k)
+            })
+            collection._db.close()
+    return report
@@ -1,9 +1,42 @@
 import traceback
-from pdf2image import convert_from_path
+import fitz  # PyMuPDF
 import pytesseract
+from PIL import Image
 from app.extensions import db
 from app.models import PDFReference
 from .rag_service import add_to_collection
+from .text_store import open_text_writer
+from .progress_events import publish_progress
+
+# Halaman dianggap punya text layer yang layak jika teksnya cukup panjang
+# dan sebagian besar karakternya bisa dibaca (bukan sampah hasil encoding font).
+MIN_TEXT_LAYER_CHARS = 100
+MIN_TEXT_LAYER_QUALITY = 0.85
+OCR_DPI = 300
+
+def _has_usable_text_layer(text):
+    stripped = text.strip()
+    if len(stripped) < MIN_TEXT_LAYER_CHARS:
+        return False
+    readable = sum(1 for c in stripped if c.isalnum() or c.isspace() or c in '.,;:!?()-\'"/%')
+    return readable / len(stripped) >= MIN_TEXT_LAYER_QUALITY
+
+def _ocr_page(page):
+    """Merasterisasi satu halaman lalu menjalankan Tesseract padanya."""
+    pix = page.get_pixmap(dpi=OCR_DPI)
+    image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    return pytesseract.image_to_string(image, lang='ind')
+
+def extract_page_text(page):
+    """
+    Router per halaman: pakai text layer bawaan PDF (born-digital) jika ada
+    dan berkualitas, dan hanya jalankan OCR untuk halaman hasil scan.
+    Mengembalikan tuple (teks, metode) dengan metode 'text_layer' atau 'ocr'.
+    """
+    text = page.get_text()
+    if _has_usable_text_layer(text):
+        return text, 'text_layer'
+    return _ocr_page(page), 'ocr'
 
 def ocr_process_pdf_with_context(app_context, file_path, ref_id):
     """
@@ -12,43 +45,56 @@ def ocr_process_pdf_with_context(app_context, file_path, ref_id):
     with app_context:
         pdf_ref = PDFReference.query.get(ref_id)
         if not pdf_ref: return
+        owner_id = pdf_ref.uploaded_by
 
         try:
-            # Stage 1: Text Extraction (OCR)
-            print(f"Starting OCR for {file_path}...")
+            # Stage 1: Text Extraction (text layer / OCR)
+            print(f"Starting text extraction for {file_path}...")
             pdf_ref.processing_status = 'extracting'
             pdf_ref.processing_progress = 0
             db.session.commit()
+            publish_progress('pdf', ref_id, 'extracting', 0, owner_id=owner_id)
 
-            images = convert_from_path(file_path)
-            total_pages = len(images)
-            full_text = ""
+            text_chunks = []
+            ocr_pages = 0
+            # Teks ditulis per halaman langsung ke file terkompresi, tidak ke database
+            writer, text_path = open_text_writer(pdf_ref.id)
+            with writer, fitz.open(file_path) as doc:
+                total_pages = len(doc)
+                for i, page in enumerate(doc):
+                    text, method = extract_page_text(page)
+                    if method == 'ocr':
+                        ocr_pages += 1
+                        print(f"OCR page {i + 1}/{total_pages}...")
+                    writer.write(text + "\n\n")
+                    text_chunks.extend(chunk for chunk in text.split('\n') if len(chunk.strip()) > 50)
+                    progress = int(((i + 1) / total_pages) * 100)
+                    if progress != pdf_ref.processing_progress:
+                        pdf_ref.processing_progress = progress
+                        db.session.commit()
+                        publish_progress('pdf', ref_id, 'extracting', progress, owner_id=owner_id)
+            print(f"Extracted {total_pages} pages ({total_pages - ocr_pages} from text layer, {ocr_pages} via OCR).")
 
-            for i, image in enumerate(images):
-                print(f"Extracting page {i + 1}/{total_pages}...")
-                text = pytesseract.image_to_string(image, lang='ind')
-                full_text += text + "\n\n"
-                progress = int(((i + 1) / total_pages) * 100)
-                pdf_ref.processing_progress = progress
-                db.session.commit()
-
-            pdf_ref.extracted_text = full_text
+            pdf_ref.extracted_text_path = text_path
             
             # Stage 2: AI Indexing
             print("Starting AI Indexing...")
             pdf_ref.processing_status = 'indexing'
             db.session.commit()
+            publish_progress('pdf', ref_id, 'indexing', 100, owner_id=owner_id)
             
-            text_chunks = [chunk for chunk in full_text.split('\n') if len(chunk.strip()) > 50]
             if text_chunks:
                 add_to_collection(text_chunks, document_id=f"doc_{pdf_ref.id}")
             
             # Stage 3: Done
             pdf_ref.processing_status = 'done'
             db.session.commit()
+            publish_progress('pdf', ref_id, 'done', 100, owner_id=owner_id)
             print("--- Processing Complete ---")
 
         except Exception as e:
             traceback.print_exc()
+            db.session.rollback()
             pdf_ref.processing_status = 'failed'
-            db.session.commit()
\ No newline at end of file
+            db.session.commit()
+            publish_progress('pdf', ref_id, 'failed', message=str(e), owner_id=owner_id)
@@ -0,0 +1,70 @@
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+class ProgressBroker:
+    """
+    Pub/sub in-process untuk event progres ingestion (OCR PDF dan pemrosesan buku).
+    Worker memanggil publish(), endpoint SSE berlangganan lewat subscribe().
+    Riwayat event terakhir disimpan agar klien yang reconnect dengan
+    Last-Event-ID bisa menerima event yang terlewat. Setiap event membawa
+    owner_id (user yang memulai job, None untuk job sistem) sehingga endpoint
+    SSE bisa menyaring event per subscriber.
+    """
+
+    def __init__(self, history_size=1000, subscriber_queue_size=500):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._subscriber_queue_size = subscriber_queue_size
+
+    def publish(self, job_type, job_id, stage, progress=None, message=None, owner_id=None):
+        with self._lock:
+            event = {
+                'id': next(self._ids),
+                'job_type': job_type,
+                'job_id': job_id,
+                'stage': stage,
+                'progress': progress,
+                'message': message,
+                'owner_id': owner_id,
+                'timestamp': time.time()
+            }
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                # Klien yang terlalu lambat akan menyusul lewat Last-Event-ID saat reconnect
+                pass
+        return event
+
+    def subscribe(self, last_event_id=None):
+        """
+        Mendaftarkan subscriber baru.
+        Mengembalikan tuple (queue, backlog) di mana backlog berisi event
+        dengan id > last_event_id yang masih ada di riwayat.
+        """
+        q = queue.Queue(maxsize=self._subscriber_queue_size)
+        with self._lock:
+            self._subscribers.add(q)
+            if last_event_id is None:
+                backlog = []
+            else:
+                backlog = [e for e in self._history if e['id'] > last_event_id]
+        return q, backlog
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+
+broker = ProgressBroker()
+
+def publish_progress(job_type, job_id, stage, progress=None, message=None, owner_id=None):
+    return broker.publish(job_type, job_id, stage, progress, message, owner_id)
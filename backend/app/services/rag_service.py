@@ -1,17 +1,9 @@
-import chromadb
 from sentence_transformers import SentenceTransformer
-import os
+from .vector_store import DEFAULT_COLLECTION, get_collection, persist_collection
+from .search_batcher import search_batcher
 
 # --- Configuration ---
 model = SentenceTransformer('all-MiniLM-L6-v2')
-INSTANCE_FOLDER_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'instance'))
-
-# 1. Initialize ChromaDB client with persistence
-client = chromadb.PersistentClient(path=INSTANCE_FOLDER_PATH)
-
-# 2. Get or create a collection. This is like a table in a database.
-# This operation is idempotent, so it's safe to run every time.
-collection = client.get_or_create_collection(name="gatra_sinau_docs")
 
 def add_to_collection(text_chunks, document_id):
     """
@@ -25,27 +17,26 @@ def add_to_collection(text_chunks, document_id):
     
     # Add the text chunks, metadata, and embeddings to the collection.
     # Chroma automatically handles the embedding process if we provide the text.
+    collection = get_collection()
     collection.add(
         documents=text_chunks,
         ids=chunk_ids
     )
+    persist_collection(collection)
     print("Document added to ChromaDB collection successfully.")
 
 
-def search_index(query_text, k=25):
+def search_index(query_text, k=25, collection_name=DEFAULT_COLLECTION):
     """
     Searches the collection for the most relevant text chunks.
     """
     print(f"Searching ChromaDB for query: '{query_text}'")
     
-    # Query the collection
-    results = collection.query(
-        query_texts=[query_text],
-        n_results=k
-    )
+    # Query the collection (identical concurrent queries are coalesced, distinct ones batched)
+    results = search_batcher.search(query_text, k, collection_name)
     
-    # The actual documents are in the 'documents' key of the first result set
-    retrieved_chunks = results['documents'][0]
+    # The actual documents are in the 'documents' key of the result
+    retrieved_chunks = results['documents']
     
     print(f"Found {len(retrieved_chunks)} relevant chunks from ChromaDB.")
     return retrieved_chunks
\ No newline at end of file
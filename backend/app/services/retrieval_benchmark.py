@@ -0,0 +1,114 @@
+import contextlib
+import io
+import json
+import os
+import time
+
+DEFAULT_FIXTURE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'benchmarks', 'retrieval_fixture.json'))
+BENCHMARK_COLLECTION = "retrieval_benchmark"
+
+def load_fixture(path=DEFAULT_FIXTURE):
+    """Membaca korpus fixture {chunks: [{id, text, ...}], queries: [{query, relevant}]}."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def build_fixture_collection(fixture, collection):
+    """Mengisi ulang koleksi benchmark dengan potongan fixture (isi lama fixture dihapus dulu)."""
+    from .vector_store import persist_collection
+
+    collection.delete(where={"fixture": BENCHMARK_COLLECTION})
+    chunks = fixture["chunks"]
+    collection.upsert(
+        ids=[c["id"] for c in chunks],
+        documents=[c["text"] for c in chunks],
+        metadatas=[{"fixture": BENCHMARK_COLLECTION, "subject": c.get("subject", "")} for c in chunks]
+    )
+    persist_collection(collection)
+    return len(chunks)
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def evaluate(search_fn, queries, k, repeat=3, warmup=1):
+    """
+    Menjalankan `search_fn(query_text, k) -> [chunk_id, ...]` untuk setiap query berlabel.
+    Mengembalikan p50/p95 latensi (ms), throughput (query/detik), recall@k dan MRR.
+    """
+    for item in queries[:warmup]:
+        search_fn(item["query"], k)
+
+    latencies = []
+    recall_total = 0.0
+    reciprocal_rank_total = 0.0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in queries:
+            t0 = time.perf_counter()
+            found = search_fn(item["query"], k)[:k]
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+            relevant = set(item["relevant"])
+            recall_total += len(relevant.intersection(found)) / float(len(relevant))
+            rank = next((i for i, chunk_id in enumerate(found, start=1) if chunk_id in relevant), None)
+            reciprocal_rank_total += 1.0 / rank if rank else 0.0
+    elapsed = time.perf_counter() - started
+
+    runs = len(queries) * repeat
+    latencies.sort()
+    return {
+        "queries": runs,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "throughput_qps": round(runs / elapsed, 2) if elapsed else 0.0,
+        f"recall@{k}": round(recall_total / runs, 4),
+        "mrr": round(reciprocal_rank_total / runs, 4),
+    }
+
+def run_retrieval_benchmark(fixture_path=DEFAULT_FIXTURE, k=5, repeat=3):
+    """
+    Membangun koleksi fixture lalu mengukur `rag_service.search_index` dan
+    `retriever_agent.query_documents_by_text` terhadap query berlabel yang sama.
+    Tidak butuh jaringan selama model embedding sudah ada di cache lokal.
+    """
+    from app.agents.retriever_agent import query_documents_by_text
+    from .rag_service import search_index
+    from .vector_store import get_collection
+
+    fixture = load_fixture(fixture_path)
+    corpus_size = build_fixture_collection(fixture, get_collection(BENCHMARK_COLLECTION))
+    id_by_text = {c["text"]: c["id"] for c in fixture["chunks"]}
+
+    def via_search_index(query_text, top_k):
+        # search_index mencetak log per query; diredam agar laporan tetap terbaca
+        with contextlib.redirect_stdout(io.StringIO()):
+            chunks = search_index(query_text, k=top_k, collection_name=BENCHMARK_COLLECTION)
+        return [id_by_text.get(text) for text in chunks]
+
+    def via_query_documents(query_text, top_k):
+        docs = query_documents_by_text(query_text, top_k=top_k, collection_name=BENCHMARK_COLLECTION)
+        return [doc["id"] for doc in docs]
+
+    return {
+        "fixture": os.path.basename(fixture_path),
+        "corpus_size": corpus_size,
+        "k": k,
+        "results": {
+            "search_index": evaluate(via_search_index, fixture["queries"], k, repeat),
+            "query_documents_by_text": evaluate(via_query_documents, fixture["queries"], k, repeat),
+        }
+    }
+
+def compare_to_baseline(report, baseline):
+    """Selisih setiap metrik terhadap laporan baseline: {fungsi: {metrik: (baseline, sekarang, delta)}}."""
+    diff = {}
+    for name, metrics in report["results"].items():
+        base_metrics = baseline.get("results", {}).get(name, {})
+        diff[name] = {
+            metric: (base_metrics[metric], value, round(value - base_metrics[metric], 4))
+            for metric, value in metrics.items()
+            if metric in base_metrics and metric != "queries"
+        }
+    return diff
@@ -0,0 +1,100 @@
+import os
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from .vector_store import DEFAULT_COLLECTION, get_collection
+
+SEARCH_BATCH_MAX_SIZE = int(os.getenv("SEARCH_BATCH_MAX_SIZE", "32"))
+SEARCH_BATCH_MAX_WAIT_MS = float(os.getenv("SEARCH_BATCH_MAX_WAIT_MS", "5"))
+
+class SearchBatcher:
+    """
+    Menggabungkan pencarian vektor yang datang bersamaan:
+    - single-flight: query identik (koleksi, teks, k) yang sedang berjalan berbagi satu Future,
+    - micro-batching: query berbeda yang masuk dalam jendela `max_wait_ms` dikirim sebagai
+      satu `collection.query(query_texts=[...])`, sehingga embedding query dihitung dalam
+      satu panggilan batch dan indeks dipindai sekali untuk banyak query.
+
+    Query dikelompokkan per (koleksi, k) agar hasil tiap query sama persis dengan query tunggal.
+    """
+
+    def __init__(self, max_batch_size=SEARCH_BATCH_MAX_SIZE, max_wait_ms=SEARCH_BATCH_MAX_WAIT_MS):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+
+    def submit(self, query_text, k=25, collection_name=DEFAULT_COLLECTION):
+        """
+        Versi async: mengembalikan Future berisi dict {ids, documents, metadatas, distances}
+        untuk satu query (bukan list per query seperti collection.query).
+        """
+        key = (collection_name, query_text, k)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._inflight[key] = future
+            self._ensure_worker()
+        self._queue.put((key, future))
+        return future
+
+    def search(self, query_text, k=25, collection_name=DEFAULT_COLLECTION):
+        result = self.submit(query_text, k, collection_name).result()
+        # Salinan dangkal agar pemanggil yang berbagi hasil tidak saling mengubah list-nya
+        return {field: list(values) for field, values in result.items()}
+
+    # === WORKER ===
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            groups = {}
+            for key, future in batch:
+                collection_name, _, k = key
+                groups.setdefault((collection_name, k), []).append((key, future))
+            for (collection_name, k), items in groups.items():
+                self._execute(collection_name, k, items)
+
+    def _execute(self, collection_name, k, items):
+        try:
+            results = get_collection(collection_name).query(
+                query_texts=[key[1] for key, _ in items],
+                n_results=k
+            )
+            for i, (key, future) in enumerate(items):
+                future.set_result({
+                    field: results[field][i]
+                    for field in ("ids", "documents", "metadatas", "distances")
+                    if results.get(field) is not None
+                })
+        except Exception as e:
+            traceback.print_exc()
+            for _, future in items:
+                future.set_exception(e)
+        finally:
+            with self._lock:
+                for key, _ in items:
+                    self._inflight.pop(key, None)
+
+search_batcher = SearchBatcher()
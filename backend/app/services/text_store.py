@@ -0,0 +1,36 @@
+import gzip
+import os
+from flask import current_app
+
+def _text_path(ref_id):
+    return os.path.join(current_app.config['EXTRACTED_TEXT_FOLDER'], f"{ref_id}.txt.gz")
+
+def open_text_writer(ref_id):
+    """
+    Membuka file gzip untuk menulis teks hasil ekstraksi sebuah PDFReference
+    secara bertahap (per halaman), tanpa menampung seluruh teks di memori.
+    Mengembalikan tuple (file_handle, path).
+    """
+    path = _text_path(ref_id)
+    return gzip.open(path, 'wt', encoding='utf-8'), path
+
+def save_extracted_text(ref_id, text):
+    """Menyimpan seluruh teks sekaligus ke file terkompresi."""
+    writer, path = open_text_writer(ref_id)
+    with writer:
+        writer.write(text)
+    return path
+
+def iter_extracted_text(path):
+    """Membaca teks terkompresi baris per baris (streaming)."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield line
+
+def read_extracted_text(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return f.read()
+
+def delete_extracted_text(path):
+    if path and os.path.exists(path):
+        os.remove(path)
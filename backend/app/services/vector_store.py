@@ -0,0 +1,142 @@
+import os
+import threading
+import chromadb
+
+# --- Configuration ---
+# Satu lokasi penyimpanan vektor untuk seluruh jalur ingestion dan query.
+DEFAULT_STORE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'instance'))
+VECTOR_STORE_PATH = os.getenv("VECTOR_STORE_PATH", DEFAULT_STORE_PATH)
+DEFAULT_COLLECTION = "gatra_sinau_docs"
+
+# Backend indeks: 'chroma' (default) atau 'faiss' (HNSW in-process, file di-memory-map)
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma").lower()
+
+# Parameter HNSW bersama untuk kedua backend; kosong = pakai default backend.
+# M lebih besar -> recall lebih tinggi tapi indeks lebih besar; ef_search menukar latensi dengan recall.
+HNSW_M = os.getenv("VECTOR_HNSW_M")
+HNSW_EF_CONSTRUCTION = os.getenv("VECTOR_HNSW_EF_CONSTRUCTION")
+HNSW_EF_SEARCH = os.getenv("VECTOR_HNSW_EF_SEARCH")
+
+# Penyimpanan vektor terkuantisasi (khusus backend faiss): 'none', 'fp16' atau 'int8'.
+# Bisa satu nilai untuk semua koleksi ("int8") atau per koleksi ("gatra_sinau_docs=int8,kurikulum=fp16").
+VECTOR_QUANTIZATION = os.getenv("VECTOR_QUANTIZATION", "none")
+
+# Lokasi store lama yang digabungkan oleh perintah `flask merge-vector-stores`
+LEGACY_STORES = [
+    # (path, [nama koleksi])
+    (os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'chroma')), ["gatra_sinau_docs", "kurikulum"]),
+]
+
+_client = None
+_collections = {}
+_lock = threading.Lock()
+
+def get_client():
+    """Client ChromaDB tunggal per proses (dibuat saat pertama kali dipakai)."""
+    global _client
+    with _lock:
+        if _client is None:
+            os.makedirs(VECTOR_STORE_PATH, exist_ok=True)
+            _client = chromadb.PersistentClient(path=VECTOR_STORE_PATH)
+        return _client
+
+def _hnsw_metadata():
+    metadata = {}
+    if HNSW_M:
+        metadata["hnsw:M"] = int(HNSW_M)
+    if HNSW_EF_CONSTRUCTION:
+        metadata["hnsw:construction_ef"] = int(HNSW_EF_CONSTRUCTION)
+    if HNSW_EF_SEARCH:
+        metadata["hnsw:search_ef"] = int(HNSW_EF_SEARCH)
+    return metadata or None
+
+def _open_chroma_collection(name):
+    # Metadata HNSW hanya berlaku saat koleksi pertama kali dibuat
+    return get_client().get_or_create_collection(name=name, metadata=_hnsw_metadata())
+
+def quantization_for(name):
+    """Mode quantization yang dikonfigurasi untuk koleksi `name`."""
+    default = "none"
+    for entry in VECTOR_QUANTIZATION.split(","):
+        entry = entry.strip()
+        if "=" in entry:
+            collection_name, mode = entry.split("=", 1)
+            if collection_name.strip() == name:
+                return mode.strip().lower()
+        elif entry:
+            default = entry.lower()
+    return default
+
+def _open_faiss_collection(name):
+    from .faiss_index import FaissCollection
+    from .rag_service import model  # import lokal untuk menghindari import melingkar
+
+    options = {}
+    if HNSW_M:
+        options["M"] = int(HNSW_M)
+    if HNSW_EF_CONSTRUCTION:
+        options["ef_construction"] = int(HNSW_EF_CONSTRUCTION)
+    if HNSW_EF_SEARCH:
+        options["ef_search"] = int(HNSW_EF_SEARCH)
+    return FaissCollection(
+        name,
+        os.path.join(VECTOR_STORE_PATH, "faiss"),
+        embedding_function=lambda texts: model.encode(texts),
+        quantization=quantization_for(name),
+        **options
+    )
+
+def get_collection(name=DEFAULT_COLLECTION):
+    """Koleksi bernama dari store tunggal; handle-nya di-cache agar tetap 'hangat'."""
+    collection = _collections.get(name)
+    if collection is None:
+        if VECTOR_BACKEND == "chroma":
+            get_client()
+        with _lock:
+            collection = _collections.get(name)
+            if collection is None:
+                if VECTOR_BACKEND == "faiss":
+                    collection = _open_faiss_collection(name)
+                else:
+                    collection = _open_chroma_collection(name)
+                _collections[name] = collection
+    return collection
+
+def persist_collection(collection):
+    """
+    Menyimpan perubahan koleksi ke disk setelah serangkaian upsert. Koleksi FAISS
+    menulis ulang file indeksnya di sini; Chroma (PersistentClient) sudah menyimpan
+    sendiri sehingga tidak ada yang perlu dilakukan.
+    """
+    persist = getattr(collection, 'persist', None)
+    if callable(persist):
+        persist()
+
+def copy_collection(source, target, batch_size=500):
+    """
+    Menyalin seluruh isi koleksi `source` ke `target` per halaman, termasuk embedding,
+    sehingga tidak perlu meng-embed ulang. ID yang sudah ada di target ditimpa (upsert).
+    Mengembalikan jumlah item yang disalin.
+    """
+    copied = 0
+    offset = 0
+    while True:
+        batch = source.get(
+            include=["documents", "metadatas", "embeddings"],
+            limit=batch_size,
+            offset=offset
+        )
+        ids = batch["ids"]
+        if not len(ids):
+            break
+        target.upsert(
+            ids=ids,
+            documents=batch["documents"],
+            # Chroma menolak metadata kosong, jadi item tanpa metadata diberi penanda asal
+            metadatas=[m or {"migrated_from": "legacy"} for m in batch["metadatas"]],
+            embeddings=batch["embeddings"]
+        )
+        copied += len(ids)
+        offset += len(ids)
+    persist_collection(target)
+    return copied
@@ -1,33 +1,135 @@
 from functools import wraps
 from flask import request, jsonify, current_app
+import datetime
+import os
+import threading
+import time
 import jwt
+from app.extensions import db
 from app.models import User
 
-def token_required(f):
+TOKEN_LIFETIME = datetime.timedelta(hours=24)
+# Berapa lama versi token per user dipercaya tanpa mengecek database lagi
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+
+_token_versions = {}  # {user_id: (token_version, expires_at)}
+_token_versions_lock = threading.Lock()
+
+def create_token(user):
+    """JWT login yang membawa role, school_id dan versi token sebagai klaim."""
+    return jwt.encode({
+        'user_id': user.id,
+        'role': user.role,
+        'school_id': user.school_id,
+        'ver': user.token_version or 0,
+        'exp': datetime.datetime.utcnow() + TOKEN_LIFETIME
+    }, current_app.config['SECRET_KEY'], algorithm="HS256")
+
+def revoke_user_tokens(user):
+    """
+    Menaikkan versi token user sehingga semua token lama ditolak (dipanggil saat
+    password, role atau sekolah berubah). Perubahan di-commit oleh pemanggil.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    forget_user(user.id)
+
+def forget_user(user_id):
+    with _token_versions_lock:
+        _token_versions.pop(user_id, None)
+
+def _current_token_version(user_id):
+    now = time.monotonic()
+    with _token_versions_lock:
+        cached = _token_versions.get(user_id)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    # Hanya satu kolom yang diambil; None berarti user sudah dihapus
+    version = db.session.query(User.token_version).filter(User.id == user_id).scalar()
+    if version is None:
+        forget_user(user_id)
+        return None
+    with _token_versions_lock:
+        _token_versions[user_id] = (version, now + AUTH_USER_CACHE_TTL)
+    return version
+
+class Principal:
+    """
+    Identitas user yang dibangun dari klaim JWT (id, role, school_id) tanpa query.
+    Atribut lain (username, email, relasi, ...) memuat baris User lengkap saat
+    pertama kali diakses, sekali per request.
+    """
+
+    def __init__(self, user_id, role, school_id, token_version):
+        self.id = user_id
+        self.role = role
+        self.school_id = school_id
+        self.token_version = token_version
+        self._user = None
+
+    @property
+    def user(self):
+        if self._user is None:
+            self._user = db.session.get(User, self.id)
+        return self._user
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        user = self.user
+        if user is None:
+            raise AttributeError(name)
+        return getattr(user, name)
+
+    def __repr__(self):
+        return f'<Principal {self.id} {self.role}>'
+
+def _token_from_request(allow_query_token=False):
+    if 'Authorization' in request.headers:
+        # Expected format: "Bearer <token>"
+        parts = request.headers['Authorization'].split(" ")
+        if len(parts) == 2 and parts[0] == "Bearer":
+            return parts[1]
+    if allow_query_token:
+        return request.args.get('token')
+    return None
+
+def _authenticate(f, allow_query_token):
     @wraps(f)
     def decorated(*args, **kwargs):
         # Langsung loloskan preflight request (CORS)
         if request.method == 'OPTIONS':
             return '', 200
 
-        token = None
-        if 'Authorization' in request.headers:
-            # Expected format: "Bearer <token>"
-            parts = request.headers['Authorization'].split(" ")
-            if len(parts) == 2 and parts[0] == "Bearer":
-                token = parts[1]
+        token = _token_from_request(allow_query_token)
 
         if not token:
             return jsonify({'message': 'Token is missing!'}), 401
 
         try:
             data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
-            current_user = User.query.get(data['user_id'])
-            if not current_user:
-                return jsonify({'message': 'Token is invalid!'}), 401
+            if 'ver' in data:
+                if _current_token_version(data['user_id']) != data['ver']:
+                    return jsonify({'message': 'Token is invalid!'}), 401
+                current_user = Principal(data['user_id'], data.get('role'), data.get('school_id'), data['ver'])
+            else:
+                # Token lama (sebelum klaim role/ver) tetap dilayani dengan memuat baris User
+                current_user = User.query.get(data['user_id'])
+                if not current_user:
+                    return jsonify({'message': 'Token is invalid!'}), 401
         except Exception as e:
             return jsonify({'message': 'Token is invalid!'}), 401
 
         return f(current_user, *args, **kwargs)
 
-    return decorated
\ No newline at end of file
+    return decorated
+
+def token_required(f):
+    return _authenticate(f, allow_query_token=False)
+
+def stream_token_required(f):
+    """
+    Seperti token_required, tetapi juga menerima token dari query string `?token=`.
+    Khusus endpoint SSE: EventSource di browser tidak bisa mengirim header Authorization.
+    """
+    return _authenticate(f, allow_query_token=True)
@@ -0,0 +1,23 @@
+import hashlib
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+def compute_sha256(stream, chunk_size=CHUNK_SIZE):
+    """
+    Menghitung SHA-256 dari sebuah stream file secara bertahap (per chunk),
+    sehingga file besar tidak perlu dimuat seluruhnya ke memori.
+    Posisi stream dikembalikan ke awal agar file masih bisa disimpan setelahnya.
+    """
+    sha256 = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        sha256.update(chunk)
+    stream.seek(0)
+    return sha256.hexdigest()
+
+
+def compute_file_sha256(file_path, chunk_size=CHUNK_SIZE):
+    """Menghitung SHA-256 dari file yang sudah tersimpan di disk."""
+    with open(file_path, 'rb') as f:
+        return compute_sha256(f, chunk_size)
@@ -0,0 +1,142 @@
+import base64
+import datetime
+import json
+from flask import request, jsonify
+from sqlalchemy import and_, func, or_
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+def _encode_cursor(value, row_id):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def _decode_cursor(cursor, column):
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Cursor tidak valid.")
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+    if value is not None and python_type in (datetime.datetime, datetime.date):
+        value = python_type.fromisoformat(value)
+    return value, row_id
+
+def _coerce(column, value):
+    """Nilai query string selalu str; sesuaikan dengan tipe kolom (int/bool) agar perbandingan benar."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is bool:
+        return value.lower() in ('1', 'true', 'yes')
+    if python_type is int:
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"Filter {column.key} harus berupa angka.")
+    return value
+
+def parse_limit(args, default_limit=DEFAULT_LIMIT, max_limit=MAX_LIMIT):
+    """
+    Nilai ?limit= dari query string; tanpa limit dipakai `default_limit` sehingga ukuran
+    respons selalu terbatas (klien yang butuh semua baris mengikuti X-Next-Cursor).
+    Melempar ValueError jika limit bukan bilangan bulat positif.
+    """
+    raw = args.get('limit')
+    if raw is None:
+        return default_limit
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise ValueError("limit harus berupa angka.")
+    if limit < 1:
+        raise ValueError("limit harus lebih dari 0.")
+    return min(limit, max_limit)
+
+class Page:
+    def __init__(self, items, total, next_cursor):
+        self.items = items
+        self.total = total
+        self.next_cursor = next_cursor
+
+def paginate(query, id_column, sortable, default_sort, filterable=None, searchable=None,
+             default_limit=DEFAULT_LIMIT, max_limit=MAX_LIMIT):
+    """
+    Paginasi, filter & sort seragam untuk endpoint daftar, dari query string:
+    - limit (maks `max_limit`, default `default_limit`)
+    - cursor: keyset dari X-Next-Cursor halaman sebelumnya (atau offset untuk klien lama)
+    - sort: nama kolom di `sortable`, awali '-' untuk menurun (mis. sort=-created_at)
+    - <nama filter>=nilai untuk setiap kunci di `filterable` (kesetaraan)
+    - q: pencarian teks (LIKE) pada kolom `searchable`
+    Total dihitung dengan satu COUNT tanpa eager load. Melempar ValueError untuk parameter tidak valid.
+    """
+    args = request.args
+    limit = parse_limit(args, default_limit, max_limit)
+
+    for name, column in (filterable or {}).items():
+        if name in args:
+            query = query.filter(column == _coerce(column, args[name]))
+    if args.get('q') and searchable:
+        pattern = f"%{args['q']}%"
+        query = query.filter(or_(*[column.ilike(pattern) for column in searchable]))
+
+    total = query.enable_eagerloads(False).order_by(None).with_entities(func.count(id_column)).scalar()
+
+    sort = args.get('sort', default_sort)
+    descending = sort.startswith('-')
+    sort_name = sort.lstrip('-')
+    if sort_name not in sortable:
+        raise ValueError(f"sort harus salah satu dari: {', '.join(sorted(sortable))}")
+    sort_column = sortable[sort_name]
+
+    cursor = args.get('cursor')
+    if cursor:
+        value, row_id = _decode_cursor(cursor, sort_column)
+        if descending:
+            query = query.filter(or_(sort_column < value, and_(sort_column == value, id_column < row_id)))
+        else:
+            query = query.filter(or_(sort_column > value, and_(sort_column == value, id_column > row_id)))
+    elif args.get('offset', type=int):
+        query = query.offset(args.get('offset', type=int))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return Page(rows, total, next_cursor)
+
+def select_fields(items):
+    """Sparse fieldset: ?fields=id,name hanya mengembalikan kunci tersebut dari setiap item."""
+    fields = request.args.get('fields')
+    if not fields:
+        return items
+    wanted = [f.strip() for f in fields.split(',') if f.strip()]
+    return [{key: item[key] for key in wanted if key in item} for item in items]
+
+def paginated_response(query, serialize, id_column, sortable, default_sort, **options):
+    """
+    Menjalankan paginate() lalu mengembalikan list JSON (bentuk respons lama tetap sama)
+    dengan metadata di header X-Total-Count dan X-Next-Cursor.
+    """
+    try:
+        page = paginate(query, id_column, sortable, default_sort, **options)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    response = jsonify(select_fields([serialize(row) for row in page.items]))
+    response.headers['X-Total-Count'] = str(page.total)
+    if page.next_cursor:
+        response.headers['X-Next-Cursor'] = page.next_cursor
+    return response, 200
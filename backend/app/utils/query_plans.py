@@ -0,0 +1,45 @@
+from sqlalchemy import select
+from app.extensions import db
+from app.models import Prota, Promes, Atp, CP, Elemen, Class, Layout, MediaAsset
+
+def hot_queries():
+    """Query yang dipanggil di endpoint daftar/wizard dan wajib memakai index."""
+    return [
+        ("docs: prota per user", select(Prota.id).where(Prota.user_id == 1).order_by(Prota.created_at.desc())),
+        ("wizard: kelas per guru", select(Class.id).where(Class.teacher_id == 1)),
+        ("classes: kelas per sekolah", select(Class.id).where(Class.school_id == 1)),
+        ("layouts: layout per uploader", select(Layout.id).where(Layout.uploaded_by == 1).order_by(Layout.created_at.desc())),
+        ("generate: template Prota", select(Layout.id).where(
+            Layout.jenjang == 'SMP', Layout.mapel == 'IPA', Layout.tipe_dokumen == 'Prota')),
+        ("upload CP: elemen per mapel", select(Elemen.id).where(Elemen.subject_id == 1, Elemen.nama_elemen == 'x')),
+        ("upload CP: cp per elemen+fase", select(CP.id).where(CP.elemen_id == 1, CP.fase == 'D')),
+        ("generate: cp per mapel", select(CP.id).join(Elemen).where(Elemen.subject_id == 1)),
+        ("books: media per buku", select(MediaAsset.id).where(MediaAsset.book_id == 1)),
+        ("docs: promes per prota", select(Promes.id).where(Promes.prota_id == 1)),
+        ("docs: atp per cp", select(Atp.id).where(Atp.cp_id == 1)),
+    ]
+
+def _plan_lines(connection, statement):
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == 'sqlite':
+        return [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+    return [" ".join(str(col) for col in row) for row in connection.exec_driver_sql(f"EXPLAIN {sql}")]
+
+def _uses_index(dialect_name, lines):
+    if dialect_name == 'sqlite':
+        # "SCAN <tabel>" tanpa index = full table scan
+        return not any(line.startswith('SCAN') and 'INDEX' not in line for line in lines)
+    if dialect_name == 'postgresql':
+        return not any('Seq Scan' in line for line in lines)
+    # MySQL: kolom type = ALL berarti full table scan
+    return not any(' ALL ' in f" {line} " for line in lines)
+
+def check_query_plans(engine=None):
+    """Mengembalikan list (nama, lolos, baris plan) untuk setiap hot query."""
+    engine = engine or db.engine
+    results = []
+    with engine.connect() as connection:
+        for name, statement in hot_queries():
+            lines = _plan_lines(connection, statement)
+            results.append((name, _uses_index(connection.dialect.name, lines), lines))
+    return results
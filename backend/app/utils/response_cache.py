@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import Response, current_app, request
+from sqlalchemy import event, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from app.extensions import db
+from app.models import TableVersion
+
+# Tabel data referensi yang versinya dilacak untuk ETag
+WATCHED_TABLES = {'subjects', 'school', 'user', 'classes', 'prota'}
+# Jumlah respons JSON yang disimpan di memori proses (0 = nonaktif)
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+
+class _ResponseMemo:
+    """LRU kecil {etag: (body, status, headers)}; ETag sudah memuat versi tabel sehingga entri lama tidak pernah dipakai lagi."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def set(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+response_memo = _ResponseMemo(RESPONSE_CACHE_SIZE)
+
+def table_versions(tables):
+    """Versi terkini setiap tabel dalam satu query berdasarkan primary key (0 jika belum pernah ditulis)."""
+    rows = db.session.query(TableVersion.name, TableVersion.version).filter(TableVersion.name.in_(tables)).all()
+    versions = dict(rows)
+    return [versions.get(name, 0) for name in sorted(tables)]
+
+def _bump_statement(dialect_name, name):
+    """
+    Upsert atomik versi+1 untuk satu tabel. Baris awal diisi oleh migrasi; upsert
+    menjaga tabel yang baru ditambahkan ke WATCHED_TABLES tanpa race UPDATE-lalu-INSERT.
+    """
+    table = TableVersion.__table__
+    if dialect_name in ('sqlite', 'postgresql'):
+        insert = sqlite.insert if dialect_name == 'sqlite' else postgresql.insert
+        return insert(table).values(name=name, version=1).on_conflict_do_update(
+            index_elements=[table.c.name], set_={'version': table.c.version + 1}
+        )
+    if dialect_name in ('mysql', 'mariadb'):
+        return mysql.insert(table).values(name=name, version=1).on_duplicate_key_update(
+            version=table.c.version + 1
+        )
+    return update(table).where(table.c.name == name).values(version=table.c.version + 1)
+
+def _bump_table_versions(session, flush_context):
+    """
+    Menaikkan versi tabel yang barisnya ditambah/diubah/dihapus dalam flush ini, di
+    transaksi yang sama, sehingga semua handler POST/PUT/DELETE (dan semua proses
+    worker) otomatis membatalkan ETag tanpa perlu invalidasi manual.
+    """
+    touched = set()
+    for obj in session.new:
+        touched.add(getattr(obj, '__tablename__', None))
+    for obj in session.deleted:
+        touched.add(getattr(obj, '__tablename__', None))
+    for obj in session.dirty:
+        if session.is_modified(obj):
+            touched.add(getattr(obj, '__tablename__', None))
+    touched &= WATCHED_TABLES
+    if not touched:
+        return
+
+    connection = session.connection()
+    for name in sorted(touched):
+        connection.execute(_bump_statement(connection.dialect.name, name))
+
+def init_app(app):
+    """Memasang listener versi tabel pada db.session aplikasi (bukan semua Session di proses)."""
+    if not event.contains(db.session, "after_flush", _bump_table_versions):
+        event.listen(db.session, "after_flush", _bump_table_versions)
+
+def _not_modified(etag):
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def etag_cached(tables, vary=None, memoize=True):
+    """
+    Decorator (dipasang di bawah @token_required) untuk endpoint GET data referensi:
+    - ETag = hash(versi `tables`, path+query string, hasil `vary(current_user, **kwargs)`)
+    - If-None-Match yang cocok dijawab 304 tanpa menjalankan handler
+    - `memoize`: respons 200 disimpan per ETag sehingga permintaan dari klien lain
+      juga tidak perlu query & serialisasi ulang
+    Cache-Control: private, no-cache membuat browser selalu revalidasi dengan ETag.
+    """
+    tables = tuple(sorted(tables))
+
+    def decorator(f):
+        @wraps(f)
+        def decorated(current_user, *args, **kwargs):
+            scope = vary(current_user, *args, **kwargs) if vary else None
+            raw = json.dumps([f.__name__, table_versions(tables), request.full_path, scope], default=str)
+            etag = hashlib.sha1(raw.encode()).hexdigest()
+            if request.if_none_match.contains(etag):
+                return _not_modified(etag)
+
+            cached = response_memo.get(etag) if memoize else None
+            if cached is not None:
+                body, status, headers = cached
+                response = Response(body, status=status, headers=headers)
+            else:
+                response = current_app.make_response(f(current_user, *args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if memoize:
+                    headers = [(k, v) for k, v in response.headers.items() if k in ('Content-Type', 'X-Total-Count', 'X-Next-Cursor')]
+                    response_memo.set(etag, (response.get_data(), response.status_code, headers))
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated
+    return decorator
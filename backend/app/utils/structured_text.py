@@ -0,0 +1,201 @@
+import re
+import time
+
+# ============================================================
+# POLA (DIKOMPILASI SEKALI SAAT IMPORT)
+# ============================================================
+
+# Entri daftar isi: "Judul ........ 12"
+TOC_ENTRY_RE = re.compile(r'(.+?)\s*\.{5,}\s*(\d+)')
+# Bab utama: "BAB I", "BAB 2 ..."
+CHAPTER_RE = re.compile(r'^(BAB\s+[IVXLC\d]+)', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+SUBJECT_HEADER_RE = re.compile(r'^(?:MATA\s+PELAJARAN|MAPEL)\s*:\s*(.+)$', re.IGNORECASE)
+FASE_RE = re.compile(r'\bFASE\s+([A-F])\b', re.IGNORECASE)
+ELEMEN_ITEM_RE = re.compile(r'^[•-]\s*([^:]+):\s*(.*)')
+
+FASE_HEADER_MAX_LEN = 60
+TOC_MIN_TITLE_LEN = 5
+
+# ============================================================
+# DAFTAR ISI (ToC)
+# ============================================================
+
+def parse_toc_lines(lines):
+    """
+    Mengubah baris daftar isi menjadi {"chapters": [...]} dalam satu lintasan.
+    Entri "BAB ..." menjadi bab utama; entri sesudahnya masuk ke `subsections` bab
+    tersebut. Entri sebelum bab pertama (Kata Pengantar, dll.) tetap di tingkat atas.
+    Judul duplikat (mis. daftar isi yang terulang di halaman berikut) dilewati lewat set.
+    """
+    chapters = []
+    seen = set()
+    current_chapter = None
+    for line in lines:
+        # Baris tanpa titik penuntun tidak mungkin entri ToC; lewati tanpa regex
+        if '.....' not in line:
+            continue
+        match = TOC_ENTRY_RE.search(line)
+        if not match:
+            continue
+        title = WHITESPACE_RE.sub(' ', match.group(1)).strip()
+        if len(title) < TOC_MIN_TITLE_LEN or title in seen:
+            continue
+        seen.add(title)
+
+        entry = {"title": title, "page": int(match.group(2)), "subsections": []}
+        if CHAPTER_RE.match(title):
+            chapters.append(entry)
+            current_chapter = entry
+        elif current_chapter is not None:
+            current_chapter["subsections"].append(entry)
+        else:
+            chapters.append(entry)
+    return {"chapters": chapters}
+
+# ============================================================
+# CAPAIAN PEMBELAJARAN (CP)
+# ============================================================
+
+class CpLineParser:
+    """
+    State machine parsing CP baris demi baris: header mapel -> FASE -> Capaian Umum /
+    Capaian per Elemen. feed() mengembalikan dict baris CP atau None, sehingga sumber
+    sebesar apa pun bisa diproses tanpa dimuat seluruhnya. Setiap baris di-lowercase
+    sekali dan regex hanya dijalankan jika cek string murah sudah cocok.
+    """
+
+    def __init__(self):
+        self.current_subject = None
+        self.current_fase = None
+        self.reading_mode = None # Mode bisa 'umum' atau 'elemen'
+
+    def _row(self, elemen_name, isi):
+        row = {'fase': self.current_fase, 'elemen_name': elemen_name, 'isi': isi}
+        if self.current_subject:
+            row['subject_name'] = self.current_subject
+        return row
+
+    def feed(self, line):
+        line = line.strip()
+        if not line:
+            return None
+        lower = line.lower()
+
+        # Header mapel (file batch multi-mapel)
+        if lower.startswith(('mata', 'mapel')):
+            subject_match = SUBJECT_HEADER_RE.match(line)
+            if subject_match:
+                self.current_subject = subject_match.group(1).strip()
+                self.current_fase = None
+                self.reading_mode = None
+                return None
+
+        # Fase baru. Hanya baris judul (diawali "Fase X" atau pendek) yang dihitung;
+        # kalimat isi seperti "Pada akhir Fase D, peserta didik ..." tidak mengganti fase.
+        if 'fase' in lower:
+            fase_match = FASE_RE.search(line)
+            if fase_match and (fase_match.start() == 0 or len(line) <= FASE_HEADER_MAX_LEN):
+                self.current_fase = fase_match.group(1).upper()
+                self.reading_mode = None
+                return None
+
+        if not self.current_fase:
+            return None
+
+        # Mode baca
+        if 'capaian umum' in lower:
+            self.reading_mode = 'umum'
+            capaian_umum_text = line.split(':', 1)[1].strip() if ':' in line else ''
+            if capaian_umum_text:
+                return self._row('Capaian Umum', capaian_umum_text)
+            return None
+
+        if 'capaian per elemen' in lower or 'elemen:' in lower:
+            self.reading_mode = 'elemen'
+            return None
+
+        if self.reading_mode == 'umum':
+            self.reading_mode = None
+            return self._row('Capaian Umum', line)
+
+        if self.reading_mode == 'elemen' and line[0] in '•-':
+            elemen_match = ELEMEN_ITEM_RE.match(line)
+            if elemen_match:
+                return self._row(elemen_match.group(1).strip(), elemen_match.group(2).strip())
+        return None
+
+def iter_cp_rows(lines):
+    parser = CpLineParser()
+    for line in lines:
+        row = parser.feed(line)
+        if row:
+            yield row
+
+# ============================================================
+# FIXTURE & MICRO-BENCHMARK
+# ============================================================
+
+def toc_fixture_lines(chapters=50, sections=9, repeat_pages=2):
+    """Daftar isi sintetis: `chapters` bab x `sections` subbab, diulang `repeat_pages` kali."""
+    lines = ["DAFTAR ISI", "Kata Pengantar ........................ iii", "Kata Pengantar ........................ 1"]
+    page = 1
+    for c in range(1, chapters + 1):
+        lines.append(f"BAB {c} Topik Pembelajaran Nomor {c} ........................ {page}")
+        for s in range(1, sections + 1):
+            page += 2
+            lines.append(f"{c}.{s} Subbab {s} dari Bab {c} ........................ {page}")
+        lines.append("Halaman ini sengaja dikosongkan")
+    return lines * repeat_pages
+
+def cp_fixture_lines(subjects=12, elements=8, repeat=1):
+    """CP multi-mapel sintetis: fase A-F, Capaian Umum + `elements` elemen per fase."""
+    lines = []
+    for _ in range(repeat):
+        for s in range(subjects):
+            lines.append(f"Mata Pelajaran: Mapel Benchmark {s}")
+            for fase in "ABCDEF":
+                lines.append(f"FASE {fase}")
+                lines.append(f"Capaian Umum: Pada akhir fase {fase}, peserta didik mapel {s} mampu memahami konsep dasar.")
+                lines.append("Capaian per Elemen")
+                for e in range(elements):
+                    lines.append(f"- Elemen {e}: Peserta didik mampu menjelaskan, menerapkan dan mengevaluasi "
+                                 f"materi elemen {e} fase {fase} dalam konteks kehidupan sehari-hari.")
+    return lines
+
+def _best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run_parsing_benchmark(sizes=(100, 500, 2000), repeat=5):
+    """
+    Mengukur parse_toc_lines dan CpLineParser pada fixture yang membesar. `per_line_us`
+    yang kira-kira konstan antar ukuran berarti waktu parsing linear terhadap input.
+    Mengembalikan {'toc': [...], 'cp': [...]} berisi entries, lines, best_ms, per_line_us.
+    """
+    report = {'toc': [], 'cp': []}
+    for size in sizes:
+        toc_lines = toc_fixture_lines(chapters=max(1, size // 10), sections=9)
+        entries = len(parse_toc_lines(toc_lines)["chapters"])
+        best = _best_time(lambda: parse_toc_lines(toc_lines), repeat)
+        report['toc'].append({
+            'entries': size, 'chapters': entries, 'lines': len(toc_lines),
+            'best_ms': round(best * 1000, 3),
+            'per_line_us': round(best * 1e6 / len(toc_lines), 3),
+        })
+
+        cp_lines = cp_fixture_lines(subjects=max(1, size // 50), elements=8)
+        rows = sum(1 for _ in iter_cp_rows(cp_lines))
+        best = _best_time(lambda: sum(1 for _ in iter_cp_rows(cp_lines)), repeat)
+        report['cp'].append({
+            'entries': rows, 'lines': len(cp_lines),
+            'best_ms': round(best * 1000, 3),
+            'per_line_us': round(best * 1e6 / len(cp_lines), 3),
+        })
+    return report
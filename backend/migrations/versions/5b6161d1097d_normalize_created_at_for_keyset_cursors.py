@@ -0,0 +1,34 @@
+"""normalize created_at for keyset cursors
+
+Revision ID: 5b6161d1097d
+Revises: 44e035d16d14
+Create Date: 2026-10-19 19:11:43.296953
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b6161d1097d'
+down_revision = '44e035d16d14'
+branch_labels = None
+depends_on = None
+
+TABLES = ('prota', 'layouts')
+
+
+def upgrade():
+    # SQLite menyimpan TIMESTAMP sebagai teks. Baris dari server_default (CURRENT_TIMESTAMP)
+    # berformat 'YYYY-MM-DD HH:MM:SS', sedangkan nilai dari Python/cursor paginasi memakai
+    # mikrodetik ('... HH:MM:SS.000000'); perbandingan teks keduanya membuat halaman berulang.
+    # Dialek lain menyimpan TIMESTAMP secara native sehingga tidak perlu diubah.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+
+
+def downgrade():
+    # Format mikrodetik tetap valid untuk skema lama
+    pass
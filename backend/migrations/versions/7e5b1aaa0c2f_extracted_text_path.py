@@ -0,0 +1,74 @@
+"""extracted text path
+
+Revision ID: 7e5b1aaa0c2f
+Revises: f5c1f6cf618f
+Create Date: 2026-10-19 18:48:52.720899
+
+"""
+import gzip
+import os
+from alembic import op
+from flask import current_app
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e5b1aaa0c2f'
+down_revision = 'f5c1f6cf618f'
+branch_labels = None
+depends_on = None
+
+
+def _text_path(ref_id):
+    # Sama dengan services/text_store._text_path; disalin agar migrasi tidak bergantung pada kode app
+    return os.path.join(current_app.config['EXTRACTED_TEXT_FOLDER'], f"{ref_id}.txt.gz")
+
+
+def upgrade():
+    with op.batch_alter_table('pdf_reference', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('extracted_text_path', sa.String(length=512), nullable=True))
+
+    os.makedirs(current_app.config['EXTRACTED_TEXT_FOLDER'], exist_ok=True)
+    # Pindahkan teks lama ke file gzip sebelum kolomnya dihapus. Teks diambil satu
+    # dokumen per query agar blob besar tidak dimuat sekaligus.
+    bind = op.get_bind()
+    ref_ids = bind.execute(sa.text(
+        "SELECT id FROM pdf_reference WHERE extracted_text IS NOT NULL"
+    )).scalars().all()
+    for ref_id in ref_ids:
+        content = bind.execute(
+            sa.text("SELECT extracted_text FROM pdf_reference WHERE id = :id"), {'id': ref_id}
+        ).scalar()
+        path = _text_path(ref_id)
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(content)
+        bind.execute(
+            sa.text("UPDATE pdf_reference SET extracted_text_path = :path WHERE id = :id"),
+            {'path': path, 'id': ref_id}
+        )
+
+    with op.batch_alter_table('pdf_reference', schema=None) as batch_op:
+        batch_op.drop_column('extracted_text')
+
+
+def downgrade():
+    with op.batch_alter_table('pdf_reference', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('extracted_text', sa.TEXT(), nullable=True))
+
+    # Kembalikan teks dari file ke kolom; file dibiarkan agar downgrade tidak menghapus data
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, extracted_text_path FROM pdf_reference WHERE extracted_text_path IS NOT NULL"
+    )).all()
+    for ref_id, path in rows:
+        if not os.path.exists(path):
+            continue
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            content = f.read()
+        bind.execute(
+            sa.text("UPDATE pdf_reference SET extracted_text = :content WHERE id = :id"),
+            {'content': content, 'id': ref_id}
+        )
+
+    with op.batch_alter_table('pdf_reference', schema=None) as batch_op:
+        batch_op.drop_column('extracted_text_path')
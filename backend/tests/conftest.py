@@ -0,0 +1,16 @@
+import os
+import pytest
+from flask_migrate import upgrade
+from app import create_app
+
+MIGRATIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'migrations'))
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App dengan database SQLite sementara yang skemanya dibangun dari migrasi Alembic."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+    yield app
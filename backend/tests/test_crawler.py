@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.agents.crawler import Crawler
+
+LAST_MODIFIED = 'Mon, 19 Oct 2026 10:00:00 GMT'
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """Melayani `server.site` ({path: (content_type, body)}) dengan ETag, 304 dan Range."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        if self.path not in server.site:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        content_type, body = server.site[self.path]
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        start = 0
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range') in (etag, LAST_MODIFIED):
+            start = int(range_header.split('=', 1)[1].split('-', 1)[0])
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(body)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header('Content-Range', f'bytes {start}-{len(body) - 1}/{len(body)}')
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body) - start))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+
+@pytest.fixture
+def site():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _SiteHandler)
+    server.site = {}
+    server.requests = []
+    server.url = lambda path, host='127.0.0.1': f"http://{host}:{server.server_port}{path}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _html(*links):
+    body = ''.join(f'<a href="{link}">{link}</a>' for link in links)
+    return 'text/html', f'<html><body>{body}</body></html>'.encode()
+
+
+def _pdf(size=1024):
+    return 'application/pdf', (b'%PDF-1.4 ' * (size // 9 + 1))[:size]
+
+
+def _crawler(tmp_path, **kwargs):
+    return Crawler(str(tmp_path / 'downloads'), min_host_interval=0, **kwargs)
+
+
+def _file_names(results):
+    return sorted(result['file_name'] for result in results)
+
+
+def test_robots_disallow_skips_pages_and_pdfs(site, tmp_path):
+    site.site.update({
+        '/robots.txt': ('text/plain', b'User-agent: *\nDisallow: /private/\n'),
+        '/index.html': _html('/public.pdf', '/private/secret.pdf', '/private/page.html'),
+        '/private/page.html': _html('/hidden.pdf'),
+        '/public.pdf': _pdf(),
+        '/private/secret.pdf': _pdf(),
+        '/hidden.pdf': _pdf(),
+    })
+
+    results = _crawler(tmp_path, max_depth=1).crawl([site.url('/index.html')])
+
+    assert _file_names(results) == ['public.pdf']
+    assert not [path for path, _ in site.requests if path.startswith('/private/')]
+
+
+@pytest.mark.parametrize('max_depth, expected', [
+    (0, ['a.pdf']),
+    (1, ['a.pdf', 'b.pdf']),
+    (2, ['a.pdf', 'b.pdf', 'c.pdf']),
+])
+def test_max_depth_limits_link_following(site, tmp_path, max_depth, expected):
+    site.site.update({
+        '/index.html': _html('/a.pdf', '/level1.html'),
+        '/level1.html': _html('/b.pdf', '/level2.html'),
+        '/level2.html': _html('/c.pdf'),
+        '/a.pdf': _pdf(),
+        '/b.pdf': _pdf(),
+        '/c.pdf': _pdf(),
+    })
+
+    results = _crawler(tmp_path, max_depth=max_depth).crawl([site.url('/index.html')])
+
+    assert _file_names(results) == expected
+
+
+@pytest.mark.parametrize('same_host_only, expected', [
+    (True, ['local.pdf']),
+    (False, ['local.pdf', 'remote.pdf']),
+])
+def test_same_host_only(site, tmp_path, same_host_only, expected):
+    # Server yang sama lewat nama host lain ("localhost") dianggap host berbeda
+    site.site.update({
+        '/index.html': _html('/local.pdf', site.url('/other.html', host='localhost')),
+        '/other.html': _html('/remote.pdf'),
+        '/local.pdf': _pdf(),
+        '/remote.pdf': _pdf(),
+    })
+
+    crawler = _crawler(tmp_path, max_depth=1, same_host_only=same_host_only)
+    results = crawler.crawl([site.url('/index.html')])
+
+    assert _file_names(results) == expected
+
+
+def test_download_streams_to_disk(site, tmp_path):
+    _, body = site.site['/big.pdf'] = _pdf(size=300 * 1024)
+    site.site['/index.html'] = _html('/big.pdf')
+
+    crawler = _crawler(tmp_path, max_depth=0)
+    [result] = crawler.crawl([site.url('/index.html')])
+
+    assert result['download_status'] == 'downloaded'
+    assert result['local_path'] == crawler.path_for(site.url('/big.pdf'))[1]
+    with open(result['local_path'], 'rb') as f:
+        assert f.read() == body
+    assert result['validators']['content_length'] == len(body)
+    assert result['validators']['sha256'] == hashlib.sha256(body).hexdigest()
+    assert os.listdir(tmp_path / 'downloads') == [os.path.basename(result['local_path'])]
+
+
+def test_known_validators_give_not_modified(site, tmp_path):
+    site.site.update({'/index.html': _html('/doc.pdf'), '/doc.pdf': _pdf()})
+    pdf_url = site.url('/doc.pdf')
+
+    [first] = _crawler(tmp_path, max_depth=0).crawl([site.url('/index.html')])
+    site.requests.clear()
+    crawler = _crawler(tmp_path, max_depth=0, known_validators={pdf_url: first['validators']})
+    [second] = crawler.crawl([site.url('/index.html')])
+
+    assert second['download_status'] == 'not_modified'
+    [(_, headers)] = [(path, headers) for path, headers in site.requests if path == '/doc.pdf']
+    assert headers['If-None-Match'] == first['validators']['etag']
+
+
+def _leave_part(crawler, url, data, etag):
+    # Meniru proses yang berhenti setelah menulis .part tetapi sebelum os.replace
+    save_path = crawler.path_for(url)[1]
+    with open(save_path + '.part', 'wb') as f:
+        f.write(data)
+    with open(save_path + '.part.json', 'w', encoding='utf-8') as f:
+        json.dump({'etag': etag, 'last_modified': None}, f)
+    return save_path
+
+
+def test_complete_part_is_finalized_on_416(site, tmp_path):
+    _, body = site.site['/doc.pdf'] = _pdf(size=200 * 1024)
+    url = site.url('/doc.pdf')
+    crawler = _crawler(tmp_path)
+    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+    save_path = _leave_part(crawler, url, body, etag)
+
+    result = crawler.download(url, save_path)
+
+    assert result['status'] == 'resumed'
+    assert result['sha256'] == hashlib.sha256(body).hexdigest()
+    with open(save_path, 'rb') as f:
+        assert f.read() == body
+    assert os.listdir(tmp_path / 'downloads') == [os.path.basename(save_path)]
+    [(_, headers)] = [(path, headers) for path, headers in site.requests if path == '/doc.pdf']
+    assert headers['Range'] == f'bytes={len(body)}-'
+
+
+def test_oversized_part_is_discarded_on_416(site, tmp_path):
+    _, body = site.site['/doc.pdf'] = _pdf()
+    url = site.url('/doc.pdf')
+    crawler = _crawler(tmp_path)
+    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+    save_path = _leave_part(crawler, url, body + b'sisa unduhan lama', etag)
+
+    result = crawler.download(url, save_path)
+
+    assert result['status'] == 'downloaded'
+    with open(save_path, 'rb') as f:
+        assert f.read() == body
+    assert len([path for path, _ in site.requests if path == '/doc.pdf']) == 2
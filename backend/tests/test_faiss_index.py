@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from app.services.faiss_index import FaissCollection
+
+DIM = 16
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).random((60, DIM), dtype='float32')
+
+
+def _open(tmp_path, quantization="none"):
+    return FaissCollection("test", str(tmp_path), embedding_function=None, quantization=quantization)
+
+
+def _upsert(collection, vectors, start=0):
+    ids = [str(i) for i in range(start, start + len(vectors))]
+    collection.upsert(
+        ids=ids,
+        embeddings=vectors,
+        documents=[f"dokumen {i}" for i in ids],
+        metadatas=[{"found_document_id": int(i) % 3, "page": int(i)} for i in ids]
+    )
+    return ids
+
+
+def test_round_trip_through_mmap_reload(tmp_path, vectors):
+    collection = _open(tmp_path)
+    ids = _upsert(collection, vectors)
+    collection.close()
+
+    reopened = _open(tmp_path)
+    assert reopened._mmapped
+    assert reopened.count() == len(ids)
+    result = reopened.query(query_embeddings=vectors[:5], n_results=3)
+    assert [hits[0] for hits in result["ids"]] == ids[:5]
+    assert result["documents"][0][0] == "dokumen 0"
+    assert result["metadatas"][4][0] == {"found_document_id": 1, "page": 4}
+    assert reopened.get(ids=["7"])["documents"] == ["dokumen 7"]
+    reopened.close()
+
+
+def test_upsert_overwrites_existing_id(tmp_path, vectors):
+    collection = _open(tmp_path)
+    collection.upsert(ids=["a"], embeddings=vectors[:1], documents=["lama"])
+    collection.upsert(ids=["a"], embeddings=vectors[1:2], documents=["baru"])
+
+    assert collection.count() == 1
+    assert collection.get(ids=["a"])["documents"] == ["baru"]
+    result = collection.query(query_embeddings=vectors[:1], n_results=5)
+    assert result["ids"] == [["a"]]
+    assert result["documents"] == [["baru"]]
+    collection.close()
+
+
+def test_delete_where_hides_matching_rows(tmp_path, vectors):
+    collection = _open(tmp_path)
+    ids = _upsert(collection, vectors)
+    collection.delete(where={"found_document_id": 1})
+
+    remaining = [i for i in ids if int(i) % 3 != 1]
+    assert collection.count() == len(remaining)
+    assert collection.get(where={"found_document_id": 1})["ids"] == []
+    result = collection.query(query_embeddings=vectors, n_results=10)
+    assert all(int(hit) % 3 != 1 for hits in result["ids"] for hit in hits)
+    collection.close()
+
+
+@pytest.mark.parametrize("quantization", ["fp16", "int8"])
+def test_quantized_results_are_rescored_with_float32(tmp_path, vectors, quantization):
+    collection = _open(tmp_path, quantization)
+    _upsert(collection, vectors)
+    collection.close()
+
+    reopened = _open(tmp_path, quantization)
+    queries = vectors[:3] + 0.01
+    result = reopened.query(query_embeddings=queries, n_results=5)
+    for query, hits, distances in zip(queries, result["ids"], result["distances"]):
+        exact = ((vectors[[int(hit) for hit in hits]] - query) ** 2).sum(axis=1)
+        assert np.allclose(distances, exact, rtol=1e-5)
+        assert distances == sorted(distances)
+    embeddings = reopened.get(ids=["2"], include=("embeddings",))["embeddings"]
+    assert np.array_equal(np.asarray(embeddings, dtype='float32'), vectors[2:3])
+    reopened.close()
+
+
+def test_rows_without_persisted_vectors_are_reconciled_on_open(tmp_path, vectors):
+    collection = _open(tmp_path)
+    persisted = _upsert(collection, vectors[:40])
+    collection.persist()
+    _upsert(collection, vectors[40:], start=40)
+    # Proses mati sebelum persist: baris items sudah commit, file .faiss belum memuat vektornya
+    collection._db.close()
+
+    reopened = _open(tmp_path)
+    assert reopened.count() == len(persisted)
+    assert reopened.get()["ids"] == persisted
+    result = reopened.query(query_embeddings=vectors[40:45], n_results=3)
+    assert all(int(hit) < 40 for hits in result["ids"] for hit in hits)
+    reopened.close()
@@ -0,0 +1,154 @@
+import datetime
+
+import pytest
+import sqlalchemy as sa
+from flask_migrate import downgrade, upgrade
+
+from app.extensions import db
+from app.models import User, School, Subject, Class, FoundDocument, Prota, Layout
+from app.utils.decorators import create_token
+from app.utils.pagination import DEFAULT_LIMIT
+from conftest import MIGRATIONS_DIR
+
+ROWS = 7
+PAGE_SIZE = 3
+# Beberapa baris berbagi created_at yang sama: urutan antar-baris itu ditentukan id (tie-breaker cursor)
+SAME_SECOND = datetime.datetime(2026, 10, 19, 18, 59, 48)
+
+
+def _seed_schools(dev):
+    db.session.add_all([School(name=f"Sekolah {i}", level='SMP/MTs') for i in range(ROWS)])
+    return ROWS
+
+
+def _seed_subjects(dev):
+    db.session.add_all([Subject(name=f"Mapel {i % 3} {i}") for i in range(ROWS)])
+    return ROWS
+
+
+def _seed_classes(dev):
+    school, subject = School(name="Sekolah Kelas", level='SMP/MTs'), Subject(name="Mapel Kelas")
+    teacher = User(username="guru_kelas", email="guru_kelas@example.com", password_hash="x", role='Teacher')
+    db.session.add_all([school, subject, teacher])
+    db.session.flush()
+    db.session.add_all([Class(grade_level=7 + i % 3, parallel_class=chr(65 + i), school_id=school.id,
+                              subject_id=subject.id, teacher_id=teacher.id) for i in range(ROWS)])
+    return ROWS
+
+
+def _seed_users(dev):
+    db.session.add_all([User(username=f"guru_{i}", email=f"guru_{i}@example.com", password_hash="x",
+                             role='Teacher') for i in range(ROWS)])
+    return ROWS + 1  # termasuk Developer yang meminta
+
+
+def _seed_found_documents(dev):
+    db.session.add_all([FoundDocument(source="https://contoh.id", url=f"https://contoh.id/{i}.pdf",
+                                      file_name=f"{i}.pdf", local_path=f"/tmp/{i}.pdf",
+                                      created_at=SAME_SECOND if i % 2 else None) for i in range(ROWS)])
+    return ROWS
+
+
+def _seed_docs(dev):
+    db.session.add_all([Prota(user_id=dev.id, mapel=f"Mapel {i % 2}", jenjang='SMP', tahun_ajaran='2026/2027',
+                              created_at=SAME_SECOND if i % 2 else None) for i in range(ROWS)])
+    return ROWS
+
+
+def _seed_layouts(dev):
+    db.session.add_all([Layout(jenjang='SMP', mapel=f"Mapel {i % 2}", tipe_dokumen='Prota', layout_json={},
+                               file_path=f"/tmp/layout_{i}.docx", uploaded_by=dev.id,
+                               created_at=SAME_SECOND if i % 2 else None) for i in range(ROWS)])
+    return ROWS
+
+
+ENDPOINTS = [
+    ('/api/schools', _seed_schools, ['id', 'name', '-name']),
+    ('/api/subjects', _seed_subjects, ['name', '-id']),
+    ('/api/classes', _seed_classes, ['id', 'grade_level', '-parallel_class']),
+    ('/api/users', _seed_users, ['id', '-username', 'role']),
+    ('/api/found-documents', _seed_found_documents, ['-created_at', 'created_at', 'file_name']),
+    ('/api/docs', _seed_docs, ['-created_at', 'created_at', 'mapel']),
+    ('/api/layouts/', _seed_layouts, ['-created_at', 'created_at', '-mapel']),
+]
+
+
+def _developer():
+    dev = User(username="dev_uji", email="dev@example.com", password_hash="x", role='Developer')
+    db.session.add(dev)
+    db.session.flush()
+    return dev
+
+
+def _walk(client, path, token, **params):
+    """Mengikuti X-Next-Cursor sampai habis; mengembalikan (id per halaman, X-Total-Count)."""
+    pages, total = [], None
+    params['limit'] = PAGE_SIZE
+    while len(pages) <= ROWS + 1:
+        response = client.get(path, query_string=params, headers={'Authorization': f"Bearer {token}"})
+        assert response.status_code == 200, response.get_json()
+        pages.append([item['id'] for item in response.get_json()])
+        total = int(response.headers['X-Total-Count'])
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return pages, total
+        params['cursor'] = cursor
+    pytest.fail(f"{path}: paginasi tidak berhenti, halaman: {pages}")
+
+
+@pytest.mark.parametrize('path, seed, sorts', ENDPOINTS, ids=[path for path, _, _ in ENDPOINTS])
+def test_walk_all_pages(app, path, seed, sorts):
+    with app.app_context():
+        dev = _developer()
+        expected = seed(dev)
+        db.session.commit()
+        token = create_token(dev)
+
+    client = app.test_client()
+    for sort in [None, *sorts]:
+        pages, total = _walk(client, path, token, **({'sort': sort} if sort else {}))
+        ids = [row_id for page in pages for row_id in page]
+        assert total == expected
+        assert len(ids) == len(set(ids)) == expected, f"{path} sort={sort}: {pages}"
+        assert all(len(page) <= PAGE_SIZE for page in pages)
+
+
+def test_default_limit_applies_without_limit_or_cursor(app):
+    with app.app_context():
+        dev = _developer()
+        db.session.add_all([School(name=f"Sekolah {i}", level='SMP/MTs') for i in range(DEFAULT_LIMIT + 1)])
+        db.session.commit()
+        token = create_token(dev)
+
+    response = app.test_client().get('/api/schools', headers={'Authorization': f"Bearer {token}"})
+    assert len(response.get_json()) == DEFAULT_LIMIT
+    assert response.headers['X-Total-Count'] == str(DEFAULT_LIMIT + 1)
+    assert response.headers['X-Next-Cursor']
+
+
+@pytest.mark.parametrize('table, path', [('prota', '/api/docs'), ('layouts', '/api/layouts/')])
+def test_server_default_timestamps_are_normalized(app, table, path):
+    """Baris lama dari CURRENT_TIMESTAMP SQLite (tanpa mikrodetik) tetap bisa dipaginasi setelah migrasi."""
+    with app.app_context():
+        downgrade(directory=MIGRATIONS_DIR, revision='44e035d16d14')
+        dev = _developer()
+        db.session.commit()
+        dev_id, token = dev.id, create_token(dev)
+        for _ in range(ROWS):
+            if table == 'prota':
+                db.session.execute(sa.text(
+                    "INSERT INTO prota (user_id, mapel, jenjang, tahun_ajaran) VALUES (:user_id, 'IPA', 'SMP', '2026/2027')"
+                ), {'user_id': dev_id})
+            else:
+                db.session.execute(sa.text(
+                    "INSERT INTO layouts (jenjang, mapel, tipe_dokumen, layout_json, file_path, uploaded_by) "
+                    "VALUES ('SMP', 'IPA', 'Prota', '{}', '/tmp/layout.docx', :user_id)"
+                ), {'user_id': dev_id})
+        db.session.commit()
+        upgrade(directory=MIGRATIONS_DIR)
+        db.session.remove()
+
+    pages, total = _walk(app.test_client(), path, token)
+    ids = [row_id for page in pages for row_id in page]
+    assert total == ROWS
+    assert len(ids) == len(set(ids)) == ROWS, pages
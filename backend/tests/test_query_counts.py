@@ -0,0 +1,87 @@
+import contextlib
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import User, School, Subject, Class
+from app.utils.decorators import create_token, forget_user
+
+# Endpoint daftar yang jumlah query-nya harus konstan berapa pun banyaknya baris (tanpa N+1)
+LIST_ENDPOINTS = [
+    ('Developer', '/api/classes'),
+    ('Developer', '/api/users'),
+    ('Developer', '/api/my-classes'),
+    ('Developer', '/api/schools/{school_id}/details-for-class'),
+    ('School Admin', '/api/classes'),
+    ('School Admin', '/api/users'),
+    ('Teacher', '/api/classes'),
+    ('Teacher', '/api/my-classes'),
+]
+
+
+@contextlib.contextmanager
+def count_statements(engine):
+    """Menghitung statement SQL yang dieksekusi `engine` selama blok with berjalan."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _seed_classes(school, subjects, prefix, count):
+    teachers = []
+    for i in range(count):
+        teacher = User(username=f"guru_{prefix}_{i}", email=f"guru_{prefix}_{i}@example.com",
+                       password_hash="x", role='Teacher')
+        teacher.schools_taught.append(school)
+        teachers.append(teacher)
+    db.session.add_all(teachers)
+    db.session.flush()
+    for i, teacher in enumerate(teachers):
+        db.session.add(Class(grade_level=7 + i % 3, parallel_class=chr(65 + i % 26), school_id=school.id,
+                             subject_id=subjects[i % len(subjects)].id, teacher_id=teacher.id))
+    db.session.commit()
+
+
+@pytest.mark.parametrize('role, path', LIST_ENDPOINTS)
+def test_list_endpoint_query_count_is_constant(app, role, path):
+    with app.app_context():
+        school = School(name="Sekolah Uji", level='SMP/MTs')
+        subjects = [Subject(name=f"Mapel Uji {i}") for i in range(3)]
+        db.session.add_all([school, *subjects])
+        db.session.flush()
+        principals = {
+            'Developer': User(username="dev_uji", email="dev@example.com", password_hash="x", role='Developer'),
+            'School Admin': User(username="admin_uji", email="admin@example.com", password_hash="x",
+                                 role='School Admin', school_id=school.id),
+        }
+        db.session.add_all(principals.values())
+        db.session.commit()
+        _seed_classes(school, subjects, 'awal', 3)
+        principals['Teacher'] = Class.query.first().teacher
+        user_id, token = principals[role].id, create_token(principals[role])
+        school_id, url = school.id, path.format(school_id=school.id)
+
+        client = app.test_client()
+
+        def measure():
+            # Request memakai app context tes; session baru agar identity map hasil seeding tidak ikut terpakai
+            db.session.remove()
+            forget_user(user_id)  # cek versi token ikut terhitung di setiap pengukuran
+            with count_statements(db.engine) as statements:
+                response = client.get(url, headers={'Authorization': f"Bearer {token}"})
+            assert response.status_code == 200
+            return len(statements)
+
+        before = measure()
+        _seed_classes(db.session.get(School, school_id), Subject.query.all(), 'tambahan', 27)
+        after = measure()
+
+    assert before == after, f"{role} {path}: {before} -> {after} query untuk 3 -> 30 kelas"
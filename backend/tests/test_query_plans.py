@@ -0,0 +1,9 @@
+from app.utils.query_plans import check_query_plans
+
+def test_hot_queries_use_indexes(app):
+    with app.app_context():
+        results = check_query_plans()
+
+    full_scans = {name: plan for name, uses_index, plan in results if not uses_index}
+    assert results
+    assert not full_scans, f"Full table scan: {full_scans}"
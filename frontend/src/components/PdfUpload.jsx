@@ -33,6 +33,7 @@ function PdfUpload() {
       const response = await axios.post('http://localhost:5000/api/upload/pdf', formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
+          Authorization: `Bearer ${localStorage.getItem('authToken')}`,
         },
       });
       
@@ -1,24 +1,95 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import { Box, Typography } from '@mui/material';
 import ProgressStatus from './ProgressStatus'; // Import the new component
 
+const STATUS_URL = 'http://localhost:5000/api/uploads/status';
+const EVENTS_URL = 'http://localhost:5000/api/uploads/events';
+const INITIAL_LIMIT = 50;
+// Saat stream SSE tersambung, polling hanya jadi cadangan dan dijalankan lebih jarang
+const POLL_INTERVAL_MS = 3000;
+const FALLBACK_POLL_INTERVAL_MS = 30000;
+
+// Gabungkan baris yang berubah ke daftar yang sudah ada (berdasarkan id), terbaru di atas
+const mergeUploads = (current, changed) => {
+  const byId = new Map(current.map((upload) => [upload.id, upload]));
+  changed.forEach((upload) => byId.set(upload.id, upload));
+  return Array.from(byId.values()).sort((a, b) =>
+    a.uploaded_at === b.uploaded_at ? b.id - a.id : (a.uploaded_at < b.uploaded_at ? 1 : -1)
+  );
+};
+
 function UploadStatus() {
   const [uploads, setUploads] = useState([]);
+  // Nilai X-Sync-Timestamp terakhir; polling berikutnya hanya meminta baris yang berubah
+  const syncRef = useRef(null);
+  const streamOpenRef = useRef(false);
+  const uploadsRef = useRef(uploads);
+  uploadsRef.current = uploads;
 
   useEffect(() => {
     const fetchStatus = async () => {
       try {
-        const response = await axios.get('http://localhost:5000/api/uploads/status');
-        setUploads(response.data);
+        if (!syncRef.current) {
+          // Muat awal: hanya unggahan terbaru, bukan seluruh riwayat
+          const response = await axios.get(STATUS_URL, { params: { limit: INITIAL_LIMIT } });
+          syncRef.current = response.headers['x-sync-timestamp'];
+          setUploads(response.data);
+          return;
+        }
+
+        // Polling: baris yang berubah sejak sync terakhir (ikuti X-Next-Cursor jika lebih dari satu halaman)
+        const params = { since: syncRef.current };
+        let response = await axios.get(STATUS_URL, { params });
+        const nextSync = response.headers['x-sync-timestamp'];
+        let changed = response.data;
+        while (response.headers['x-next-cursor']) {
+          response = await axios.get(STATUS_URL, { params: { ...params, cursor: response.headers['x-next-cursor'] } });
+          changed = changed.concat(response.data);
+        }
+        syncRef.current = nextSync || syncRef.current;
+        setUploads((current) => mergeUploads(current, changed));
       } catch (error) {
         console.error("Failed to fetch upload statuses:", error);
       }
     };
 
-    fetchStatus();
-    const interval = setInterval(fetchStatus, 3000);
-    return () => clearInterval(interval);
+    // Progres real-time lewat SSE; EventSource tidak bisa mengirim header, jadi token lewat query string
+    let source = null;
+    const token = localStorage.getItem('authToken');
+    if (token && window.EventSource) {
+      source = new EventSource(`${EVENTS_URL}?token=${encodeURIComponent(token)}`);
+      source.onopen = () => { streamOpenRef.current = true; };
+      source.onerror = () => { streamOpenRef.current = false; };
+      source.addEventListener('progress', (e) => {
+        const event = JSON.parse(e.data);
+        if (event.job_type !== 'pdf') return;
+        if (!uploadsRef.current.some((upload) => upload.id === event.job_id)) {
+          // Unggahan baru yang belum ada di daftar: ambil barisnya lewat polling `since`
+          fetchStatus();
+          return;
+        }
+        setUploads((current) => current.map((upload) => (upload.id === event.job_id
+          ? { ...upload, status: event.stage, progress: event.progress ?? upload.progress }
+          : upload)));
+      });
+    }
+
+    let lastPoll = 0;
+    const poll = () => {
+      const interval = streamOpenRef.current ? FALLBACK_POLL_INTERVAL_MS : POLL_INTERVAL_MS;
+      if (Date.now() - lastPoll >= interval) {
+        lastPoll = Date.now();
+        fetchStatus();
+      }
+    };
+
+    poll();
+    const interval = setInterval(poll, POLL_INTERVAL_MS);
+    return () => {
+      clearInterval(interval);
+      if (source) source.close();
+    };
   }, []);
 
   // Don't render the component if there's nothing to show
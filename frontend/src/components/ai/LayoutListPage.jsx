@@ -12,6 +12,7 @@ import VisibilityIcon from '@mui/icons-material/Visibility';
 import EditIcon from '@mui/icons-material/Edit';
 import DeleteIcon from '@mui/icons-material/Delete';
 import axios from 'axios';
+import { fetchAllPages } from '../../services/pagination';
 
 // Menggunakan komponen dan service kustom Anda
 import { generatePdfFromLayout } from '../../services/pdfGenerator';
@@ -59,7 +60,7 @@ const LayoutListPage = () => {
   const fetchLayouts = async () => {
     setIsLoading(true);
     try {
-      const response = await axios.get('http://localhost:5000/api/layouts/', createAuthHeaders());
+      const response = await fetchAllPages('http://localhost:5000/api/layouts/', createAuthHeaders());
       setLayouts(response.data);
     } catch (error) {
       setAlertInfo({ show: true, type: 'error', message: 'Gagal mengambil daftar layout.' });
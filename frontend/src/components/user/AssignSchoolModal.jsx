@@ -1,5 +1,6 @@
 import React, { useState, useEffect, useContext } from 'react';
 import axios from 'axios';
+import { fetchAllPages } from '../../services/pagination';
 import {
   Dialog, DialogTitle, DialogContent, DialogActions, Button,
   TextField, FormControl, InputLabel, Select, MenuItem, Typography
@@ -20,7 +21,7 @@ function AssignSchoolModal({ open, onClose }) {
 
   const fetchTeachers = async () => {
     try {
-      const res = await axios.get('http://localhost:5000/api/users', {
+      const res = await fetchAllPages('http://localhost:5000/api/users', {
         headers: { Authorization: `Bearer ${token}` }
       });
       const allTeachers = res.data.filter(u => u.role === 'Teacher');
@@ -32,7 +33,7 @@ function AssignSchoolModal({ open, onClose }) {
 
   const fetchSchools = async () => {
     try {
-      const res = await axios.get('http://localhost:5000/api/schools', {
+      const res = await fetchAllPages('http://localhost:5000/api/schools', {
         headers: { Authorization: `Bearer ${token}` }
       });
       setSchools(res.data);
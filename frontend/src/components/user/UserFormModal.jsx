@@ -3,7 +3,7 @@ import {
   Button, Dialog, DialogActions, DialogContent, DialogTitle,
   TextField, FormControl, InputLabel, Select, MenuItem, FormHelperText
 } from '@mui/material';
-import axios from 'axios';
+import { fetchAllPages } from '../../services/pagination';
 import AuthContext from '../../context/AuthContext';
 
 function UserFormModal({ open, onClose, onSubmit, initialData = {} }) {
@@ -24,7 +24,7 @@ function UserFormModal({ open, onClose, onSubmit, initialData = {} }) {
   const fetchSchools = async () => {
     try {
       const token = localStorage.getItem('authToken');
-      const res = await axios.get('http://localhost:5000/api/schools', {
+      const res = await fetchAllPages('http://localhost:5000/api/schools', {
         headers: { Authorization: `Bearer ${token}` }
       });
       setSchools(res.data);
@@ -1,5 +1,6 @@
 import React, { useState, useEffect, useContext } from 'react';
 import axios from 'axios';
+import { fetchAllPages } from '../services/pagination';
 import {
   Box, Typography, Paper, Table, TableBody, TableCell, TableContainer,
   TableHead, TableRow, Button, CircularProgress, IconButton
@@ -37,12 +38,12 @@ function ClassManagementPage() {
       const token = localStorage.getItem('authToken');
       const headers = { Authorization: `Bearer ${token}` };
 
-      const classResponse = await axios.get('http://localhost:5000/api/classes', { headers });
+      const classResponse = await fetchAllPages('http://localhost:5000/api/classes', { headers });
       setClasses(classResponse.data);
 
       // Tetap ambil data sekolah untuk keperluan form modal
       if (user?.role === 'Developer' || user?.role === 'School Admin') {
-        const schoolResponse = await axios.get('http://localhost:5000/api/schools', { headers });
+        const schoolResponse = await fetchAllPages('http://localhost:5000/api/schools', { headers });
         setSchools(schoolResponse.data);
       }
     } catch (err) {
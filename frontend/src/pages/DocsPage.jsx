@@ -1,7 +1,7 @@
 // frontend/src/pages/DocsPage.jsx
 
 import React, { useState, useEffect, useContext } from 'react';
-import axios from 'axios';
+import { fetchAllPages } from '../services/pagination';
 import {
   Box, Typography, Paper, List, ListItem, ListItemText,
   CircularProgress, Divider, Chip, ListItemButton, ListSubheader, useTheme
@@ -37,7 +37,7 @@ function DocsPage() {
       if (!user) return;
       try {
         const token = localStorage.getItem('authToken');
-        const res = await axios.get('http://localhost:5000/api/docs', {
+        const res = await fetchAllPages('http://localhost:5000/api/docs', {
           headers: { Authorization: `Bearer ${token}` }
         });
         
@@ -1,5 +1,6 @@
 import React, { useState, useEffect, useContext } from 'react';
 import axios from 'axios';
+import { fetchAllPages } from '../services/pagination';
 import {
   Box, Typography, Paper, Table, TableBody, TableCell,
   TableContainer, TableHead, TableRow, Button,
@@ -36,7 +37,7 @@ function SchoolManagementPage() {
       setLoading(true);
       const token = localStorage.getItem('authToken');
       const headers = { Authorization: `Bearer ${token}` };
-      const response = await axios.get('http://localhost:5000/api/schools', { headers });
+      const response = await fetchAllPages('http://localhost:5000/api/schools', { headers });
 
       if (user.role === 'School Admin') {
         const filtered = response.data.filter(s => s.id === user.school_id);
@@ -2,6 +2,7 @@
 
 import React, { useState, useEffect, useCallback } from 'react';
 import axios from 'axios';
+import { fetchAllPages } from '../../services/pagination';
 import { useDropzone } from 'react-dropzone';
 import {
   Box, Typography, Button, Paper, Stack,
@@ -42,7 +43,7 @@ const BookRetrieverPage = () => {
   useEffect(() => {
     const fetchSubjects = async () => {
       try {
-        const response = await axios.get(
+        const response = await fetchAllPages(
           'http://localhost:5000/api/subjects',
           createAuthHeaders()
         );
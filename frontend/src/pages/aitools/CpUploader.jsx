@@ -10,6 +10,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 import CloudUploadIcon from '@mui/icons-material/CloudUpload';
 import InsertDriveFileIcon from '@mui/icons-material/InsertDriveFile';
 import axios from 'axios';
+import { fetchAllPages } from '../../services/pagination';
 
 import CustomAlert from '../../components/common/CustomAlert';
 
@@ -46,7 +47,7 @@ function CpUploader() {
   // Fungsi untuk mengambil daftar subject dari backend
   const fetchSubjects = useCallback(async () => {
     try {
-      const response = await axios.get('http://localhost:5000/api/subjects', createAuthHeaders());
+      const response = await fetchAllPages('http://localhost:5000/api/subjects', createAuthHeaders());
       setSubjects(response.data);
     } catch (error) {
       console.error("Gagal mengambil daftar subject:", error);
@@ -67,7 +68,11 @@ function CpUploader() {
 
   const { getRootProps, getInputProps, isDragActive } = useDropzone({
     onDrop,
-    accept: { 'text/plain': ['.txt'] },
+    accept: {
+      'text/plain': ['.txt'],
+      'application/pdf': ['.pdf'],
+      'application/vnd.openxmlformats-officedocument.wordprocessingml.document': ['.docx'],
+    },
     multiple: false,
   });
 
@@ -174,7 +179,7 @@ function CpUploader() {
               <input {...getInputProps()} />
               <CloudUploadIcon sx={{ fontSize: 60, color: 'text.secondary', mb: 2 }} />
               <Typography>
-                {isDragActive ? 'Lepaskan file di sini...' : 'Seret & lepas file .txt di sini, atau klik untuk memilih file'}
+                {isDragActive ? 'Lepaskan file di sini...' : 'Seret & lepas file .txt, .pdf atau .docx di sini, atau klik untuk memilih file'}
               </Typography>
             </Box>
             <AnimatePresence>
@@ -12,6 +12,7 @@ import InsertDriveFileIcon from '@mui/icons-material/InsertDriveFile';
 import ListAltIcon from '@mui/icons-material/ListAlt'; // --- TAMBAHAN ---
 import { useNavigate } from 'react-router-dom'; // --- TAMBAHAN ---
 import axios from 'axios';
+import { fetchAllPages } from '../../services/pagination';
 import CustomAlert from '../../components/common/CustomAlert';
 
 const getAuthToken = () => localStorage.getItem('authToken');
@@ -43,7 +44,7 @@ const LayoutRetrieverPage = () => {
   useEffect(() => {
     const fetchSubjects = async () => {
       try {
-        const response = await axios.get('http://localhost:5000/api/subjects', createAuthHeaders());
+        const response = await fetchAllPages('http://localhost:5000/api/subjects', createAuthHeaders());
         setSubjects(response.data);
       } catch (error) {
         console.error("Gagal mengambil daftar subject:", error);
@@ -97,7 +98,7 @@ const LayoutRetrieverPage = () => {
       setAlertInfo({ type: 'success', show: true, title: 'Berhasil', message: `Layout berhasil diunggah! ID: ${response.data.layout_id}` });
       setFile(null); setJenjang(''); setMapelId(''); setCustomMapel(''); setTipeDokumen('');
       if (isCustomMapel) {
-        const subjectRes = await axios.get('http://localhost:5000/api/subjects', createAuthHeaders());
+        const subjectRes = await fetchAllPages('http://localhost:5000/api/subjects', createAuthHeaders());
         setSubjects(subjectRes.data);
       }
     } catch (error) {
@@ -1,5 +1,6 @@
 import React, { useState, useEffect, useContext } from 'react';
 import axios from 'axios';
+import { fetchAllPages } from '../../services/pagination';
 import {
   Box, Typography, Paper, Table, TableBody, TableCell, TableContainer, TableHead, TableRow,
   Button, CircularProgress, IconButton
@@ -49,7 +50,7 @@ function UserManagementPage() {
     try {
       setLoading(true);
       const token = localStorage.getItem('authToken');
-      const response = await axios.get('http://localhost:5000/api/users', {
+      const response = await fetchAllPages('http://localhost:5000/api/users', {
         headers: { Authorization: `Bearer ${token}` }
       });
       setUsers(response.data);
@@ -0,0 +1,19 @@
+// frontend/src/services/pagination.js
+
+import axios from 'axios';
+
+// Endpoint daftar backend mengembalikan paling banyak satu halaman (default 100 baris)
+// dan cursor halaman berikutnya di header X-Next-Cursor. Untuk tabel/dropdown yang
+// butuh seluruh data, ikuti cursor sampai habis lalu gabungkan hasilnya.
+export const fetchAllPages = async (url, config = {}) => {
+  let response = await axios.get(url, config);
+  let data = response.data;
+  while (response.headers['x-next-cursor']) {
+    response = await axios.get(url, {
+      ...config,
+      params: { ...config.params, cursor: response.headers['x-next-cursor'] },
+    });
+    data = data.concat(response.data);
+  }
+  return { ...response, data };
+};